@@ -44,9 +44,13 @@ INSTALLED_APPS = [
     'user',
     'exam_question',
     'user_answer',
+    'leaderboard',
+    'exam_session',
+    'benchmark',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -80,13 +84,34 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
+# DB_POOL=1 switches to the pooled backend in core.db, which hands each
+# request's connection back to a per-process pool; otherwise connections
+# persist per thread for DB_CONN_MAX_AGE seconds. Each gunicorn worker
+# opens DB_POOL_MIN_SIZE connections as it starts (see gunicorn.conf.py).
+
+DB_POOL = os.environ.get('DB_POOL', '').lower() in ('1', 'true', 'yes')
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.db' if DB_POOL else 'django.db.backends.postgresql',
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'CONN_MAX_AGE': (
+            0 if DB_POOL else int(os.environ.get('DB_CONN_MAX_AGE', 60))
+        ),
+        'POOL': {
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 0)),
+            'idle_timeout': float(
+                os.environ.get('DB_POOL_IDLE_TIMEOUT', 300)
+            ),
+            'health_check_interval': float(
+                os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', 30)
+            ),
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        },
     }
 }
 
@@ -110,6 +135,60 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# PASSWORD_HASHER_POLICY selects the preferred hasher; the others stay
+# listed so existing hashes still verify and are upgraded on login.
+# The argon2 policy needs the optional argon2-cffi package.
+
+PASSWORD_HASHER_POLICY = os.environ.get('PASSWORD_HASHER_POLICY', 'pbkdf2')
+
+PASSWORD_HASHER_POLICIES = {
+    'pbkdf2': 'core.hashers.TunablePBKDF2PasswordHasher',
+    'argon2': 'core.hashers.TunableArgon2PasswordHasher',
+    'scrypt': 'core.hashers.TunableScryptPasswordHasher',
+}
+
+PASSWORD_HASHER_PARAMS = {
+    'pbkdf2': {
+        'iterations': int(os.environ.get('PBKDF2_ITERATIONS', 320000)),
+    },
+    'argon2': {
+        'time_cost': int(os.environ.get('ARGON2_TIME_COST', 2)),
+        'memory_cost': int(os.environ.get('ARGON2_MEMORY_COST', 102400)),
+        'parallelism': int(os.environ.get('ARGON2_PARALLELISM', 8)),
+    },
+    'scrypt': {
+        'work_factor': int(os.environ.get('SCRYPT_WORK_FACTOR', 2 ** 14)),
+        'block_size': int(os.environ.get('SCRYPT_BLOCK_SIZE', 8)),
+        'parallelism': int(os.environ.get('SCRYPT_PARALLELISM', 1)),
+    },
+}
+
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_POLICIES[PASSWORD_HASHER_POLICY],
+] + [
+    hasher for policy, hasher in PASSWORD_HASHER_POLICIES.items()
+    if policy != PASSWORD_HASHER_POLICY
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# Worker processes used to hash passwords off the request thread; 0
+# hashes in-process. "auto" shares the cores between the web server's
+# processes, WEB_CONCURRENCY of them (set by gunicorn.conf.py), so each
+# gets at least one worker rather than one per core.
+_hashing_workers = os.environ.get('PASSWORD_HASHING_WORKERS', '0')
+if _hashing_workers == 'auto':
+    PASSWORD_HASHING_WORKERS = max(
+        1,
+        (os.cpu_count() or 1) // int(os.environ.get('WEB_CONCURRENCY') or 1),
+    )
+else:
+    PASSWORD_HASHING_WORKERS = int(_hashing_workers)
+
+AUTHENTICATION_BACKENDS = ['core.backends.PooledModelBackend']
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.0/topics/i18n/
 
@@ -134,10 +213,129 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+# Compact API mode, on by default outside DEBUG: JSON only, without the
+# browsable API, and clients cannot ask for indented output. JSON is
+# rendered and parsed with orjson when it is installed.
+API_COMPACT = os.environ.get('API_COMPACT', '0' if DEBUG else '1') == '1'
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        *([] if API_COMPACT else [
+            'rest_framework.renderers.BrowsableAPIRenderer',
+        ]),
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Proxies in front that append to X-Forwarded-For. With 0 the header
+    # is ignored and throttles key on the connecting address.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
 }
 
 SPECTACULAR_SETTINGS ={
     'COMPONENT_SPLIT_REQUEST': True,
 }
+
+# Caches
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+if os.environ.get('REDIS_URL'):
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL'),
+    }
+
+# Token authentication cache used by user.authentication
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_SIZE', 10000)),
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 60)),
+    'SHARED_CACHE': 'shared' if 'shared' in CACHES else None,
+    'SHARED_TTL': int(os.environ.get('TOKEN_AUTH_SHARED_CACHE_TTL', 300)),
+}
+
+# Rows written per INSERT by the bulk question import
+QUESTION_IMPORT_BATCH_SIZE = int(
+    os.environ.get('QUESTION_IMPORT_BATCH_SIZE', 1000)
+)
+
+# Cursor pagination of the exam_question list endpoint
+EXAM_QUESTION_PAGE_SIZE = int(os.environ.get('EXAM_QUESTION_PAGE_SIZE', 50))
+EXAM_QUESTION_MAX_PAGE_SIZE = int(
+    os.environ.get('EXAM_QUESTION_MAX_PAGE_SIZE', 500)
+)
+
+# Cache holding the exam_question generation counter; share it between
+# workers so the answer key and response caches see each other's writes
+EXAM_QUESTION_CACHE = 'shared' if 'shared' in CACHES else 'default'
+
+# Cache rendered exam_question responses. Writes reach other processes'
+# entries only through a shared cache, so this defaults to off without one;
+# a single-process server may turn it on with EXAM_QUESTION_RESPONSE_CACHE=1.
+EXAM_QUESTION_RESPONSE_CACHE = os.environ.get(
+    'EXAM_QUESTION_RESPONSE_CACHE', '1' if 'shared' in CACHES else '0'
+) == '1'
+
+# Grade from an in-process answer key. Like the response cache it only
+# hears of other workers' writes through a shared cache, so without one
+# grading queries the answers unless EXAM_QUESTION_ANSWER_KEY=1.
+EXAM_QUESTION_ANSWER_KEY = os.environ.get(
+    'EXAM_QUESTION_ANSWER_KEY', '1' if 'shared' in CACHES else '0'
+) == '1'
+
+# Seconds a rendered exam_question response stays cached
+EXAM_QUESTION_RESPONSE_CACHE_TTL = int(
+    os.environ.get('EXAM_QUESTION_RESPONSE_CACHE_TTL', 300)
+)
+
+# Rows fetched per round trip by the streaming exports
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 2000))
+
+# Leaderboard entries returned by default, and the most a client may ask for
+LEADERBOARD_SIZE = int(os.environ.get('LEADERBOARD_SIZE', 10))
+LEADERBOARD_MAX_SIZE = int(os.environ.get('LEADERBOARD_MAX_SIZE', 100))
+
+# Idempotency-Key replay cache for answer submissions
+IDEMPOTENCY_CACHE = 'shared' if 'shared' in CACHES else 'default'
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', 24 * 3600))
+
+# Questions per exam session by default and at most, and the number of
+# session snapshots each process keeps in memory
+EXAM_SESSION_QUESTIONS = int(os.environ.get('EXAM_SESSION_QUESTIONS', 50))
+EXAM_SESSION_MAX_QUESTIONS = int(
+    os.environ.get('EXAM_SESSION_MAX_QUESTIONS', 200)
+)
+EXAM_SESSION_CACHE_SIZE = int(os.environ.get('EXAM_SESSION_CACHE_SIZE', 1000))
+
+# Token bucket throttling of the login and sign-up endpoints. Bucket state
+# is kept per process ('local') or in the named cache.
+THROTTLE_ENABLED = os.environ.get('THROTTLE_ENABLED', '1') == '1'
+THROTTLE_STORE = os.environ.get(
+    'THROTTLE_STORE', 'shared' if 'shared' in CACHES else 'local'
+)
+THROTTLE_LOCAL_MAX_KEYS = int(
+    os.environ.get('THROTTLE_LOCAL_MAX_KEYS', 100000)
+)
+THROTTLE_RATES = {
+    'login_ip': os.environ.get('THROTTLE_LOGIN_IP_RATE', '20/min'),
+    'login_account': os.environ.get('THROTTLE_LOGIN_ACCOUNT_RATE', '5/min'),
+    'signup_ip': os.environ.get('THROTTLE_SIGNUP_IP_RATE', '10/hour'),
+}
+
+# Request metrics: the Prometheus endpoint only answers requests bearing
+# METRICS_TOKEN (and none while it is unset), and SERVER_TIMING adds a
+# Server-Timing header with db/serializer/total times
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# Directory where worker processes pool their metrics, so a scrape served
+# by any one of them reports the totals of all; gunicorn.conf.py sets it
+METRICS_DIR = os.environ.get('METRICS_DIR', '')
+SERVER_TIMING = os.environ.get('SERVER_TIMING', '1' if DEBUG else '0') == '1'
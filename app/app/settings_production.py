@@ -0,0 +1,82 @@
+"""
+Production settings.
+
+Select with DJANGO_SETTINGS_MODULE=app.settings_production. Builds on
+app.settings and turns off what only helps development: DEBUG, which
+also keeps every SQL query in connection.queries, the debug template
+context, the browsable API, the Server-Timing header and the benchmark
+commands. A secret key and a Redis cache are required.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from app.settings import *  # noqa: F401,F403
+from app.settings import CACHES, INSTALLED_APPS, REST_FRAMEWORK, TEMPLATES
+
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('DJANGO_SECRET_KEY must be set.')
+
+# The generation counters, response cache, idempotency keys and throttle
+# buckets must be shared by every gunicorn worker, or each worker serves
+# stale data, replays requests and multiplies the rate limits
+if 'shared' not in CACHES:
+    raise ImproperlyConfigured('REDIS_URL must be set.')
+
+ALLOWED_HOSTS = [
+    host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',')
+    if host
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'benchmark']
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'context_processors': [
+                processor
+                for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+                if processor != 'django.template.context_processors.debug'
+            ],
+        },
+    },
+]
+
+# app.settings derived these from DEBUG; derive them again
+API_COMPACT = os.environ.get('API_COMPACT', '1') == '1'
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        *([] if API_COMPACT else [
+            'rest_framework.renderers.BrowsableAPIRenderer',
+        ]),
+    ],
+}
+SERVER_TIMING = os.environ.get('SERVER_TIMING', '0') == '1'
+
+# Trust X-Forwarded-Proto from the TLS-terminating proxy in front
+if os.environ.get('DJANGO_BEHIND_TLS_PROXY') == '1':
+    SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+    SESSION_COOKIE_SECURE = True
+    CSRF_COOKIE_SECURE = True
+
+# Errors go to stderr, which gunicorn collects, rather than to the
+# ADMINS emails Django would otherwise try to send
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': os.environ.get('DJANGO_LOG_LEVEL', 'WARNING'),
+    },
+}
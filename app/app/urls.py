@@ -20,8 +20,11 @@ from drf_spectacular.views import (
 from django.contrib import admin
 from django.urls import path, include
 
+from core.views import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_view, name='metrics'),
     path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
     path(
         'api/docs/',
@@ -29,5 +32,8 @@ urlpatterns = [
         name='api-docs',
     ),
     path('api/user/', include('user.urls')),
-    path('api/exam_question/', include('exam_question.urls'))
+    path('api/exam_question/', include('exam_question.urls')),
+    path('api/user_answer/', include('user_answer.urls')),
+    path('api/leaderboard/', include('leaderboard.urls')),
+    path('api/exam_session/', include('exam_session.urls')),
 ]
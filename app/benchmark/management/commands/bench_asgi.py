@@ -0,0 +1,177 @@
+"""
+Django command to compare request throughput under WSGI and ASGI
+"""
+import asyncio
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from benchmark.timing import summarize
+from core.models import Exam_Question
+
+
+BENCH_EMAIL = 'bench-asgi@example.com'
+
+# endpoint: (sync DRF view, async view, takes the question id)
+ENDPOINTS = {
+    'question-detail': (
+        'exam_question:exam_question-detail',
+        'exam_question:async-exam_question-detail',
+        True,
+    ),
+    'question-list': (
+        'exam_question:exam_question-list',
+        'exam_question:async-exam_question-list',
+        False,
+    ),
+    'user': ('user:user', 'user:async-user', False),
+}
+
+
+def run_wsgi(url, token, requests, concurrency):
+    """Drive url through the WSGI handler from concurrency threads"""
+    durations = []
+    lock = threading.Lock()
+
+    def worker(count):
+        client = Client(HTTP_AUTHORIZATION=f'Token {token}')
+        local = []
+        for _ in range(count):
+            start = time.perf_counter()
+            client.get(url)
+            local.append(time.perf_counter() - start)
+        connection.close()
+        with lock:
+            durations.extend(local)
+
+    threads = [
+        threading.Thread(target=worker, args=(share,))
+        for share in split(requests, concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return durations, time.perf_counter() - start
+
+
+def run_asgi(url, token, requests, concurrency):
+    """Drive url through the ASGI handler from concurrency tasks"""
+    durations = []
+
+    async def worker(count):
+        client = AsyncClient()
+        for _ in range(count):
+            start = time.perf_counter()
+            await client.get(url, authorization=f'Token {token}')
+            durations.append(time.perf_counter() - start)
+
+    async def main():
+        await asyncio.gather(*(
+            worker(share) for share in split(requests, concurrency)
+        ))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return durations, time.perf_counter() - start
+
+
+def split(total, parts):
+    """Split total into parts near-equal shares"""
+    return [total // parts + (i < total % parts) for i in range(parts)]
+
+
+class Command(BaseCommand):
+    """Compare WSGI, ASGI with sync views and ASGI with async views."""
+    help = (
+        'Measure requests/sec for the question and user read endpoints '
+        'through the WSGI handler, the ASGI handler with the DRF views, '
+        'and the ASGI handler with the async views.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument(
+            '--endpoint',
+            action='append',
+            choices=sorted(ENDPOINTS),
+            help='Endpoint to measure; repeat for several. Defaults to all.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print results as JSON.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        user = get_user_model().objects.create_user(
+            email=BENCH_EMAIL, password=None,
+        )
+        token = Token.objects.create(user=user).key
+        question = Exam_Question.objects.order_by('id').first()
+        created_question = question is None
+        if created_question:
+            question = Exam_Question.objects.create(
+                question='Benchmark question?',
+                choices=['A', 'B', 'C', 'D'],
+                answer='A',
+            )
+
+        # The test clients send requests for the host "testserver"
+        test_settings = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            DEBUG=False,
+        )
+        try:
+            with test_settings:
+                results = self.measure(options, token, question.pk)
+        finally:
+            user.delete()
+            if created_question:
+                question.delete()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, modes in results.items():
+            for mode, result in modes.items():
+                self.stdout.write(
+                    f"{name:16} {mode:11} "
+                    f"{result['per_second']:9.1f} req/s  "
+                    f"p50 {result['p50_ms']:7.2f} ms  "
+                    f"p99 {result['p99_ms']:7.2f} ms"
+                )
+
+    def measure(self, options, token, question_id):
+        """Run every selected endpoint under each entry point"""
+        requests = options['requests']
+        concurrency = options['concurrency']
+        results = {}
+        for name in options['endpoint'] or sorted(ENDPOINTS):
+            sync_name, async_name, takes_id = ENDPOINTS[name]
+            url_args = [question_id] if takes_id else []
+            sync_url = reverse(sync_name, args=url_args)
+            async_url = reverse(async_name, args=url_args)
+            runs = {
+                'wsgi': run_wsgi(sync_url, token, requests, concurrency),
+                'asgi-sync': run_asgi(sync_url, token, requests, concurrency),
+                'asgi-async': run_asgi(
+                    async_url, token, requests, concurrency,
+                ),
+            }
+            results[name] = {
+                mode: summarize(durations, elapsed)
+                for mode, (durations, elapsed) in runs.items()
+            }
+        return results
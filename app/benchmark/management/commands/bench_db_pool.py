@@ -0,0 +1,68 @@
+"""
+Django command to compare request latency with and without DB pooling
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.utils import load_backend
+
+from benchmark.timing import summarize
+
+
+ENGINES = {
+    'direct': 'django.db.backends.postgresql',
+    'pooled': 'core.db',
+}
+
+
+class Command(BaseCommand):
+    """Measure a request's connect, query and close cycle per engine."""
+    help = (
+        'Measure the connect, SELECT 1 and close cycle Django runs for '
+        'every request, once connecting directly and once through the '
+        'core.db connection pool.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print results as JSON.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        settings_dict = connections['default'].settings_dict
+        if connections['default'].vendor != 'postgresql':
+            raise CommandError('bench_db_pool needs a PostgreSQL database.')
+
+        results = {}
+        for label, engine in ENGINES.items():
+            wrapper = load_backend(engine).DatabaseWrapper(
+                {**settings_dict, 'ENGINE': engine, 'CONN_MAX_AGE': 0},
+                alias=f'bench-{label}',
+            )
+            durations = []
+            for _ in range(options['requests']):
+                start = time.perf_counter()
+                with wrapper.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                wrapper.close()
+                durations.append(time.perf_counter() - start)
+            if hasattr(wrapper, 'pool'):
+                wrapper.pool.close_all()
+            results[label] = summarize(durations)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for label, result in results.items():
+            self.stdout.write(
+                f"{label:7} {result['per_second']:9.1f} req/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  "
+                f"p95 {result['p95_ms']:7.2f} ms  "
+                f"p99 {result['p99_ms']:7.2f} ms"
+            )
@@ -0,0 +1,72 @@
+"""
+Django command to benchmark password hashing policies
+"""
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from benchmark.timing import run_for, summarize
+
+
+class Command(BaseCommand):
+    """Measure logins/sec per core for each password hasher policy."""
+    help = (
+        'Measure password verifications per second on a single core for '
+        'each hasher policy, using the parameters in settings.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--policy',
+            action='append',
+            choices=sorted(settings.PASSWORD_HASHER_POLICIES),
+            help='Policy to measure; repeat for several. Defaults to all.',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=2.0,
+            help='Time spent measuring each policy.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print results as JSON.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        policies = options['policy'] or sorted(
+            settings.PASSWORD_HASHER_POLICIES,
+        )
+        results = {}
+        for policy in policies:
+            hasher = import_string(settings.PASSWORD_HASHER_POLICIES[policy])()
+            try:
+                encoded = hasher.encode('benchmark-password', hasher.salt())
+            except ValueError as exc:
+                # Optional library such as argon2-cffi is not installed
+                self.stderr.write(f'Skipping {policy}: {exc}')
+                continue
+
+            durations = run_for(
+                options['seconds'],
+                lambda: hasher.verify('benchmark-password', encoded),
+            )
+            results[policy] = {
+                'params': settings.PASSWORD_HASHER_PARAMS[policy],
+                **summarize(durations),
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for policy, result in results.items():
+            self.stdout.write(
+                f"{policy:8} {result['per_second']:10.1f} logins/sec/core  "
+                f"p50 {result['p50_ms']:8.2f} ms  "
+                f"p99 {result['p99_ms']:8.2f} ms  {result['params']}"
+            )
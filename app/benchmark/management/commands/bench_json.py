@@ -0,0 +1,111 @@
+"""
+Django command to compare the JSON renderers and parsers
+"""
+import io
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from benchmark import seeding
+from benchmark.timing import run_for, summarize
+from core import renderers
+from core.models import Exam_Question
+from exam_question.pagination import Exam_QuestionCursorPagination
+from exam_question.serializers import Exam_QuestionSerializer
+
+
+# name: (renderer, parser)
+IMPLEMENTATIONS = {
+    'json': (JSONRenderer, JSONParser),
+    'orjson': (renderers.ORJSONRenderer, renderers.ORJSONParser),
+}
+
+
+class Command(BaseCommand):
+    """Time rendering and parsing a page of the question list."""
+    help = (
+        'Seed questions, build the question list response for a page of '
+        'them, and time rendering it and parsing it back with the json '
+        'module and with orjson. The seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=500,
+            help='Questions in the rendered page.',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=1.0,
+            help='Time spent measuring each operation.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print results as JSON.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        with transaction.atomic():
+            seeding.populate(
+                seeding.get_writer(), 0, options['page_size'], 0,
+            )
+            data = self.page_data(options['page_size'])
+            transaction.set_rollback(True)
+
+        content = JSONRenderer().render(data)
+        results = {}
+        for name, (renderer, parser) in IMPLEMENTATIONS.items():
+            results[name] = {
+                'render': summarize(run_for(
+                    options['seconds'], lambda: renderer().render(data),
+                )),
+                'parse': summarize(run_for(
+                    options['seconds'],
+                    lambda: parser().parse(io.BytesIO(content)),
+                )),
+                'bytes': len(renderer().render(data)),
+            }
+        if renderers.orjson is None:
+            # Both rows measure the json module
+            results['orjson']['fallback'] = True
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, result in results.items():
+            for operation in ('render', 'parse'):
+                summary = result[operation]
+                self.stdout.write(
+                    f"{name:7} {operation:7} "
+                    f"{summary['per_second']:9.1f} pages/s  "
+                    f"p50 {summary['p50_ms']:7.3f} ms"
+                )
+
+    def page_data(self, page_size):
+        """Return the question list response data for one page"""
+        request = Request(
+            APIRequestFactory().get('/', {'page_size': page_size}),
+        )
+        paginator = Exam_QuestionCursorPagination()
+        # The request factory sends requests for the host "testserver"
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        ):
+            page = paginator.paginate_queryset(
+                Exam_Question.objects.order_by('-id'), request,
+            )
+            return paginator.get_paginated_response(
+                Exam_QuestionSerializer(page, many=True).data,
+            ).data
@@ -0,0 +1,100 @@
+"""
+Django command to compare the serializer and fast question renderers
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from benchmark import seeding
+from benchmark.timing import run_for
+from core.models import Exam_Question
+from exam_question import representation
+from exam_question.serializers import Exam_QuestionSerializer
+
+
+class Command(BaseCommand):
+    """Measure rows/sec of each way to render a list of questions."""
+    help = (
+        'Seed questions, then render them to JSON through '
+        'Exam_QuestionSerializer and JSONRenderer, and through the fast '
+        'values_list path with JSONRenderer and with the configured JSON '
+        'renderer, reporting rows/sec including the query. The seeded rows '
+        'are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--questions',
+            type=int,
+            default=5000,
+            help='Questions to seed; every stored question is rendered.',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=2.0,
+            help='Time spent measuring each renderer.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print results as JSON.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        with transaction.atomic():
+            seeding.populate(
+                seeding.get_writer(), 0, options['questions'], 0,
+            )
+            results = self.measure(options)
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:12} {result['rows_per_second']:12.0f} rows/s  "
+                f"{result['ms_per_call']:8.2f} ms/call"
+            )
+
+    def measure(self, options):
+        """Time each renderer over every question"""
+        queryset = Exam_Question.objects.order_by('-id')
+
+        def serializer():
+            return JSONRenderer().render(
+                Exam_QuestionSerializer(queryset.all(), many=True).data,
+            )
+
+        def fast_json():
+            return representation.render_rows(
+                queryset.values_list(*representation.FIELDS),
+                renderer=JSONRenderer(),
+            )
+
+        def fast():
+            return representation.render_rows(
+                queryset.values_list(*representation.FIELDS),
+            )
+
+        renderers = {
+            'serializer': serializer, 'fast-json': fast_json, 'fast': fast,
+        }
+        if serializer() != fast_json():
+            raise CommandError('The renderers disagree.')
+
+        rows = queryset.count()
+        results = {}
+        for name, render in renderers.items():
+            durations = run_for(options['seconds'], render)
+            mean = sum(durations) / len(durations)
+            results[name] = {
+                'calls': len(durations),
+                'ms_per_call': mean * 1000,
+                'rows_per_second': rows / mean if mean else 0.0,
+            }
+        return results
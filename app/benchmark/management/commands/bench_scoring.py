@@ -0,0 +1,106 @@
+"""
+Django command to benchmark score and question statistics queries
+"""
+import itertools
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from benchmark import seeding
+from benchmark.timing import run_for, summarize
+from core.explain import explain
+from core.models import Exam_Question
+from exam_question import generation
+from leaderboard import ranking
+from user_answer import stats
+
+
+class Command(BaseCommand):
+    """Seed answers and measure the aggregate queries against them."""
+    help = (
+        'Seed users, questions and answers, then measure the score and '
+        'question statistics queries. The seeded rows are rolled back '
+        'unless --keep is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--questions', type=int, default=500)
+        parser.add_argument(
+            '--answers',
+            type=int,
+            default=100000,
+            help='Total answers to seed, spread evenly over the users.',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=2.0,
+            help='Time spent measuring each query.',
+        )
+        parser.add_argument(
+            '--explain',
+            action='store_true',
+            help='Print the query plan of each query.',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Commit the seeded rows instead of rolling them back.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print results as JSON.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        with transaction.atomic():
+            dataset = seeding.seed(
+                options['users'], options['questions'], options['answers'],
+                prefix='bench-score',
+            )
+            results = self.measure(
+                options, dataset.user_ids, dataset.question_ids,
+            )
+            if not options['keep']:
+                transaction.set_rollback(True)
+        if options['keep']:
+            # bulk_create sends no post_save signals
+            generation.bump()
+            ranking.rebuild()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:15} {result['per_second']:9.1f} queries/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  "
+                f"p99 {result['p99_ms']:7.2f} ms"
+            )
+            if 'plan' in result:
+                self.stdout.write(result['plan'])
+
+    def measure(self, options, user_ids, question_ids):
+        """Time each aggregate query and optionally capture its plan"""
+        users = itertools.cycle(user_ids or [0])
+        questions = itertools.cycle(question_ids or [0])
+        page = Exam_Question.objects.order_by('-id')
+        queries = {
+            'score': lambda: stats.score(next(users)),
+            'question-stats': lambda: stats.question_stats(
+                [next(questions)],
+            ),
+            'stats-page': lambda: stats.attach_question_stats(
+                list(page[:50]),
+            ),
+        }
+        results = {}
+        for name, query in queries.items():
+            results[name] = summarize(run_for(options['seconds'], query))
+            if options['explain']:
+                results[name]['plan'] = explain(query)
+        return results
@@ -0,0 +1,105 @@
+"""
+Django command to measure login CPU cost under attack traffic
+"""
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from benchmark.timing import summarize
+from core import throttling
+
+
+BENCH_EMAIL = 'bench-throttle@example.com'
+
+
+class Command(BaseCommand):
+    """Replay a credential-stuffing burst with throttling on and off."""
+    help = (
+        'Send a burst of failed logins from one IP, spread over many '
+        'accounts, and report CPU time per request with throttling '
+        'disabled and enabled.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument(
+            '--accounts',
+            type=int,
+            default=20,
+            help='Accounts the attack rotates through.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print results as JSON.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        user = get_user_model().objects.create_user(
+            email=BENCH_EMAIL, password='bench-password',
+        )
+        try:
+            results = {
+                mode: self.attack(options, enabled)
+                for mode, enabled in (('unthrottled', False),
+                                      ('throttled', True))
+            }
+        finally:
+            user.delete()
+            throttling.reset()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:12} {result['cpu_ms_per_request']:8.3f} ms CPU/req  "
+                f"{result['rejected']:5} of {result['count']} rejected  "
+                f"p50 {result['p50_ms']:8.3f} ms"
+            )
+
+    def attack(self, options, enabled):
+        """Send the login burst and measure CPU time and latency"""
+        emails = [BENCH_EMAIL] + [
+            f'victim-{i}@example.com' for i in range(options['accounts'] - 1)
+        ]
+        test_settings = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            THROTTLE_ENABLED=enabled,
+        )
+        url = reverse('user:token')
+        client = Client()
+        durations = []
+        rejected = 0
+        # Every request fails; keep django.request from logging each one
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        try:
+            with test_settings:
+                throttling.reset()
+                cpu_start = time.process_time()
+                for i in range(options['requests']):
+                    start = time.perf_counter()
+                    response = client.post(url, {
+                        'email': emails[i % len(emails)],
+                        'password': 'not-the-password',
+                    })
+                    durations.append(time.perf_counter() - start)
+                    rejected += response.status_code == 429
+                cpu = time.process_time() - cpu_start
+        finally:
+            request_logger.setLevel(level)
+
+        return {
+            'rejected': rejected,
+            'cpu_ms_per_request': cpu * 1000 / max(1, len(durations)),
+            **summarize(durations),
+        }
@@ -0,0 +1,198 @@
+"""
+Django command to load test the API with synthetic request mixes
+"""
+import json
+import platform
+import random
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from benchmark import scenarios, seeding
+from core import throttling
+from exam_question import generation
+from leaderboard import ranking
+from user.authentication import token_cache
+
+
+class Command(BaseCommand):
+    """Seed data, drive request mixes and report latency and queries."""
+    help = (
+        'Seed users, questions and answers, then drive each scenario '
+        'through the Django test client or, with --url, a running '
+        'server. Reports p50/p95/p99 latency, requests/sec and '
+        'queries/request overall and per operation. With the test '
+        'client the seeded rows are rolled back unless --keep is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            choices=sorted(scenarios.SCENARIOS),
+            help='Scenario to run; repeat for several. Defaults to all.',
+        )
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--questions', type=int, default=500)
+        parser.add_argument(
+            '--answers',
+            type=int,
+            default=5000,
+            help='Total answers to seed, spread evenly over the users.',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Requests sent per scenario.',
+        )
+        parser.add_argument(
+            '--url',
+            help=(
+                'Base URL of a server using the same database, e.g. '
+                'http://127.0.0.1:8000. Its throttles stay in force and '
+                'queries/request needs SERVER_TIMING enabled there.'
+            ),
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Concurrent clients; needs --url.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the seeded rows instead of discarding them.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print results as JSON.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Also write the JSON results to this file.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency must be at least 1.')
+        if options['concurrency'] > 1 and not options['url']:
+            raise CommandError('--concurrency needs --url.')
+        if not options['users'] or not options['questions']:
+            raise CommandError('--users and --questions must be positive.')
+
+        started = timezone.now()
+        if options['url']:
+            results = self.run_http(options)
+        else:
+            results = self.run_client(options)
+        output = {'meta': self.meta(options, started), 'scenarios': results}
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(output, file, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(output, indent=2))
+            return
+        for name, result in results.items():
+            self.write_line(name, result)
+            for operation, summary in result['operations'].items():
+                self.write_line(f'  {operation}', summary)
+
+    def seed(self, options):
+        """Insert the benchmark dataset"""
+        return seeding.seed(
+            options['users'], options['questions'], options['answers'],
+            prefix='bench-load',
+            password=scenarios.BENCH_PASSWORD,
+            tokens=True,
+            rng=random.Random(options['seed']),
+        )
+
+    def run_client(self, options):
+        """Run the scenarios in process, inside a rolled back transaction"""
+        test_settings = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            DEBUG=False,
+            SERVER_TIMING=True,
+            THROTTLE_ENABLED=False,
+        )
+        try:
+            with transaction.atomic(), test_settings:
+                dataset = self.seed(options)
+                # bulk_create sends no post_save signals
+                generation.bump()
+                results = self.run_scenarios(
+                    options, dataset, scenarios.ClientTarget,
+                )
+                if not options['keep']:
+                    transaction.set_rollback(True)
+        finally:
+            # Nothing cached from the run may outlive its rows
+            generation.bump()
+            token_cache.clear()
+            throttling.reset()
+        if options['keep']:
+            ranking.rebuild()
+        return results
+
+    def run_http(self, options):
+        """Run the scenarios against a server, then delete the dataset"""
+        dataset = self.seed(options)
+        generation.bump()
+        try:
+            return self.run_scenarios(
+                options, dataset,
+                lambda: scenarios.HttpTarget(options['url']),
+            )
+        finally:
+            if options['keep']:
+                ranking.rebuild()
+            else:
+                seeding.delete(dataset)
+            generation.bump()
+
+    def run_scenarios(self, options, dataset, make_target):
+        """Run every selected scenario"""
+        rng = random.Random(options['seed'])
+        return {
+            name: scenarios.run(
+                name, dataset, options['requests'], rng, make_target,
+                concurrency=options['concurrency'],
+            )
+            for name in options['scenario'] or sorted(scenarios.SCENARIOS)
+        }
+
+    def meta(self, options, started):
+        """Describe the run so results can be compared over time"""
+        return {
+            'started': started.isoformat(),
+            'target': options['url'] or 'client',
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            **{
+                option: options[option]
+                for option in ('users', 'questions', 'answers', 'requests',
+                               'concurrency', 'seed')
+            },
+        }
+
+    def write_line(self, name, result):
+        """Write one summary line"""
+        queries = result['queries_per_request']
+        self.stdout.write(
+            f"{name:18} {result['per_second']:9.1f} req/s  "
+            f"p50 {result['p50_ms']:7.2f}  p95 {result['p95_ms']:7.2f}  "
+            f"p99 {result['p99_ms']:7.2f} ms  "
+            f"{'-' if queries is None else f'{queries:.1f}':>5} q/req  "
+            f"{result['statuses']}"
+        )
@@ -0,0 +1,197 @@
+"""
+Request mixes driven by the benchmark command.
+
+A scenario is a weighted mix of operations. Each operation picks its
+inputs from the seeded Dataset and sends one request to a target: the
+Django test client in this process, or a server over HTTP. Query
+counts are read from the Server-Timing header, so they are reported
+for any target that has it enabled.
+"""
+import json
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from django.test import Client
+from django.urls import reverse
+
+from benchmark.timing import summarize
+
+
+BENCH_PASSWORD = 'bench-password'
+QUERIES_PATTERN = re.compile(r'desc="(\d+) queries"')
+
+
+def login(dataset, rng):
+    """Obtain a token with a seeded user's credentials"""
+    return ('POST', reverse('user:token'), None, {
+        'email': rng.choice(dataset.emails),
+        'password': BENCH_PASSWORD,
+    })
+
+
+def question_list(dataset, rng):
+    """Read the first page of questions"""
+    return ('GET', reverse('exam_question:exam_question-list'),
+            rng.choice(dataset.tokens), None)
+
+
+def question_detail(dataset, rng):
+    """Read one question"""
+    question_id = rng.choice(dataset.question_ids)
+    return ('GET', reverse(
+        'exam_question:exam_question-detail', args=[question_id],
+    ), rng.choice(dataset.tokens), None)
+
+
+def profile(dataset, rng):
+    """Read the user's profile"""
+    return ('GET', reverse('user:user'), rng.choice(dataset.tokens), None)
+
+
+def profile_edit(dataset, rng):
+    """Change the user's first name"""
+    return ('PATCH', reverse('user:edit'), rng.choice(dataset.tokens), {
+        'firstname': f'Bench {rng.randrange(1000)}',
+    })
+
+
+OPERATIONS = {
+    'login': login,
+    'question-list': question_list,
+    'question-detail': question_detail,
+    'profile': profile,
+    'profile-edit': profile_edit,
+}
+
+# scenario: {operation: weight}
+SCENARIOS = {
+    'login-burst': {'login': 1},
+    'reads': {'question-list': 1, 'question-detail': 3},
+    'profile-edits': {'profile': 1, 'profile-edit': 1},
+    'mixed': {
+        'login': 1,
+        'question-list': 4,
+        'question-detail': 10,
+        'profile': 3,
+        'profile-edit': 2,
+    },
+}
+
+
+class ClientTarget:
+    """Send requests through the Django test client"""
+
+    def __init__(self):
+        self.client = Client()
+
+    def send(self, method, path, token, data):
+        """Send a request and return its status and Server-Timing"""
+        headers = {}
+        if token:
+            headers['HTTP_AUTHORIZATION'] = f'Token {token}'
+        response = self.client.generic(
+            method, path, json.dumps(data) if data is not None else '',
+            content_type='application/json', **headers,
+        )
+        return response.status_code, response.get('Server-Timing', '')
+
+
+class HttpTarget:
+    """Send requests to a running server"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, method, path, token, data):
+        """Send a request and return its status and Server-Timing"""
+        request = urllib.request.Request(
+            self.base_url + path,
+            method=method,
+            data=json.dumps(data).encode() if data is not None else None,
+            headers={'Content-Type': 'application/json'},
+        )
+        if token:
+            request.add_header('Authorization', f'Token {token}')
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                return response.status, response.headers.get(
+                    'Server-Timing', '',
+                )
+        except urllib.error.HTTPError as exc:
+            exc.read()
+            return exc.code, exc.headers.get('Server-Timing', '')
+
+
+def plan(scenario, dataset, requests, rng):
+    """Return the (operation, request) pairs a run of scenario sends"""
+    mix = SCENARIOS[scenario]
+    names = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    return [(name, OPERATIONS[name](dataset, rng)) for name in names]
+
+
+def run(scenario, dataset, requests, rng, make_target, concurrency=1):
+    """
+    Send requests of scenario from concurrency workers, each with its
+    own target, and return the latency, throughput and query summary.
+    """
+    pending = plan(scenario, dataset, requests, rng)
+    samples = []
+    lock = threading.Lock()
+
+    def worker(share):
+        target = make_target()
+        local = []
+        for name, (method, path, token, data) in share:
+            start = time.perf_counter()
+            status, timing = target.send(method, path, token, data)
+            duration = time.perf_counter() - start
+            match = QUERIES_PATTERN.search(timing)
+            queries = int(match.group(1)) if match else None
+            local.append((name, status, duration, queries))
+        with lock:
+            samples.extend(local)
+
+    start = time.perf_counter()
+    if concurrency == 1:
+        worker(pending)
+    else:
+        threads = [
+            threading.Thread(target=worker, args=(pending[i::concurrency],))
+            for i in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return report(samples, time.perf_counter() - start)
+
+
+def report(samples, elapsed):
+    """Summarize samples overall and per operation"""
+    def summary(rows, elapsed):
+        queries = [row[3] for row in rows if row[3] is not None]
+        statuses = {}
+        for row in rows:
+            statuses[str(row[1])] = statuses.get(str(row[1]), 0) + 1
+        return {
+            **summarize([row[2] for row in rows], elapsed),
+            'queries_per_request': (
+                sum(queries) / len(queries) if queries else None
+            ),
+            'statuses': dict(sorted(statuses.items())),
+        }
+
+    operations = sorted({row[0] for row in samples})
+    return {
+        **summary(samples, elapsed),
+        'operations': {
+            name: summary(
+                [row for row in samples if row[0] == name], None,
+            )
+            for name in operations
+        },
+    }
@@ -0,0 +1,281 @@
+"""
+Synthetic data for the benchmark commands.
+
+Rows are generated deterministically from a seeded random.Random and
+written in fixed-size batches, so memory stays bounded by the batch
+size and the question ids however many rows are seeded. Every user
+shares one password hash, computed once, so seeding does not pay the
+hasher's cost per row. Rows are written with multi-row INSERTs, or
+with COPY on PostgreSQL; neither sends signals, so callers bump the
+question generation and rebuild the leaderboard if the rows are kept.
+"""
+import collections
+import csv
+import io
+import itertools
+import json
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.models import Exam_Question, User_Answer
+
+
+BATCH_SIZE = 10000
+CHOICES = ['A', 'B', 'C', 'D']
+
+USER_FIELDS = (
+    'email', 'firstname', 'lastname', 'password', 'is_active', 'is_staff',
+    'is_superuser', 'Created_Date', 'Modified_Date',
+)
+QUESTION_FIELDS = ('question', 'choices', 'answer', 'version')
+ANSWER_FIELDS = (
+    'user_id', 'question_id', 'user_answer', 'iscorrect', 'issubmitted',
+    'isbookmarked',
+)
+TOKEN_FIELDS = ('key', 'user_id', 'created')
+# Values the database adapter takes as they are
+PLAIN_TYPES = {int, str, bool, type(None)}
+
+Dataset = collections.namedtuple(
+    'Dataset', ['user_ids', 'emails', 'tokens', 'question_ids'],
+)
+
+
+def batched(iterable, size):
+    """Yield lists of up to size items from iterable"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class InsertWriter:
+    """
+    Write rows with INSERT. Rows whose ids are needed go through
+    bulk_create, which returns them; the rest skip building model
+    instances. Over a network, drivers such as psycopg2 run executemany
+    as one round trip per row, so those rows go as multi-row INSERTs of
+    as many rows as the database takes parameters for. SQLite runs in
+    process and caps parameters at 999, so there one executemany of a
+    single-row INSERT is faster.
+    """
+
+    def insert(self, model, fields, rows, returning=False):
+        """Insert rows of field values; return their ids if returning"""
+        if returning:
+            return self.create(model, fields, rows)
+        opts = model._meta
+        fields = [opts.get_field(field) for field in fields]
+        quote = connection.ops.quote_name
+        sql = (
+            f'INSERT INTO {quote(opts.db_table)} '
+            f'({", ".join(quote(field.column) for field in fields)}) '
+            f'VALUES '
+        )
+        placeholder = f'({", ".join(["%s"] * len(fields))})'
+        params = [
+            [
+                field.get_db_prep_save(value, connection)
+                if value.__class__ not in PLAIN_TYPES else value
+                for field, value in zip(fields, row)
+            ]
+            for row in rows
+        ]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.executemany(sql + placeholder, params)
+                return None
+            size = max(connection.ops.bulk_batch_size(fields, rows), 1)
+            for batch in batched(params, size):
+                cursor.execute(
+                    sql + ', '.join([placeholder] * len(batch)),
+                    list(itertools.chain.from_iterable(batch)),
+                )
+        return None
+
+    def create(self, model, fields, rows):
+        """Insert rows with bulk_create and return their ids"""
+        objs = [model(**dict(zip(fields, row))) for row in rows]
+        model.objects.bulk_create(objs)
+        if objs and objs[0].pk is None:
+            # The database cannot return ids from a bulk insert; this
+            # process is the only writer inside the seeding transaction
+            return sorted(model.objects.order_by('-pk').values_list(
+                'pk', flat=True,
+            )[:len(objs)])
+        return [obj.pk for obj in objs]
+
+
+class CopyWriter:
+    """Write rows with PostgreSQL's COPY FROM STDIN"""
+
+    def insert(self, model, fields, rows, returning=False):
+        """Insert rows of field values; return their ids if returning"""
+        opts = model._meta
+        columns = [opts.get_field(field).column for field in fields]
+        ids = None
+        if returning:
+            ids = self.reserve_ids(opts.db_table, opts.pk.column, len(rows))
+            columns.insert(0, opts.pk.column)
+            rows = [(pk, *row) for pk, row in zip(ids, rows)]
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([copy_value(value) for value in row])
+        buffer.seek(0)
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY {quote(opts.db_table)} '
+                f'({", ".join(quote(column) for column in columns)}) '
+                f'FROM STDIN WITH (FORMAT csv)',
+                buffer,
+            )
+        return ids
+
+    def reserve_ids(self, table, column, count):
+        """Draw count ids from the table's sequence"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT nextval(pg_get_serial_sequence(%s, %s)) '
+                'FROM generate_series(1, %s)',
+                [table, column, count],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+def copy_value(value):
+    """Return value in the text form COPY expects"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def get_writer(copy=False):
+    """Return the writer for the default database"""
+    return CopyWriter() if copy else InsertWriter()
+
+
+def populate(writer, users, questions, answers, prefix='seed',
+             password=None, rng=None, batch_size=BATCH_SIZE,
+             on_questions=None, on_users=None):
+    """
+    Insert users, questions and answers and return the row counts.
+
+    answers is the total number of answers, spread evenly over the
+    users, each answering distinct questions. on_questions and on_users,
+    if given, are called with the ids of the questions and with the ids
+    and emails of every batch of users.
+    """
+    rng = rng or random.Random(0)
+    encoded = make_password(password)
+    now = timezone.now()
+
+    question_ids = []
+    question_rows = (
+        (f'Benchmark question {i}?', CHOICES, 'A', 1)
+        for i in range(questions)
+    )
+    for batch in batched(question_rows, batch_size):
+        question_ids.extend(writer.insert(
+            Exam_Question, QUESTION_FIELDS, batch, returning=True,
+        ))
+    if on_questions is not None:
+        on_questions(question_ids)
+
+    per_user = min(len(question_ids), -(-answers // users)) if users else 0
+    remaining = answers if question_ids else 0
+    pending = []
+    for batch in batched(range(users), batch_size):
+        rows = [
+            (f'{prefix}-{i}@example.com', 'Bench', str(i), encoded, True,
+             False, False, now, now)
+            for i in batch
+        ]
+        user_ids = writer.insert(
+            get_user_model(), USER_FIELDS, rows, returning=True,
+        )
+        if on_users is not None:
+            on_users(user_ids, [row[0] for row in rows])
+
+        for user_id in user_ids:
+            count = min(per_user, remaining)
+            remaining -= count
+            for question_id in rng.sample(question_ids, count):
+                choice = rng.choice(CHOICES)
+                pending.append((
+                    user_id, question_id, choice, choice == 'A', True,
+                    rng.random() < 0.1,
+                ))
+            if len(pending) >= batch_size:
+                writer.insert(User_Answer, ANSWER_FIELDS, pending)
+                pending = []
+    if pending:
+        writer.insert(User_Answer, ANSWER_FIELDS, pending)
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE core_user_answer')
+    return {
+        'users': users,
+        'questions': len(question_ids),
+        'answers': answers - remaining if question_ids else 0,
+    }
+
+
+def seed(users, questions, answers, prefix='bench', password=None,
+         tokens=False, rng=None):
+    """
+    Insert a dataset small enough to hold in memory and return it as a
+    Dataset, optionally with a token per user.
+    """
+    writer = get_writer()
+    dataset = Dataset(user_ids=[], emails=[], tokens=[], question_ids=[])
+
+    def on_users(user_ids, emails):
+        dataset.user_ids.extend(user_ids)
+        dataset.emails.extend(emails)
+        if tokens:
+            keys = [Token.generate_key() for _ in user_ids]
+            now = timezone.now()
+            writer.insert(Token, TOKEN_FIELDS, [
+                (key, user_id, now) for key, user_id in zip(keys, user_ids)
+            ])
+            dataset.tokens.extend(keys)
+
+    populate(
+        writer, users, questions, answers, prefix=prefix,
+        password=password, rng=rng,
+        on_questions=dataset.question_ids.extend, on_users=on_users,
+    )
+    return dataset
+
+
+def delete(dataset):
+    """Delete the rows of a committed dataset"""
+    for start in range(0, len(dataset.user_ids), BATCH_SIZE):
+        user_ids = dataset.user_ids[start:start + BATCH_SIZE]
+        # Seeded answers never reached the leaderboard, so skip the
+        # per-row delete signals that would subtract them from it
+        User_Answer.objects.filter(user_id__in=user_ids)._raw_delete(
+            connection.alias,
+        )
+        get_user_model().objects.filter(pk__in=user_ids).delete()
+    for start in range(0, len(dataset.question_ids), BATCH_SIZE):
+        Exam_Question.objects.filter(
+            pk__in=dataset.question_ids[start:start + BATCH_SIZE],
+        ).delete()
@@ -0,0 +1,253 @@
+"""
+Test benchmark commands
+"""
+import json
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from benchmark import scenarios, seeding
+from benchmark.timing import percentile, summarize
+from core.models import Exam_Question, Leaderboard, User_Answer
+
+
+class TimingTests(SimpleTestCase):
+    """Test timing helpers"""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        samples = list(range(1, 101))
+
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_summarize(self):
+        """Test throughput is computed over the elapsed time"""
+        result = summarize([0.5, 0.5], elapsed=0.5)
+
+        self.assertEqual(result['count'], 2)
+        self.assertEqual(result['per_second'], 4.0)
+
+
+class BenchHashersTests(SimpleTestCase):
+    """Test the bench_hashers command"""
+
+    def test_reports_each_policy(self):
+        """Test the command reports throughput for a policy as JSON"""
+        out = StringIO()
+        with self.settings(PASSWORD_HASHER_PARAMS={
+            'pbkdf2': {'iterations': 1000},
+        }):
+            call_command(
+                'bench_hashers', '--policy', 'pbkdf2', '--seconds', '0.01',
+                '--json', stdout=out,
+            )
+
+        result = json.loads(out.getvalue())
+        self.assertGreater(result['pbkdf2']['per_second'], 0)
+        self.assertEqual(result['pbkdf2']['params'], {'iterations': 1000})
+
+
+class BenchAsgiTests(TransactionTestCase):
+    """Test the bench_asgi command"""
+
+    def test_reports_each_entry_point(self):
+        """Test the command measures WSGI and both ASGI variants"""
+        out = StringIO()
+
+        call_command(
+            'bench_asgi', '--endpoint', 'user', '--requests', '4',
+            '--concurrency', '2', '--json', stdout=out,
+        )
+
+        result = json.loads(out.getvalue())
+        self.assertEqual(
+            set(result['user']), {'wsgi', 'asgi-sync', 'asgi-async'},
+        )
+        self.assertEqual(result['user']['asgi-async']['count'], 4)
+        self.assertFalse(get_user_model().objects.exists())
+
+
+class BenchScoringTests(TransactionTestCase):
+    """Test the bench_scoring command"""
+
+    def test_seeds_measures_and_rolls_back(self):
+        """Test each query is measured and the seeded rows are discarded"""
+        out = StringIO()
+
+        call_command(
+            'bench_scoring', '--users', '3', '--questions', '4',
+            '--answers', '10', '--seconds', '0.01', '--explain', '--json',
+            stdout=out,
+        )
+
+        result = json.loads(out.getvalue())
+        self.assertEqual(
+            set(result), {'score', 'question-stats', 'stats-page'},
+        )
+        self.assertIn('user_answer', result['score']['plan'])
+        self.assertFalse(get_user_model().objects.exists())
+
+
+class BenchThrottlingTests(TransactionTestCase):
+    """Test the bench_throttling command"""
+
+    def test_reports_both_modes(self):
+        """Test the burst is measured with throttling off and on"""
+        out = StringIO()
+        with self.settings(
+            PASSWORD_HASHER_PARAMS={
+                **settings.PASSWORD_HASHER_PARAMS,
+                'pbkdf2': {'iterations': 1000},
+            },
+            THROTTLE_RATES={**settings.THROTTLE_RATES, 'login_ip': '5/min'},
+        ):
+            call_command(
+                'bench_throttling', '--requests', '8', '--json', stdout=out,
+            )
+
+        result = json.loads(out.getvalue())
+        self.assertEqual(result['unthrottled']['rejected'], 0)
+        self.assertEqual(result['throttled']['rejected'], 3)
+        self.assertFalse(get_user_model().objects.exists())
+
+
+class BenchmarkTests(TransactionTestCase):
+    """Test the benchmark command"""
+
+    def test_runs_scenario_and_rolls_back(self):
+        """Test a scenario is reported per operation and rows discarded"""
+        out = StringIO()
+        with self.settings(PASSWORD_HASHER_PARAMS={
+            **settings.PASSWORD_HASHER_PARAMS,
+            'pbkdf2': {'iterations': 1000},
+        }):
+            call_command(
+                'benchmark', '--scenario', 'mixed', '--users', '3',
+                '--questions', '4', '--answers', '6', '--requests', '40',
+                '--json', stdout=out,
+            )
+
+        result = json.loads(out.getvalue())
+        self.assertEqual(result['meta']['target'], 'client')
+        mixed = result['scenarios']['mixed']
+        self.assertEqual(mixed['count'], 40)
+        self.assertEqual(mixed['statuses'], {'200': 40})
+        self.assertIsNotNone(mixed['queries_per_request'])
+        self.assertLessEqual(
+            set(mixed['operations']), set(scenarios.OPERATIONS),
+        )
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_concurrency_needs_url(self):
+        """Test concurrent clients are refused for the test client"""
+        with self.assertRaises(CommandError):
+            call_command('benchmark', '--concurrency', '2')
+
+
+class SeedTests(TransactionTestCase):
+    """Test the seed command"""
+
+    def seed(self):
+        """Run the command and return what was seeded"""
+        out = StringIO()
+        call_command(
+            'seed', '--users', '5', '--questions', '4', '--answers', '15',
+            '--batch-size', '3', '--json', stdout=out,
+        )
+        answers = list(User_Answer.objects.order_by('id').values_list(
+            'user__lastname', 'question__question', 'user_answer',
+            'isbookmarked',
+        ))
+        return json.loads(out.getvalue()), answers
+
+    def test_seeds_deterministic_rows(self):
+        """Test the same arguments produce the same rows"""
+        result, answers = self.seed()
+
+        self.assertEqual(
+            {key: result[key] for key in ('users', 'questions', 'answers')},
+            {'users': 5, 'questions': 4, 'answers': 15},
+        )
+        self.assertEqual(len(answers), 15)
+        passwords = set(
+            get_user_model().objects.values_list('password', flat=True),
+        )
+        self.assertEqual(len(passwords), 1)
+        self.assertEqual(Leaderboard.objects.count(), 5)
+
+        get_user_model().objects.all().delete()
+        Exam_Question.objects.all().delete()
+        self.assertEqual(self.seed()[1], answers)
+
+    def test_multi_row_inserts_off_sqlite(self):
+        """Test other databases get several rows per INSERT statement"""
+        user = get_user_model().objects.create_user(email='a@example.com')
+        rows = [
+            (user.id, Exam_Question.objects.create(
+                question=f'Q{i}?', choices=['A', 'B'], answer='A',
+            ).id, 'A', True, True, False)
+            for i in range(5)
+        ]
+
+        with patch.object(connection, 'vendor', 'network'), \
+                patch.object(connection.ops, 'bulk_batch_size',
+                             return_value=2), \
+                CaptureQueriesContext(connection) as queries:
+            seeding.InsertWriter().insert(
+                User_Answer, seeding.ANSWER_FIELDS, rows,
+            )
+
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(User_Answer.objects.count(), 5)
+
+    def test_copy_needs_postgres(self):
+        """Test --copy is refused on other databases"""
+        if connection.vendor == 'postgresql':
+            self.skipTest('COPY is available')
+        with self.assertRaises(CommandError):
+            call_command('seed', '--copy')
+
+
+class BenchRenderingTests(TransactionTestCase):
+    """Test the bench_rendering command"""
+
+    def test_reports_each_renderer(self):
+        """Test both renderers are measured and the rows discarded"""
+        out = StringIO()
+
+        call_command(
+            'bench_rendering', '--questions', '5', '--seconds', '0.01',
+            '--json', stdout=out,
+        )
+
+        result = json.loads(out.getvalue())
+        self.assertLessEqual({'serializer', 'fast'}, set(result))
+        self.assertGreater(result['fast']['rows_per_second'], 0)
+        self.assertFalse(Exam_Question.objects.exists())
+
+
+class BenchJsonTests(TransactionTestCase):
+    """Test the bench_json command"""
+
+    def test_reports_each_implementation(self):
+        """Test rendering and parsing are measured for each library"""
+        out = StringIO()
+
+        call_command(
+            'bench_json', '--page-size', '3', '--seconds', '0.01', '--json',
+            stdout=out,
+        )
+
+        result = json.loads(out.getvalue())
+        self.assertEqual(set(result), {'json', 'orjson'})
+        self.assertEqual(result['json']['bytes'], result['orjson']['bytes'])
+        self.assertGreater(result['orjson']['render']['per_second'], 0)
+        self.assertFalse(Exam_Question.objects.exists())
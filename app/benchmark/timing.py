@@ -0,0 +1,40 @@
+"""
+Timing helpers shared by the benchmark commands
+"""
+import math
+import time
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples (nearest-rank)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_for(seconds, func, min_iterations=1):
+    """
+    Call func repeatedly for at least seconds and min_iterations.
+    Return the per-call durations in seconds.
+    """
+    durations = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline or len(durations) < min_iterations:
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summarize(durations, elapsed=None):
+    """Return throughput and latency percentiles (in ms) for durations"""
+    elapsed = elapsed if elapsed is not None else sum(durations)
+    return {
+        'count': len(durations),
+        'per_second': len(durations) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(durations, 50) * 1000,
+        'p95_ms': percentile(durations, 95) * 1000,
+        'p99_ms': percentile(durations, 99) * 1000,
+    }
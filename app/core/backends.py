@@ -0,0 +1,34 @@
+"""
+Authentication backends
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from core import hashing
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend that verifies passwords through core.hashing"""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so unknown emails take as long as wrong passwords
+            hashing.make_password(password)
+            return None
+
+        valid, must_update = hashing.verify_password(password, user.password)
+        if not valid:
+            return None
+        if must_update:
+            hashing.set_password(user, password)
+            user.save(update_fields=['password'])
+        if self.user_can_authenticate(user):
+            return user
+        return None
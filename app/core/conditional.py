@@ -0,0 +1,31 @@
+"""
+Helpers for ETags and conditional GET requests
+"""
+import hashlib
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import get_conditional_response, quote_etag
+
+
+def make_etag(*parts):
+    """Return a strong ETag built from parts"""
+    return quote_etag('-'.join(str(part) for part in parts))
+
+
+def media_tag(media_type):
+    """Return a short ETag part for a rendered media type"""
+    return hashlib.md5(media_type.encode()).hexdigest()[:8]
+
+
+def content_etag(content):
+    """Return a strong ETag for a rendered response body"""
+    return quote_etag(hashlib.md5(content).hexdigest())
+
+
+def not_modified(request, etag):
+    """Return a 304 response if If-None-Match matches etag, else None"""
+    response = get_conditional_response(request, etag=etag)
+    if isinstance(response, HttpResponseNotModified):
+        response['ETag'] = etag
+        return response
+    return None
@@ -0,0 +1,3 @@
+"""
+Pooled PostgreSQL database backend, used as ENGINE = 'core.db'
+"""
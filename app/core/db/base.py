@@ -0,0 +1,75 @@
+"""
+PostgreSQL backend that borrows connections from a per-process pool.
+
+Django closes its connection at the end of each request when
+CONN_MAX_AGE is 0; with this backend that hands the connection back to
+the pool instead, so requests skip the TCP, TLS and auth handshake. Pool
+sizing is read from the POOL dict of the database settings.
+"""
+import os
+import threading
+
+import psycopg2.extras
+from django.db.backends.postgresql import base
+
+from core.db.pool import ConnectionPool
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL DatabaseWrapper backed by core.db.pool.ConnectionPool"""
+
+    def get_pool(self, conn_params=None):
+        """Return this process's pool for the current connection params"""
+        if conn_params is None:
+            conn_params = self.get_connection_params()
+        key = (self.alias, os.getpid(), repr(sorted(conn_params.items())))
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    lambda: self.open_connection(conn_params),
+                    **self.settings_dict.get('POOL', {}),
+                )
+                _pools[key] = pool
+        return pool
+
+    @staticmethod
+    def open_connection(conn_params):
+        """Open a new psycopg2 connection for the pool"""
+        connection = base.Database.connect(**conn_params)
+        # Same dummy loads() as the stock backend, see get_new_connection
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.acquire()
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection)
+
+    def close_pool(self):
+        """Close this connection and every idle one in this process's pool"""
+        self.close()
+        self.get_pool().close_all()
+
+    def warm_pool(self):
+        """Open the pool's min_size connections; return how many opened"""
+        return self.get_pool().warm()
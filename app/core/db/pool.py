@@ -0,0 +1,166 @@
+"""
+A small thread-safe pool of DB-API connections
+"""
+import collections
+import os
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection frees up before the timeout"""
+
+
+class ConnectionPool:
+    """
+    Pool of connections opened by connect(), a zero-argument callable.
+
+    At most max_size connections are open at once; callers block for up to
+    timeout seconds when all of them are in use. Idle connections are closed
+    after idle_timeout seconds, and a connection that has been idle for at
+    least health_check_interval seconds is checked with SELECT 1 before it is
+    handed out again.
+    """
+
+    def __init__(
+        self,
+        connect,
+        max_size=10,
+        min_size=0,
+        idle_timeout=300,
+        health_check_interval=30,
+        timeout=30,
+    ):
+        self.connect = connect
+        self.max_size = max_size
+        self.min_size = min_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self.pid = os.getpid()
+        self.size = 0
+        self._idle = collections.deque()
+        self._cond = threading.Condition()
+
+    @property
+    def idle(self):
+        """Number of idle connections"""
+        return len(self._idle)
+
+    def acquire(self):
+        """Return a healthy connection, opening one if needed"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                conn, returned_at = self._checkout(deadline)
+            if conn is None:
+                return self._open()
+            idle_for = time.monotonic() - returned_at
+            if idle_for < self.health_check_interval or self._healthy(conn):
+                return conn
+            self.discard(conn)
+
+    def release(self, conn):
+        """Return a connection to the pool"""
+        if os.getpid() != self.pid:
+            # Inherited across fork; the parent still owns the socket
+            return
+        try:
+            if conn.closed:
+                raise ValueError('connection closed')
+            conn.rollback()
+        except Exception:
+            self.discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def discard(self, conn):
+        """Close a connection and free its slot"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self.size -= 1
+            self._cond.notify()
+
+    def warm(self):
+        """Open connections until min_size are available; return the count"""
+        opened = []
+        with self._cond:
+            wanted = max(min(self.min_size, self.max_size) - self.size, 0)
+            self.size += wanted
+        try:
+            for _ in range(wanted):
+                opened.append(self.connect())
+        finally:
+            with self._cond:
+                self.size -= wanted - len(opened)
+                now = time.monotonic()
+                self._idle.extend((conn, now) for conn in opened)
+                self._cond.notify_all()
+        return len(opened)
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._cond:
+            idle, self._idle = self._idle, collections.deque()
+        for conn, _ in idle:
+            self.discard(conn)
+
+    def _checkout(self, deadline):
+        """Take an idle connection or reserve a slot; lock must be held"""
+        while True:
+            self._prune()
+            if self._idle:
+                # Most recently used first, so spare connections can go idle
+                return self._idle.pop()
+            if self.size < self.max_size:
+                self.size += 1
+                return None, None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PoolTimeout(
+                    f'No connection available within {self.timeout}s '
+                    f'(max_size={self.max_size}).'
+                )
+            self._cond.wait(remaining)
+
+    def _prune(self):
+        """Close connections idle for longer than idle_timeout"""
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._idle and self.size > self.min_size:
+            conn, returned_at = self._idle[0]
+            if returned_at > cutoff:
+                break
+            self._idle.popleft()
+            self.size -= 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _open(self):
+        """Open a connection in a slot reserved by _checkout"""
+        try:
+            return self.connect()
+        except Exception:
+            with self._cond:
+                self.size -= 1
+                self._cond.notify()
+            raise
+
+    def _healthy(self, conn):
+        """Return True if conn still answers queries"""
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            finally:
+                cursor.close()
+            conn.rollback()
+        except Exception:
+            return False
+        return True
@@ -0,0 +1,18 @@
+"""
+Query plan helpers
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def explain(query):
+    """Run query once and return the database's plan for its last SQL"""
+    with CaptureQueriesContext(connection) as captured:
+        query()
+    sql = captured.captured_queries[-1]['sql']
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}')
+        return '\n'.join(
+            ' '.join(str(column) for column in row)
+            for row in cursor.fetchall()
+        )
@@ -0,0 +1,55 @@
+"""
+Password hashers with their cost parameters taken from settings.
+
+Django rehashes a password on the next successful login whenever the
+stored hash was made with a different algorithm or different parameters
+than the preferred hasher, so changing PASSWORD_HASHER_POLICY or
+PASSWORD_HASHER_PARAMS upgrades users transparently as they log in.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def get_params(policy):
+    """Return the configured cost parameters for a policy"""
+    return settings.PASSWORD_HASHER_PARAMS[policy]
+
+
+class TunablePBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with a configurable iteration count"""
+
+    @property
+    def iterations(self):
+        return get_params('pbkdf2')['iterations']
+
+
+class TunableArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with configurable time, memory and parallelism costs"""
+
+    @property
+    def time_cost(self):
+        return get_params('argon2')['time_cost']
+
+    @property
+    def memory_cost(self):
+        return get_params('argon2')['memory_cost']
+
+    @property
+    def parallelism(self):
+        return get_params('argon2')['parallelism']
+
+
+class TunableScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """Scrypt with configurable work factor, block size and parallelism"""
+
+    @property
+    def work_factor(self):
+        return get_params('scrypt')['work_factor']
+
+    @property
+    def block_size(self):
+        return get_params('scrypt')['block_size']
+
+    @property
+    def parallelism(self):
+        return get_params('scrypt')['parallelism']
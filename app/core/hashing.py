@@ -0,0 +1,109 @@
+"""
+Optional process pool for CPU-bound password hashing.
+
+When PASSWORD_HASHING_WORKERS is set, hashes are computed in a pool of
+worker processes so request threads only wait on a future instead of
+holding a core, and a login burst is spread across every core. With the
+pool disabled the functions here hash in-process, exactly like Django.
+If a pool worker dies, the broken pool is dropped, the hash is computed
+in-process and the next call starts a fresh pool.
+"""
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+_executor = None
+_lock = threading.Lock()
+
+
+def _init_worker(settings_module):
+    """Configure Django inside a pool worker"""
+    if settings_module:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def _verify(raw_password, encoded):
+    """Return (valid, must_update) for a password; runs in the pool"""
+    must_update = []
+    valid = hashers.check_password(
+        raw_password, encoded, setter=lambda raw: must_update.append(True),
+    )
+    return valid, bool(must_update)
+
+
+def get_executor():
+    """Return the hashing process pool, or None when it is disabled"""
+    global _executor
+    workers = settings.PASSWORD_HASHING_WORKERS
+    if not workers:
+        return None
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(os.environ.get('DJANGO_SETTINGS_MODULE'),),
+            )
+        return _executor
+
+
+def shutdown():
+    """Stop the pool, if one was started"""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+
+atexit.register(shutdown)
+
+
+def discard(executor):
+    """Drop executor if it is still the current pool"""
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def run(fn, *args):
+    """Call fn(*args) in the pool, or in-process if there is none"""
+    executor = get_executor()
+    if executor is None:
+        return fn(*args)
+    try:
+        return executor.submit(fn, *args).result()
+    except BrokenProcessPool:
+        discard(executor)
+        return fn(*args)
+
+
+def make_password(raw_password):
+    """Return the encoded hash of raw_password"""
+    if raw_password is None:
+        return hashers.make_password(raw_password)
+    return run(hashers.make_password, raw_password)
+
+
+def verify_password(raw_password, encoded):
+    """
+    Return (valid, must_update) for raw_password against encoded, where
+    must_update means the hash should be upgraded to the preferred hasher.
+    """
+    return run(_verify, raw_password, encoded)
+
+
+def set_password(user, raw_password):
+    """Hash raw_password and set it on user, like User.set_password"""
+    user.password = make_password(raw_password)
+    user._password = raw_password
@@ -0,0 +1,91 @@
+"""
+Idempotency-Key support for unsafe API requests.
+
+A client that retries a request with the same Idempotency-Key header
+gets the stored response back without the view running again. Keys are
+scoped to the user and the request path, the request body must match
+the original one, and only successful responses are stored.
+"""
+import functools
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+KEY_PREFIX = 'idempotency:'
+MAX_KEY_LENGTH = 255
+# Seconds another request with the same key is refused while one runs
+LOCK_TTL = 60
+
+
+def get_cache():
+    """Return the cache holding stored responses"""
+    return caches[settings.IDEMPOTENCY_CACHE]
+
+
+def cache_key(request, key):
+    """Return the cache key for key, scoped to the user and request"""
+    scope = f'{request.user.pk}:{request.method}:{request.path}:{key}'
+    return KEY_PREFIX + hashlib.sha256(scope.encode()).hexdigest()
+
+
+def error(detail, status_code):
+    """Return an error response for a rejected key"""
+    return Response({'detail': detail}, status=status_code)
+
+
+def idempotent(view):
+    """Replay the stored response for retries of a DRF view method"""
+    @functools.wraps(view)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return view(self, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return error(
+                f'{HEADER} must be 1 to {MAX_KEY_LENGTH} characters.',
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        cache = get_cache()
+        stored_key = cache_key(request, key)
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+        stored = cache.get(stored_key)
+        if stored is not None:
+            if stored['fingerprint'] != fingerprint:
+                return error(
+                    f'{HEADER} was already used with a different body.',
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            response = Response(stored['data'], status=stored['status'])
+            response[REPLAYED_HEADER] = 'true'
+            return response
+
+        lock_key = stored_key + ':lock'
+        if not cache.add(lock_key, True, LOCK_TTL):
+            return error(
+                f'A request with this {HEADER} is in progress.',
+                status.HTTP_409_CONFLICT,
+            )
+        try:
+            response = view(self, request, *args, **kwargs)
+            if status.is_success(response.status_code):
+                cache.set(
+                    stored_key,
+                    {
+                        'fingerprint': fingerprint,
+                        'status': response.status_code,
+                        'data': response.data,
+                    },
+                    settings.IDEMPOTENCY_KEY_TTL,
+                )
+        finally:
+            cache.delete(lock_key)
+        return response
+
+    return wrapper
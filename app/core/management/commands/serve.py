@@ -0,0 +1,150 @@
+"""
+Django command to run the production server
+"""
+import importlib.util
+import os
+import runpy
+import shlex
+import signal
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+APPLICATIONS = {
+    'wsgi': 'app.wsgi:application',
+    'asgi': 'app.asgi:application',
+}
+ASGI_WORKER_CLASS = 'uvicorn.workers.UvicornWorker'
+
+
+class Command(BaseCommand):
+    """Run gunicorn with the tuned configuration, or reload it."""
+    help = (
+        'Replace this process with a multi-worker gunicorn server using '
+        'gunicorn.conf.py: preloaded app, workers derived from the cores. '
+        'With --reload, gracefully switch a running server to the current '
+        'code instead.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--config',
+            default=str(settings.BASE_DIR / 'gunicorn.conf.py'),
+            help='Gunicorn configuration file.',
+        )
+        parser.add_argument('--bind', help='Address to listen on.')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Worker processes. Defaults to the count for the cores.',
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            help='Threads per worker; more than one uses gthread workers.',
+        )
+        parser.add_argument(
+            '--asgi',
+            action='store_true',
+            help='Serve app.asgi with uvicorn workers (needs uvicorn).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Print the gunicorn command instead of running it.',
+        )
+        parser.add_argument(
+            '--reload',
+            action='store_true',
+            help=(
+                'Start a new master for the running server with SIGUSR2 '
+                'and stop the old one once it is up.'
+            ),
+        )
+        parser.add_argument(
+            '--reload-timeout',
+            type=float,
+            default=60.0,
+            help='Seconds to wait for the new master.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        config = runpy.run_path(options['config'])
+        if options['reload']:
+            self.reload(config['pidfile'], options['reload_timeout'])
+            return
+
+        argv = self.command(options, config)
+        if options['dry_run']:
+            self.stdout.write(shlex.join(argv))
+            return
+        if importlib.util.find_spec('gunicorn') is None:
+            raise CommandError('gunicorn is not installed.')
+        if options['asgi'] and importlib.util.find_spec('uvicorn') is None:
+            raise CommandError('--asgi needs uvicorn installed.')
+        if settings.DEBUG:
+            self.stderr.write(self.style.WARNING(
+                'DEBUG is on; use --settings=app.settings_production.'
+            ))
+        if '--workers' in argv:
+            os.environ['WEB_CONCURRENCY'] = argv[argv.index('--workers') + 1]
+        sys.stdout.flush()
+        # gunicorn takes over this process, so it gets signals directly
+        os.execv(argv[0], argv)
+
+    def command(self, options, config):
+        """Return the gunicorn command line for options"""
+        argv = [
+            sys.executable, '-m', 'gunicorn', '--config', options['config'],
+        ]
+        if options['bind']:
+            argv += ['--bind', options['bind']]
+        if options['threads']:
+            argv += ['--threads', str(options['threads'])]
+            if options['threads'] > 1 and not options['asgi']:
+                argv += ['--worker-class', 'gthread']
+        if options['asgi']:
+            argv += ['--worker-class', ASGI_WORKER_CLASS]
+        workers = options['workers']
+        if not workers and options['asgi'] and not os.environ.get(
+            'GUNICORN_WORKERS'
+        ):
+            workers = config['default_workers'](ASGI_WORKER_CLASS)
+        if workers:
+            argv += ['--workers', str(workers)]
+        argv.append(APPLICATIONS['asgi' if options['asgi'] else 'wsgi'])
+        return argv
+
+    def reload(self, pidfile, timeout):
+        """Replace a running master with one running the current code"""
+        old_pid = read_pid(pidfile)
+        if old_pid is None:
+            raise CommandError(f'No running server found in {pidfile}.')
+        os.kill(old_pid, signal.SIGUSR2)
+
+        deadline = time.monotonic() + timeout
+        while read_pid(pidfile) in (None, old_pid):
+            if time.monotonic() > deadline:
+                raise CommandError(
+                    'The new master did not start; the old one keeps '
+                    'serving. Check the server log.'
+                )
+            time.sleep(0.5)
+        # TERM lets the old workers finish their requests
+        os.kill(old_pid, signal.SIGTERM)
+        self.stdout.write(self.style.SUCCESS(
+            f'Reloaded: master {old_pid} replaced by {read_pid(pidfile)}.'
+        ))
+
+
+def read_pid(pidfile):
+    """Return the pid in pidfile, or None"""
+    try:
+        with open(pidfile) as file:
+            return int(file.read().strip())
+    except (OSError, ValueError):
+        return None
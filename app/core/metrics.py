@@ -0,0 +1,388 @@
+"""
+Per-view request metrics.
+
+The instrumentation middleware opens a RequestStats for each request in
+a context variable. A database execute wrapper, installed on every new
+connection, and TimedSerializerMixin add to it; because context
+variables follow sync_to_async, queries run from async views are
+counted as well. Completed requests are folded into a process-wide
+registry rendered in the Prometheus text format.
+
+Each worker process keeps its own registry. With METRICS_DIR set, every
+worker writes a snapshot of its registry there at most every
+FLUSH_SECONDS, and a scrape served by any worker sums the snapshots of
+all of them, so the counters do not depend on which worker answers.
+Workers that exit fold their totals into a retired snapshot, keeping
+the counters monotonic across worker restarts.
+"""
+import bisect
+import contextlib
+import contextvars
+import fcntl
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+FLUSH_SECONDS = 5
+RETIRED_FILE = 'retired.json'
+
+current = contextvars.ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """Counters for the request being served"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper that counts queries and their time"""
+    stats = current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - start
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    """Count the queries of every connection"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextlib.contextmanager
+def serializing():
+    """Add the time spent in the block to the request's serializer time"""
+    stats = current.get()
+    if stats is None or stats.serializer_depth:
+        # Outside a request, or already timed by an enclosing block
+        yield
+        return
+    stats.serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializer_depth -= 1
+        stats.serializer_time += time.perf_counter() - start
+
+
+class TimedSerializerMixin:
+    """Add the time spent serializing to the current request's stats"""
+
+    def to_representation(self, instance):
+        with serializing():
+            return super().to_representation(instance)
+
+    def is_valid(self, raise_exception=False):
+        with serializing():
+            return super().is_valid(raise_exception=raise_exception)
+
+
+class Histogram:
+    """Cumulative-bucket histogram"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def dump(self):
+        """Return the histogram as JSON-serializable data"""
+        return {'counts': list(self.counts), 'sum': self.sum}
+
+    def load(self, data):
+        """Add the observations of a dumped histogram"""
+        self.counts = [
+            count + other for count, other in zip(self.counts, data['counts'])
+        ]
+        self.sum += data['sum']
+
+    def lines(self, name, labels):
+        """Yield the Prometheus sample lines of the histogram"""
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        cumulative += self.counts[-1]
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+        yield f'{name}_count{{{labels}}} {cumulative}'
+
+
+class ViewMetrics:
+    """Aggregated metrics of one view and method"""
+
+    def __init__(self):
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.max_queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.responses = {}
+
+    def dump(self):
+        """Return the metrics as JSON-serializable data"""
+        return {
+            'duration': self.duration.dump(),
+            'queries': self.queries.dump(),
+            'max_queries': self.max_queries,
+            'db_seconds': self.db_seconds,
+            'serializer_seconds': self.serializer_seconds,
+            'responses': {
+                str(status): count for status, count in self.responses.items()
+            },
+        }
+
+    def load(self, data):
+        """Add the observations of dumped metrics"""
+        self.duration.load(data['duration'])
+        self.queries.load(data['queries'])
+        self.max_queries = max(self.max_queries, data['max_queries'])
+        self.db_seconds += data['db_seconds']
+        self.serializer_seconds += data['serializer_seconds']
+        for status, count in data['responses'].items():
+            status = int(status)
+            self.responses[status] = self.responses.get(status, 0) + count
+
+
+class Registry:
+    """Thread-safe store of per-view metrics"""
+
+    def __init__(self):
+        self._views = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+        self._flushed = 0.0
+        self._pid = None
+        self._name = None
+        self._retired = None
+
+    def observe(self, view, method, status, duration, stats):
+        """Fold a completed request into the view's metrics"""
+        with self._lock:
+            metrics = self._views.get((view, method))
+            if metrics is None:
+                metrics = self._views[(view, method)] = ViewMetrics()
+            metrics.duration.observe(duration)
+            metrics.queries.observe(stats.queries)
+            metrics.max_queries = max(metrics.max_queries, stats.queries)
+            metrics.db_seconds += stats.db_time
+            metrics.serializer_seconds += stats.serializer_time
+            metrics.responses[status] = metrics.responses.get(status, 0) + 1
+        if (
+            settings.METRICS_DIR
+            and time.monotonic() - self._flushed >= FLUSH_SECONDS
+        ):
+            self.flush()
+
+    def register_collector(self, collector):
+        """Add a callable returning extra {counter name: value} totals"""
+        self._collectors.append(collector)
+
+    def reset(self):
+        """Forget every observation"""
+        with self._lock:
+            self._views = {}
+
+    def get(self, view, method):
+        """Return the ViewMetrics of view and method, or None"""
+        return self._views.get((view, method))
+
+    def snapshot(self):
+        """Return this process's metrics as JSON-serializable data"""
+        with self._lock:
+            views = [
+                [view, method, metrics.dump()]
+                for (view, method), metrics in self._views.items()
+            ]
+        counters = {}
+        for collector in self._collectors:
+            counters.update(collector())
+        return {'views': views, 'counters': counters}
+
+    def path(self):
+        """Return the snapshot file of this process in METRICS_DIR"""
+        pid = os.getpid()
+        if self._pid != pid:
+            # A new process, forked or reusing a dead worker's pid
+            self._pid = pid
+            self._name = f'worker-{pid}-{time.time_ns()}.json'
+        return os.path.join(settings.METRICS_DIR, self._name)
+
+    def flush(self):
+        """Write this process's snapshot to METRICS_DIR"""
+        self._flushed = time.monotonic()
+        write_json(self.path(), self.snapshot())
+
+    def retire(self):
+        """Fold this process's snapshot into the retired totals, once"""
+        if not settings.METRICS_DIR or self._retired == os.getpid():
+            return
+        self._retired = os.getpid()
+        retired = os.path.join(settings.METRICS_DIR, RETIRED_FILE)
+        with locked(settings.METRICS_DIR, fcntl.LOCK_EX):
+            snapshots = [self.snapshot()]
+            with contextlib.suppress(OSError, ValueError):
+                with open(retired, encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            write_json(retired, dump(*merge(snapshots)))
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.path())
+
+    def render(self):
+        """
+        Return every metric in the Prometheus text format, summed over
+        every worker's snapshot when METRICS_DIR is set
+        """
+        if settings.METRICS_DIR:
+            self.flush()
+            snapshots = read_snapshots(settings.METRICS_DIR)
+        else:
+            snapshots = [self.snapshot()]
+        return render(*merge(snapshots))
+
+
+def merge(snapshots):
+    """Sum snapshots into ({(view, method): ViewMetrics}, counters)"""
+    views = {}
+    counters = {}
+    for snapshot in snapshots:
+        for view, method, data in snapshot['views']:
+            metrics = views.get((view, method))
+            if metrics is None:
+                metrics = views[(view, method)] = ViewMetrics()
+            metrics.load(data)
+        for name, value in snapshot['counters'].items():
+            counters[name] = counters.get(name, 0) + value
+    return views, counters
+
+
+def dump(views, counters):
+    """Return merged views and counters as a snapshot"""
+    return {
+        'views': [
+            [view, method, metrics.dump()]
+            for (view, method), metrics in views.items()
+        ],
+        'counters': counters,
+    }
+
+
+def write_json(path, data):
+    """Replace path with data, so readers never see a partial file"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+
+@contextlib.contextmanager
+def locked(directory, operation):
+    """Hold the directory's lock file while the block runs"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'lock'), 'a') as f:
+        fcntl.flock(f, operation)
+        yield
+
+
+def read_snapshots(directory):
+    """Return every snapshot in directory"""
+    snapshots = []
+    # Shared, so a worker retiring is never half seen
+    with locked(directory, fcntl.LOCK_SH):
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+    return snapshots
+
+
+def render(views, counters):
+    """Return merged views and counters in the Prometheus text format"""
+    views = sorted(views.items())
+    lines = [
+        '# TYPE http_requests_total counter',
+        *(
+            f'http_requests_total{{{labels(view, method)},'
+            f'status="{status}"}} {count}'
+            for (view, method), metrics in views
+            for status, count in sorted(metrics.responses.items())
+        ),
+        '# TYPE http_request_duration_seconds histogram',
+        *(
+            line
+            for (view, method), metrics in views
+            for line in metrics.duration.lines(
+                'http_request_duration_seconds', labels(view, method),
+            )
+        ),
+        '# TYPE http_request_db_queries histogram',
+        *(
+            line
+            for (view, method), metrics in views
+            for line in metrics.queries.lines(
+                'http_request_db_queries', labels(view, method),
+            )
+        ),
+        '# TYPE http_request_db_queries_max gauge',
+        *(
+            f'http_request_db_queries_max{{{labels(view, method)}}} '
+            f'{metrics.max_queries}'
+            for (view, method), metrics in views
+        ),
+        '# TYPE http_request_db_seconds_total counter',
+        *(
+            f'http_request_db_seconds_total'
+            f'{{{labels(view, method)}}} {metrics.db_seconds}'
+            for (view, method), metrics in views
+        ),
+        '# TYPE http_request_serializer_seconds_total counter',
+        *(
+            f'http_request_serializer_seconds_total'
+            f'{{{labels(view, method)}}} '
+            f'{metrics.serializer_seconds}'
+            for (view, method), metrics in views
+        ),
+    ]
+    for name, value in sorted(counters.items()):
+        lines.append(f'# TYPE {name} counter')
+        lines.append(f'{name} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def labels(view, method):
+    """Return the label set of a view and method"""
+    view = view.replace('\\', '\\\\').replace('"', '\\"')
+    return f'view="{view}",method="{method}"'
+
+
+registry = Registry()
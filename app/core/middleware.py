@@ -0,0 +1,55 @@
+"""
+Request instrumentation middleware
+"""
+import asyncio
+import time
+
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from core import metrics
+
+
+class InstrumentationMiddleware(MiddlewareMixin):
+    """
+    Record query count, database time, serializer time and latency for
+    every request, per resolved view, and optionally report them in a
+    Server-Timing response header. Works under WSGI and ASGI.
+    """
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        stats = metrics.RequestStats()
+        token = metrics.current.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current.reset(token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = metrics.RequestStats()
+        token = metrics.current.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current.reset(token)
+        return self.finish(request, response, stats)
+
+    def finish(self, request, response, stats):
+        """Record the request and add the Server-Timing header"""
+        duration = time.perf_counter() - stats.start
+        match = request.resolver_match
+        view = match.view_name if match is not None else '<unresolved>'
+        metrics.registry.observe(
+            view, request.method, response.status_code, duration, stats,
+        )
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={stats.db_time * 1000:.2f};'
+                f'desc="{stats.queries} queries"',
+                f'serializer;dur={stats.serializer_time * 1000:.2f}',
+                f'total;dur={duration * 1000:.2f}',
+            ])
+        return response
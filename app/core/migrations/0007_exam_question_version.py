@@ -0,0 +1,18 @@
+# Generated by Django 4.0.10 on 2026-10-18 01:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_alter_exam_question_answer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exam_question',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.0.10 on 2026-10-18 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_exam_question_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user_answer',
+            index=models.Index(fields=['user', 'question'], name='user_answer_user_question_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user_answer',
+            index=models.Index(fields=['question', 'iscorrect'], name='user_answer_q_correct_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.0.10 on 2026-10-18 01:47
+
+from django.db import migrations
+from django.db.models import Count, Max, Q
+
+
+def dedupe_user_answers(apps, schema_editor):
+    """
+    Keep only the newest answer per user and question, so the unique
+    constraint added next can be created, and recount the leaderboard
+    rows of the users that lost answers.
+    """
+    User_Answer = apps.get_model('core', 'User_Answer')
+    Leaderboard = apps.get_model('core', 'Leaderboard')
+
+    duplicates = User_Answer.objects.values('user', 'question').annotate(
+        answers=Count('id'),
+        keep=Max('id'),
+    ).filter(answers__gt=1).order_by()
+
+    users = set()
+    for row in duplicates.iterator():
+        User_Answer.objects.filter(
+            user=row['user'], question=row['question'],
+        ).exclude(id=row['keep']).delete()
+        users.add(row['user'])
+
+    for user_id in users:
+        counts = User_Answer.objects.filter(
+            user=user_id, issubmitted=True,
+        ).aggregate(
+            correct=Count('id', filter=Q(iscorrect=True)),
+            submitted=Count('id'),
+        )
+        Leaderboard.objects.update_or_create(user_id=user_id, defaults=counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_leaderboard'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            dedupe_user_answers,
+            migrations.RunPython.noop,
+        ),
+    ]
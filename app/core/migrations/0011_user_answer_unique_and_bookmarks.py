@@ -0,0 +1,25 @@
+# Generated by Django 4.0.10 on 2026-10-18 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_dedupe_user_answers'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user_answer',
+            name='user_answer_user_question_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user_answer',
+            index=models.Index(condition=models.Q(('isbookmarked', True)), fields=['user', '-id'], name='user_answer_bookmarked_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='user_answer',
+            constraint=models.UniqueConstraint(fields=('user', 'question'), name='user_answer_user_question_uniq'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.0.10 on 2026-10-18 01:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_user_answer_unique_and_bookmarks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Exam_Session',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_ids', models.JSONField()),
+                ('snapshot', models.BinaryField()),
+                ('Created_Date', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
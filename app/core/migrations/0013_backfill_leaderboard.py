@@ -0,0 +1,46 @@
+# Generated by Django 4.0.10 on 2026-10-18 09:12
+
+from django.db import migrations
+from django.db.models import Count, Q
+
+
+def backfill_leaderboard(apps, schema_editor):
+    """
+    Count the answers submitted before the leaderboard existed, which
+    0009 created empty, so later deltas add to complete rows.
+    """
+    User_Answer = apps.get_model('core', 'User_Answer')
+    Leaderboard = apps.get_model('core', 'Leaderboard')
+
+    Leaderboard.objects.all().delete()
+    rows = User_Answer.objects.filter(issubmitted=True).values(
+        'user',
+    ).annotate(
+        correct=Count('id', filter=Q(iscorrect=True)),
+        submitted=Count('id'),
+    ).order_by()
+    Leaderboard.objects.bulk_create(
+        (
+            Leaderboard(
+                user_id=row['user'],
+                correct=row['correct'],
+                submitted=row['submitted'],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_exam_session'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_leaderboard,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -9,6 +9,8 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 
+from core import hashing
+
 
 class UserManager(BaseUserManager):
     """Manager for users"""
@@ -18,7 +20,7 @@ class UserManager(BaseUserManager):
         if not email:
             raise ValueError('User must have an email address.')
         user = self.model(email=self.normalize_email(email), **extra_fields)
-        user.set_password(password)
+        hashing.set_password(user, password)
         user.save(using=self._db)
 
         return user
@@ -48,15 +50,40 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
 
 
+class Exam_QuestionQuerySet(models.QuerySet):
+    """Questions whose bulk updates bump the version of every row"""
+
+    def update(self, **kwargs):
+        """Update rows, bumping their versions; bulk_update uses this too"""
+        kwargs.setdefault('version', models.F('version') + 1)
+        return super().update(**kwargs)
+
+
 class Exam_Question(models.Model):
     "Exam Question"
     question = models.TextField(max_length=255)
     choices = models.JSONField()
     answer = models.CharField(max_length=255, blank=True, null=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = Exam_QuestionQuerySet.as_manager()
 
     def __str__(self):
         return self.question
 
+    def save(self, *args, **kwargs):
+        """Bump the version on every update, used for the ETag"""
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        # Incremented by the database, so concurrent saves never store
+        # different content under the same version
+        self.version = models.F('version') + 1
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=['version'])
+
 
 class User_Answer(models.Model):
     user = models.ForeignKey(
@@ -72,5 +99,66 @@ class User_Answer(models.Model):
     issubmitted = models.BooleanField()
     isbookmarked = models.BooleanField()
 
+    class Meta:
+        constraints = [
+            # One answer per user per question; its index also serves a
+            # user's answers and lookups of one answer per question
+            models.UniqueConstraint(
+                fields=['user', 'question'],
+                name='user_answer_user_question_uniq',
+            ),
+        ]
+        indexes = [
+            # Per-question attempt and correct counts
+            models.Index(
+                fields=['question', 'iscorrect'],
+                name='user_answer_q_correct_idx',
+            ),
+            # A user's bookmarked answers, newest first
+            models.Index(
+                fields=['user', '-id'],
+                condition=models.Q(isbookmarked=True),
+                name='user_answer_bookmarked_idx',
+            ),
+        ]
+
     def __str__(self):
         return self.user_answer
+
+
+class Leaderboard(models.Model):
+    """Materialized per-user answer counts used for ranking"""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        )
+    correct = models.PositiveIntegerField(default=0)
+    submitted = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Top-N reads and rank counts walk this index
+            models.Index(
+                fields=['-correct', 'user'],
+                name='leaderboard_correct_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id}: {self.correct}'
+
+
+class Exam_Session(models.Model):
+    "Exam sitting with a frozen snapshot of its questions"
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        )
+    question_ids = models.JSONField()
+    # Pre-rendered JSON array of the questions, without their answers
+    snapshot = models.BinaryField()
+    Created_Date = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.user_id}: {len(self.question_ids)} questions'
@@ -0,0 +1,106 @@
+"""
+JSON renderer and parser backed by orjson.
+
+In API_COMPACT mode the renderer ignores requests for indented output.
+Both fall back to DRF's json-module implementations when orjson is not
+installed, and the renderer also does whenever orjson cannot produce
+the same document: ASCII-only output, non-compact separators, an
+indent other than 2, values orjson rejects such as integers wider than
+64 bits, and NaN or infinite floats, which orjson would write as null
+where JSONRenderer refuses them. Types orjson does not know, and dates
+and times, go through DRF's JSONEncoder so they are formatted as before.
+
+One difference remains: very large and very small floats, which
+Python writes in exponent notation, take orjson's form instead, such as
+1e16 for 1e+16 or 0.00001 for 1e-05. Both denote the same double.
+
+The parser falls back to JSONParser for any document orjson rejects,
+such as one with integers wider than 64 bits.
+"""
+import io
+import math
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+UTF8_NAMES = {'utf-8', 'utf8'}
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Render JSON with orjson"""
+
+    def get_indent(self, accepted_media_type, renderer_context):
+        if settings.API_COMPACT:
+            return None
+        return super().get_indent(accepted_media_type, renderer_context)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if self.ensure_ascii or indent not in (None, 2) or (
+            indent is None and not self.compact
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        option = (OPTIONS | orjson.OPT_INDENT_2) if indent else OPTIONS
+        try:
+            content = orjson.dumps(
+                data, default=self.encoder_class().default, option=option,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'null' in content and has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped like JSONRenderer, so the output is valid JavaScript
+        return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+            b'\xe2\x80\xa9', b'\\u2029',
+        )
+
+
+class ORJSONParser(JSONParser):
+    """Parse JSON with orjson"""
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get(
+            'encoding', settings.DEFAULT_CHARSET,
+        )
+        if orjson is None or encoding.lower() not in UTF8_NAMES:
+            return super().parse(stream, media_type, parser_context)
+        content = stream.read()
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Also raises the ParseError for documents that are invalid
+            return super().parse(
+                io.BytesIO(content), media_type, parser_context,
+            )
+
+
+def has_non_finite(data):
+    """Return True if a NaN or infinite float occurs anywhere in data"""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
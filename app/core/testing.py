@@ -0,0 +1,50 @@
+"""
+Test helpers
+"""
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetContext(CaptureQueriesContext):
+    """Fail the test if the block runs more queries than its budget"""
+
+    def __init__(self, test_case, name, budget, connection):
+        self.test_case = test_case
+        self.name = name
+        self.budget = budget
+        super().__init__(connection)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        executed = len(self)
+        self.test_case.assertLessEqual(
+            executed, self.budget,
+            '%s ran %d queries, over its budget of %d:\n%s' % (
+                self.name, executed, self.budget,
+                '\n'.join(
+                    '%d. %s' % (i, query['sql'])
+                    for i, query in enumerate(self.captured_queries, start=1)
+                ),
+            ),
+        )
+
+
+class QueryBudgetMixin:
+    """
+    Declare query budgets per endpoint on a TestCase.
+
+    Set query_budgets to a mapping of endpoint name to the most queries
+    a request to it may run, and wrap each request in
+    assertQueryBudget(name). Running fewer queries than the budget
+    passes, so budgets only need tightening when an endpoint gets
+    cheaper.
+    """
+    query_budgets = {}
+
+    def assertQueryBudget(self, name, using=DEFAULT_DB_ALIAS):
+        """Return a context manager checking the budget of name"""
+        return QueryBudgetContext(
+            self, name, self.query_budgets[name], connections[using],
+        )
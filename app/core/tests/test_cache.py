@@ -0,0 +1,45 @@
+"""
+Tests for the in-process caching helpers
+"""
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.cache import LRUCache
+
+
+class LRUCacheTests(SimpleTestCase):
+    """Test the LRU cache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted when full"""
+        cache = LRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    @patch('core.cache.time.monotonic')
+    def test_entries_expire(self, patched_monotonic):
+        """Test entries are dropped once their TTL passes"""
+        patched_monotonic.return_value = 100
+        cache = LRUCache(ttl=10)
+        cache.set('a', 1)
+
+        patched_monotonic.return_value = 109
+        self.assertEqual(cache.get('a'), 1)
+        patched_monotonic.return_value = 110
+        self.assertIsNone(cache.get('a'))
+
+    def test_delete_where(self):
+        """Test entries can be dropped by value"""
+        cache = LRUCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        self.assertEqual(cache.delete_where(lambda value: value == 2), 1)
+        self.assertEqual(len(cache), 1)
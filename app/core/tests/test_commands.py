@@ -3,10 +3,16 @@
 Test custom Django manamgement commands
 
 """
-
-from unittest.mock import patch
+import os
+import runpy
+import signal
+import tempfile
+from io import StringIO
+from unittest.mock import Mock, patch
 from psycopg2 import OperationalError as Psycopg2OpError
+from django.conf import settings
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
 from django.test import SimpleTestCase
 
@@ -28,3 +34,115 @@ class CommandTests(SimpleTestCase):
         call_command('wait_for_db')
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+
+@patch.dict(os.environ)
+class ServeCommandTests(SimpleTestCase):
+    """Test the serve command"""
+
+    def serve(self, *args):
+        out = StringIO()
+        call_command('serve', *args, stdout=out)
+        return out.getvalue()
+
+    def test_serve_dry_run(self):
+        """Test the gunicorn command uses the config and the WSGI app."""
+        argv = self.serve('--dry-run', '--bind', '127.0.0.1:9000').split()
+
+        self.assertEqual(argv[1:4], ['-m', 'gunicorn', '--config'])
+        self.assertTrue(argv[4].endswith('gunicorn.conf.py'))
+        self.assertIn('127.0.0.1:9000', argv)
+        self.assertEqual(argv[-1], 'app.wsgi:application')
+
+    @patch.dict(os.environ, {'GUNICORN_WORKERS': ''})
+    @patch('os.sched_getaffinity', return_value={0, 1}, create=True)
+    def test_serve_asgi(self, patched_affinity):
+        """Test --asgi runs one uvicorn worker per core."""
+        argv = self.serve('--dry-run', '--asgi').split()
+
+        self.assertIn('uvicorn.workers.UvicornWorker', argv)
+        self.assertEqual(argv[argv.index('--workers') + 1], '2')
+        self.assertEqual(argv[-1], 'app.asgi:application')
+
+    @patch('time.sleep')
+    @patch('os.kill')
+    def test_serve_reload(self, patched_kill, patched_sleep):
+        """Test reload starts a new master, then stops the old one."""
+        with tempfile.TemporaryDirectory() as directory:
+            pidfile = os.path.join(directory, 'gunicorn.pid')
+            with open(pidfile, 'w') as file:
+                file.write('100\n')
+
+            def new_master(seconds):
+                with open(pidfile, 'w') as file:
+                    file.write('200\n')
+            patched_sleep.side_effect = new_master
+
+            with patch.dict(os.environ, {'GUNICORN_PIDFILE': pidfile}):
+                out = self.serve('--reload')
+
+        self.assertEqual(patched_kill.call_args_list, [
+            ((100, signal.SIGUSR2),), ((100, signal.SIGTERM),),
+        ])
+        self.assertIn('200', out)
+
+    @patch('django.db.connections')
+    def test_pre_fork_closes_pools(self, patched_connections):
+        """Test forking closes pooled connections, not just releases them."""
+        pooled, plain = Mock(), Mock(spec=['close'])
+        patched_connections.all.return_value = [pooled, plain]
+        config = runpy.run_path(
+            str(settings.BASE_DIR / 'gunicorn.conf.py'),
+        )
+
+        config['pre_fork'](None, None)
+
+        pooled.close_pool.assert_called_once_with()
+        plain.close.assert_called_once_with()
+
+    @patch('django.db.connections')
+    def test_post_fork_warms_pool(self, patched_connections):
+        """Test each worker opens its own pooled connections."""
+        connection = patched_connections.__getitem__.return_value
+        config = runpy.run_path(
+            str(settings.BASE_DIR / 'gunicorn.conf.py'),
+        )
+
+        config['post_fork'](None, None)
+
+        connection.warm_pool.assert_called_once_with()
+
+    @patch('core.metrics.registry')
+    def test_worker_exit_retires_metrics(self, patched_registry):
+        """Test an exiting worker keeps its metrics in the totals."""
+        config = runpy.run_path(
+            str(settings.BASE_DIR / 'gunicorn.conf.py'),
+        )
+
+        config['worker_exit'](None, None)
+
+        patched_registry.retire.assert_called_once_with()
+
+    def test_metrics_dir_per_master(self):
+        """Test a re-executed master does not reuse the old directory."""
+        os.environ['METRICS_DIR'] = '/tmp/app-metrics-1'
+
+        config = runpy.run_path(
+            str(settings.BASE_DIR / 'gunicorn.conf.py'),
+        )
+
+        self.assertTrue(
+            config['metrics_dir'].endswith(f'app-metrics-{os.getpid()}'),
+        )
+        self.assertEqual(os.environ['METRICS_DIR'], config['metrics_dir'])
+
+    @patch('os.kill')
+    def test_serve_reload_not_running(self, patched_kill):
+        """Test reload fails when no server is running."""
+        with tempfile.TemporaryDirectory() as directory:
+            pidfile = os.path.join(directory, 'gunicorn.pid')
+            with patch.dict(os.environ, {'GUNICORN_PIDFILE': pidfile}):
+                with self.assertRaises(CommandError):
+                    self.serve('--reload')
+
+        patched_kill.assert_not_called()
@@ -0,0 +1,105 @@
+"""
+Tests for the database connection pool
+"""
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    """Stand-in for a DB-API connection"""
+
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql):
+        if not self.healthy:
+            raise RuntimeError('server closed the connection')
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Test the connection pool"""
+
+    def make_pool(self, **options):
+        self.opened = []
+
+        def connect():
+            conn = FakeConnection()
+            self.opened.append(conn)
+            return conn
+
+        return ConnectionPool(connect, **options)
+
+    def test_released_connection_reused(self):
+        """Test a released connection is handed out again"""
+        pool = self.make_pool()
+        conn = pool.acquire()
+        pool.release(conn)
+
+        self.assertIs(pool.acquire(), conn)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_max_size_blocks_then_times_out(self):
+        """Test acquiring beyond max_size waits and then fails"""
+        pool = self.make_pool(max_size=1, timeout=0.01)
+        pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+    def test_unhealthy_connection_replaced(self):
+        """Test a connection failing its health check is discarded"""
+        pool = self.make_pool(health_check_interval=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.healthy = False
+
+        replacement = pool.acquire()
+
+        self.assertIsNot(replacement, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.size, 1)
+
+    @patch('core.db.pool.time.monotonic')
+    def test_idle_connections_pruned(self, patched_monotonic):
+        """Test connections idle past idle_timeout are closed"""
+        patched_monotonic.return_value = 100
+        pool = self.make_pool(idle_timeout=10)
+        conn = pool.acquire()
+        pool.release(conn)
+
+        patched_monotonic.return_value = 111
+        fresh = pool.acquire()
+
+        self.assertTrue(conn.closed)
+        self.assertIsNot(fresh, conn)
+
+    def test_closed_connection_not_returned(self):
+        """Test a connection closed by the caller frees its slot"""
+        pool = self.make_pool(max_size=1)
+        conn = pool.acquire()
+        conn.closed = True
+        pool.release(conn)
+
+        self.assertEqual(pool.size, 0)
+        self.assertEqual(pool.idle, 0)
+
+    def test_warm_opens_min_size(self):
+        """Test warming opens min_size idle connections"""
+        pool = self.make_pool(min_size=3, max_size=5)
+
+        self.assertEqual(pool.warm(), 3)
+        self.assertEqual(pool.idle, 3)
+        self.assertEqual(pool.warm(), 0)
@@ -0,0 +1,73 @@
+"""
+Tests for the password hasher policy
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core import throttling
+
+
+TOKEN_URL = reverse('user:token')
+
+FAST_PARAMS = {
+    'pbkdf2': {'iterations': 1000},
+    'argon2': {'time_cost': 1, 'memory_cost': 1024, 'parallelism': 1},
+    'scrypt': {'work_factor': 2 ** 10, 'block_size': 8, 'parallelism': 1},
+}
+
+
+def policy_hashers(preferred):
+    """Return PASSWORD_HASHERS preferring the given hasher class"""
+    names = ['PBKDF2', 'Scrypt', 'Argon2']
+    names.remove(preferred)
+    return [
+        f'core.hashers.Tunable{name}PasswordHasher'
+        for name in [preferred] + names
+    ]
+
+
+@override_settings(
+    PASSWORD_HASHER_PARAMS=FAST_PARAMS,
+    PASSWORD_HASHERS=policy_hashers('PBKDF2'),
+)
+class HasherPolicyTests(TestCase):
+    """Test settings-driven hashing and upgrade on login"""
+
+    def setUp(self):
+        self.client = APIClient()
+        throttling.reset()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+        )
+
+    def login(self):
+        """Log in through the token endpoint"""
+        self.client.post(TOKEN_URL, {
+            'email': 'test@example.com',
+            'password': 'testpass123',
+        })
+        self.user.refresh_from_db()
+
+    def test_hash_uses_configured_params(self):
+        """Test new hashes use the configured iteration count"""
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_rehash_on_login_when_cost_changes(self):
+        """Test a changed cost upgrades the hash on the next login"""
+        params = {**FAST_PARAMS, 'pbkdf2': {'iterations': 2000}}
+        with self.settings(PASSWORD_HASHER_PARAMS=params):
+            self.login()
+
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+
+    def test_rehash_on_login_when_policy_changes(self):
+        """Test switching policy upgrades the algorithm on next login"""
+        with self.settings(PASSWORD_HASHERS=policy_hashers('Scrypt')):
+            self.login()
+
+        self.assertTrue(self.user.password.startswith('scrypt$1024$'))
+        self.assertTrue(self.user.check_password('testpass123'))
@@ -0,0 +1,82 @@
+"""
+Tests for the password hashing pool
+"""
+import os
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core import hashing, throttling
+
+
+TOKEN_URL = reverse('user:token')
+
+
+class HashingTests(TestCase):
+    """Test hashing in-process and in the pool"""
+
+    def setUp(self):
+        throttling.reset()
+
+    def tearDown(self):
+        hashing.shutdown()
+
+    def test_pool_disabled_by_default(self):
+        """Test no pool is started unless configured"""
+        self.assertIsNone(hashing.get_executor())
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1)
+    def test_hash_and_verify_in_pool(self):
+        """Test hashes made in the pool verify"""
+        self.assertIsNotNone(hashing.get_executor())
+        encoded = hashing.make_password('testpass123')
+
+        self.assertEqual(
+            hashing.verify_password('testpass123', encoded), (True, False),
+        )
+        self.assertEqual(
+            hashing.verify_password('wrongpass', encoded), (False, False),
+        )
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1)
+    def test_token_issued_with_pool(self):
+        """Test users created and logged in through the pool"""
+        user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+        )
+        self.assertTrue(user.check_password('testpass123'))
+
+        res = APIClient().post(TOKEN_URL, {
+            'email': 'test@example.com',
+            'password': 'testpass123',
+        })
+
+        self.assertIn('token', res.data)
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1)
+    def test_broken_pool_replaced(self):
+        """Test a pool whose worker died is dropped, not reused"""
+        broken = hashing.get_executor()
+        broken.submit(os._exit, 1).exception()
+
+        encoded = hashing.make_password('testpass123')
+
+        self.assertEqual(
+            hashing.verify_password('testpass123', encoded), (True, False),
+        )
+        self.assertIsNot(hashing.get_executor(), broken)
+
+    def test_must_update_reported(self):
+        """Test verification flags hashes made with an old cost"""
+        encoded = hashing.make_password('testpass123')
+        params = {'pbkdf2': {'iterations': 1000}}
+
+        with self.settings(PASSWORD_HASHER_PARAMS=params):
+            self.assertEqual(
+                hashing.verify_password('testpass123', encoded),
+                (True, True),
+            )
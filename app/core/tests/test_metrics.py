@@ -0,0 +1,204 @@
+"""
+Tests for request instrumentation and metrics
+"""
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    AsyncClient, SimpleTestCase, TestCase, override_settings,
+)
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import metrics
+from core.models import Exam_Question
+from exam_question import generation
+
+
+METRICS_URL = reverse('metrics')
+QUESTIONS_URL = reverse('exam_question:exam_question-list')
+USER_URL = reverse('user:user')
+
+
+def async_detail_url(question_id):
+    """Create and return an async question detail URL"""
+    return reverse(
+        'exam_question:async-exam_question-detail', args=[question_id],
+    )
+
+
+class HistogramTests(SimpleTestCase):
+    """Test the histogram exposition"""
+
+    def test_cumulative_buckets(self):
+        """Test bucket counts are cumulative and end with +Inf"""
+        histogram = metrics.Histogram((1, 5))
+        for value in (0, 3, 3, 9):
+            histogram.observe(value)
+
+        lines = list(histogram.lines('q', 'view="v"'))
+
+        self.assertEqual(lines, [
+            'q_bucket{view="v",le="1"} 1',
+            'q_bucket{view="v",le="5"} 3',
+            'q_bucket{view="v",le="+Inf"} 4',
+            'q_sum{view="v"} 15.0',
+            'q_count{view="v"} 4',
+        ])
+
+
+class PooledMetricsTests(SimpleTestCase):
+    """Test worker registries pooled through METRICS_DIR"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings = self.settings(METRICS_DIR=self.directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def worker(self, status=200):
+        """Return a registry that served one request"""
+        registry = metrics.Registry()
+        registry.register_collector(lambda: {'things_total': 1})
+        registry.observe('v', 'GET', status, 0.01, metrics.RequestStats())
+        return registry
+
+    def test_scrape_sums_every_worker(self):
+        """Test any worker reports the totals of all of them"""
+        self.worker()
+        body = self.worker(404).render()
+
+        self.assertIn('http_requests_total{view="v",method="GET",'
+                      'status="200"} 1', body)
+        self.assertIn('http_requests_total{view="v",method="GET",'
+                      'status="404"} 1', body)
+        self.assertIn(
+            'http_request_duration_seconds_count{view="v",method="GET"} 2',
+            body,
+        )
+        self.assertIn('things_total 2', body)
+
+    def test_exited_worker_still_counted(self):
+        """Test counters keep a retired worker's requests"""
+        first, second = self.worker(), self.worker()
+        first.retire()
+        first.retire()
+
+        body = second.render()
+
+        self.assertIn('status="200"} 2', body)
+        self.assertEqual(
+            len([name for name in os.listdir(self.directory)
+                 if name.endswith('.json')]),
+            2,
+        )
+
+
+class InstrumentationTests(TestCase):
+    """Test per-view metrics recorded by the middleware"""
+
+    def setUp(self):
+        metrics.registry.reset()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Exam_Question.objects.bulk_create([
+            Exam_Question(question=f'Q{i}?', choices=['A', 'B'], answer='A')
+            for i in range(3)
+        ])
+        # bulk_create sends no post_save signals
+        generation.bump()
+        self.question = Exam_Question.objects.first()
+        token = Token.objects.create(user=self.user)
+        self.auth = {'authorization': f'Token {token.key}'}
+
+    def test_queries_and_serializer_time_recorded(self):
+        """Test a request records its queries and serializer time"""
+        self.client.get(QUESTIONS_URL)
+
+        recorded = metrics.registry.get(
+            'exam_question:exam_question-list', 'GET',
+        )
+        self.assertEqual(recorded.max_queries, 1)
+        self.assertGreater(recorded.serializer_seconds, 0)
+        self.assertEqual(recorded.responses, {200: 1})
+
+    def test_server_timing_header(self):
+        """Test the Server-Timing header reports each phase"""
+        with self.settings(SERVER_TIMING=True):
+            res = self.client.get(USER_URL)
+
+        timing = res['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('serializer;dur=', timing)
+        self.assertIn('total;dur=', timing)
+
+    def test_server_timing_disabled(self):
+        """Test no header is sent unless enabled"""
+        with self.settings(SERVER_TIMING=False):
+            res = self.client.get(USER_URL)
+
+        self.assertNotIn('Server-Timing', res)
+
+    async def test_async_view_queries_recorded(self):
+        """Test queries run through sync_to_async are counted"""
+        res = await AsyncClient().get(
+            async_detail_url(self.question.id), **self.auth,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        recorded = metrics.registry.get(
+            'exam_question:async-exam_question-detail', 'GET',
+        )
+        self.assertGreater(recorded.max_queries, 0)
+
+
+@override_settings(METRICS_TOKEN='scrape-secret')
+class MetricsViewTests(TestCase):
+    """Test the Prometheus metrics endpoint"""
+
+    def setUp(self):
+        metrics.registry.reset()
+        self.auth = {'HTTP_AUTHORIZATION': 'Bearer scrape-secret'}
+
+    def test_metrics_exposed_with_token(self):
+        """Test clients bearing the token get the exposition text"""
+        self.client.get(METRICS_URL, **self.auth)
+
+        res = self.client.get(METRICS_URL, **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/plain'))
+        body = res.content.decode()
+        self.assertIn(
+            'http_requests_total{view="metrics",method="GET",status="200"} 1',
+            body,
+        )
+        self.assertIn('exam_question_response_cache_hits_total', body)
+
+    def test_metrics_forbidden_without_token(self):
+        """Test clients without the token are refused, even from localhost"""
+        for headers in ({}, {'HTTP_AUTHORIZATION': 'Bearer wrong'}):
+            res = self.client.get(
+                METRICS_URL, REMOTE_ADDR='127.0.0.1', **headers,
+            )
+
+            self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_metrics_closed_without_configured_token(self):
+        """Test the endpoint answers no one while no token is set"""
+        res = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION='Bearer ',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
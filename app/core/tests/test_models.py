@@ -1,6 +1,7 @@
 """
 Tests for models
 """
+from django.db import IntegrityError
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
@@ -64,6 +65,55 @@ class ModelTest(TestCase):
 
         self.assertEqual(str(exam_question), exam_question.question)
 
+    def test_question_version_bumped_on_save(self):
+        """Test updating a question increments its version"""
+        exam_question = models.Exam_Question.objects.create(
+            question="Test question?",
+            choices=["A1", "A2"],
+            answer="A1",
+        )
+        self.assertEqual(exam_question.version, 1)
+
+        exam_question.answer = "A2"
+        exam_question.save(update_fields=['answer'])
+        exam_question.refresh_from_db()
+
+        self.assertEqual(exam_question.version, 2)
+
+    def test_question_version_bumped_by_concurrent_saves(self):
+        """Test two saves of one loaded version each get a new version"""
+        exam_question = models.Exam_Question.objects.create(
+            question="Test question?",
+            choices=["A1", "A2"],
+            answer="A1",
+        )
+        first = models.Exam_Question.objects.get(pk=exam_question.pk)
+        second = models.Exam_Question.objects.get(pk=exam_question.pk)
+
+        first.answer = "A2"
+        first.save()
+        self.assertEqual(first.version, 2)
+        second.question = "Changed?"
+        second.save()
+
+        self.assertEqual(second.version, 3)
+
+    def test_question_version_bumped_by_bulk_updates(self):
+        """Test QuerySet.update and bulk_update increment versions"""
+        exam_question = models.Exam_Question.objects.create(
+            question="Test question?",
+            choices=["A1", "A2"],
+            answer="A1",
+        )
+        questions = models.Exam_Question.objects.filter(pk=exam_question.pk)
+
+        questions.update(answer="A2")
+        exam_question.answer = "A1"
+        models.Exam_Question.objects.bulk_update([exam_question], ['answer'])
+        exam_question.refresh_from_db()
+
+        self.assertEqual(exam_question.version, 3)
+
     def test_create_user_answer(self):
         """Test creating user's answer to a question"""
         user = get_user_model().objects.create_user(
@@ -85,3 +135,27 @@ class ModelTest(TestCase):
         )
 
         self.assertEqual(str(user_answer), user_answer.user_answer)
+
+    def test_one_answer_per_user_and_question(self):
+        """Test a second answer to the same question is rejected"""
+        user = get_user_model().objects.create_user(
+            'test@example.com',
+            'testpass123',
+        )
+        exam_question = models.Exam_Question.objects.create(
+            question="Test question?",
+            choices=["A1", "A2"],
+            answer="A1",
+        )
+        fields = {
+            'user': user,
+            'question': exam_question,
+            'user_answer': "A1",
+            'iscorrect': True,
+            'issubmitted': True,
+            'isbookmarked': False,
+        }
+        models.User_Answer.objects.create(**fields)
+
+        with self.assertRaises(IntegrityError):
+            models.User_Answer.objects.create(**fields)
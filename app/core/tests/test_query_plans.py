@@ -0,0 +1,122 @@
+"""
+Tests that the hot queries are served by indexes
+"""
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from core.explain import explain
+from core.models import Exam_Question, Leaderboard, User_Answer
+from leaderboard import ranking
+from user_answer import stats
+
+
+def full_scan(plan, table):
+    """Return True if plan reads every row of table"""
+    if connection.vendor == 'postgresql':
+        return f'Seq Scan on {table}' in plan
+    return re.search(rf'\bSCAN {table}\b(?! USING)', plan) is not None
+
+
+class QueryPlanTests(TestCase):
+    """Test EXPLAIN shows an index for each hot query"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        cls.question = Exam_Question.objects.create(
+            question='sample question?',
+            choices=['A', 'B', 'C', 'D'],
+            answer='C',
+        )
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # Tiny test tables are cheaper to scan than to index; ask
+            # the planner for the plan it would use on real data
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndex(self, query, table, index=None):
+        """Assert query reads table through an index, optionally index"""
+        plan = explain(query)
+
+        self.assertFalse(full_scan(plan, table), plan)
+        self.assertRegex(plan, r'(?i)index|primary key', plan)
+        if index is not None:
+            self.assertIn(index, plan)
+
+    def test_answer_lookup(self):
+        """Test one answer per user and question is found by index"""
+        self.assertUsesIndex(
+            lambda: User_Answer.objects.filter(
+                user=self.user, question=self.question,
+            ).first(),
+            'core_user_answer',
+        )
+
+    def test_user_answers(self):
+        """Test a user's answers are found by index"""
+        self.assertUsesIndex(
+            lambda: list(
+                User_Answer.objects.filter(user=self.user).order_by('-id'),
+            ),
+            'core_user_answer',
+        )
+
+    def test_bookmarked_answers(self):
+        """Test a user's bookmarks use the partial index"""
+        self.assertUsesIndex(
+            lambda: list(User_Answer.objects.filter(
+                user=self.user, isbookmarked=True,
+            ).order_by('-id')),
+            'core_user_answer',
+            'user_answer_bookmarked_idx',
+        )
+
+    def test_score(self):
+        """Test the score aggregate only reads the user's answers"""
+        self.assertUsesIndex(
+            lambda: stats.score(self.user),
+            'core_user_answer',
+        )
+
+    def test_question_stats(self):
+        """Test per-question counts use the (question, iscorrect) index"""
+        self.assertUsesIndex(
+            lambda: stats.question_stats([self.question.id]),
+            'core_user_answer',
+            'user_answer_q_correct_idx',
+        )
+
+    def test_leaderboard_rank(self):
+        """Test rank counts walk the leaderboard index"""
+        Leaderboard.objects.create(user=self.user, correct=3)
+
+        self.assertUsesIndex(
+            lambda: Leaderboard.objects.filter(correct__gt=3).count(),
+            'core_leaderboard',
+            'leaderboard_correct_idx',
+        )
+
+    def test_leaderboard_top(self):
+        """Test the top entries are read in index order"""
+        self.assertUsesIndex(
+            lambda: ranking.top(10),
+            'core_leaderboard',
+            'leaderboard_correct_idx',
+        )
+
+    def test_question_page(self):
+        """Test a keyset page of questions is read by primary key"""
+        self.assertUsesIndex(
+            lambda: list(Exam_Question.objects.filter(
+                id__lt=self.question.id + 1,
+            ).order_by('-id')[:50]),
+            'core_exam_question',
+        )
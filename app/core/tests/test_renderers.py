@@ -0,0 +1,128 @@
+"""
+Tests for the orjson renderer and parser
+"""
+import datetime
+import decimal
+import io
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core import renderers
+
+
+SAMPLE = {
+    'id': 7,
+    'question': 'Café \u2028 "quoted" \n 中文',
+    'choices': ['A', 'B', {'nested': [1, True, None]}],
+    'created': datetime.datetime(
+        2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc,
+    ),
+    'day': datetime.date(2024, 1, 2),
+    'price': decimal.Decimal('1.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    3: 'integer key',
+}
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """Test the renderer matches JSONRenderer"""
+
+    def test_matches_json_renderer(self):
+        """Test output is identical for API data"""
+        self.assertEqual(
+            renderers.ORJSONRenderer().render(SAMPLE),
+            JSONRenderer().render(SAMPLE),
+        )
+
+    def test_indent_matches_json_renderer(self):
+        """Test a requested indent of 2 is identical too"""
+        media_type = 'application/json; indent=2'
+
+        self.assertEqual(
+            renderers.ORJSONRenderer().render(SAMPLE, media_type),
+            JSONRenderer().render(SAMPLE, media_type),
+        )
+
+    @override_settings(API_COMPACT=True)
+    def test_compact_ignores_indent(self):
+        """Test compact mode drops requested whitespace"""
+        content = renderers.ORJSONRenderer().render(
+            {'a': [1, 2]}, 'application/json; indent=4',
+        )
+
+        self.assertEqual(content, b'{"a":[1,2]}')
+
+    def test_wide_integers_fall_back(self):
+        """Test values orjson rejects are rendered by JSONRenderer"""
+        data = {'big': 2 ** 70}
+
+        self.assertEqual(
+            renderers.ORJSONRenderer().render(data),
+            JSONRenderer().render(data),
+        )
+
+    def test_non_finite_floats_rejected(self):
+        """Test NaN and infinity are refused as by JSONRenderer"""
+        for value in (float('nan'), float('inf'), float('-inf')):
+            with self.assertRaises(ValueError):
+                renderers.ORJSONRenderer().render({'a': [None, value]})
+
+    def test_exponent_floats(self):
+        """Test the documented float formatting: same numbers, orjson form"""
+        data = {'large': 1e16, 'small': 1e-5, 'plain': 0.25}
+
+        content = renderers.ORJSONRenderer().render(data)
+
+        self.assertEqual(
+            content, b'{"large":1e16,"small":0.00001,"plain":0.25}',
+        )
+        self.assertEqual(JSONParser().parse(io.BytesIO(content)), data)
+
+    def test_without_orjson(self):
+        """Test the renderer works when orjson is not installed"""
+        with mock.patch.object(renderers, 'orjson', None):
+            content = renderers.ORJSONRenderer().render(SAMPLE)
+
+        self.assertEqual(content, JSONRenderer().render(SAMPLE))
+
+
+class ORJSONParserTests(SimpleTestCase):
+    """Test the parser matches JSONParser"""
+
+    def parse(self, parser, content):
+        return parser.parse(io.BytesIO(content.encode()))
+
+    def test_matches_json_parser(self):
+        """Test documents parse to the same data"""
+        content = '{"a": [1, 2.5, "é", null, true], "b": {"c": "d"}}'
+
+        self.assertEqual(
+            self.parse(renderers.ORJSONParser(), content),
+            self.parse(JSONParser(), content),
+        )
+
+    def test_invalid_json(self):
+        """Test malformed JSON raises a parse error"""
+        with self.assertRaises(ParseError):
+            self.parse(renderers.ORJSONParser(), '{"a": ')
+
+    def test_wide_integers_fall_back(self):
+        """Test documents orjson rejects are parsed by JSONParser"""
+        content = '{"big": %d}' % 2 ** 70
+
+        self.assertEqual(
+            self.parse(renderers.ORJSONParser(), content), {'big': 2 ** 70},
+        )
+
+    def test_without_orjson(self):
+        """Test the parser works when orjson is not installed"""
+        with mock.patch.object(renderers, 'orjson', None):
+            data = self.parse(renderers.ORJSONParser(), '{"a": 1}')
+
+        self.assertEqual(data, {'a': 1})
@@ -0,0 +1,29 @@
+"""
+Tests for the test helpers
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core.testing import QueryBudgetMixin
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Test query budgets"""
+    query_budgets = {'one': 1}
+
+    def test_within_budget(self):
+        """Test running up to the budget passes"""
+        with self.assertQueryBudget('one'):
+            get_user_model().objects.exists()
+
+    def test_over_budget(self):
+        """Test exceeding the budget fails and lists the queries"""
+        with self.assertRaisesMessage(AssertionError, 'one ran 2 queries'):
+            with self.assertQueryBudget('one'):
+                get_user_model().objects.exists()
+                get_user_model().objects.count()
+
+    def test_undeclared_budget(self):
+        """Test an endpoint without a declared budget is an error"""
+        with self.assertRaises(KeyError):
+            self.assertQueryBudget('missing')
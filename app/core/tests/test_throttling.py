@@ -0,0 +1,182 @@
+"""
+Tests for token bucket throttling
+"""
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import throttling
+
+
+CREATE_USER_URL = reverse('user:create')
+TOKEN_URL = reverse('user:token')
+
+
+class TokenBucketTests(SimpleTestCase):
+    """Test the bucket arithmetic and stores"""
+
+    def test_parse_rate(self):
+        """Test rates are parsed into capacity and refill per second"""
+        self.assertEqual(throttling.parse_rate('5/min'), (5, 5 / 60))
+        self.assertEqual(throttling.parse_rate('10/s'), (10, 10))
+
+    def test_take_and_refill(self):
+        """Test tokens run out and refill over time"""
+        state = None
+        for _ in range(2):
+            allowed, state, _wait = throttling.take(state, 2, 1.0, 100.0)
+            self.assertTrue(allowed)
+
+        allowed, state, wait = throttling.take(state, 2, 1.0, 100.0)
+        self.assertFalse(allowed)
+        self.assertEqual(wait, 1.0)
+
+        allowed, state, _wait = throttling.take(state, 2, 1.0, 101.0)
+        self.assertTrue(allowed)
+
+    def test_local_store(self):
+        """Test the in-process store keeps a bucket per key"""
+        store = throttling.LocalBucketStore()
+
+        self.assertTrue(store.take('a', 1, 0.001)[0])
+        self.assertFalse(store.take('a', 1, 0.001)[0])
+        self.assertTrue(store.take('b', 1, 0.001)[0])
+
+    def test_cache_store(self):
+        """Test the shared-cache store keeps a bucket per key"""
+        store = throttling.CacheBucketStore('default')
+        store.cache.delete_many([
+            throttling.KEY_PREFIX + 'cache-a', throttling.KEY_PREFIX + 'b',
+        ])
+
+        self.assertTrue(store.take('cache-a', 1, 0.001)[0])
+        allowed, wait = store.take('cache-a', 1, 0.001)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+
+
+@override_settings(THROTTLE_RATES={
+    'login_ip': '5/min',
+    'login_account': '2/min',
+    'signup_ip': '1/hour',
+})
+class ThrottledEndpointTests(TestCase):
+    """Test the login and sign-up endpoints are throttled"""
+
+    def setUp(self):
+        self.client = APIClient()
+        throttling.reset()
+        get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+        )
+
+    def login(self, email='test@example.com', password='wrong'):
+        """Attempt to log in and return the response"""
+        return self.client.post(
+            TOKEN_URL, {'email': email, 'password': password},
+        )
+
+    def test_login_throttled_per_account(self):
+        """Test repeated logins to one account are rejected"""
+        self.assertEqual(
+            self.login().status_code, status.HTTP_400_BAD_REQUEST,
+        )
+        self.login()
+
+        res = self.login(password='testpass123')
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', res)
+        self.assertEqual(
+            self.login(email='other@example.com').status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_login_throttled_per_ip(self):
+        """Test one IP cannot spread attempts over many accounts"""
+        for i in range(5):
+            self.login(email=f'user{i}@example.com')
+
+        res = self.login(email='fresh@example.com')
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_login_ip_ignores_forwarded_for(self):
+        """Test rotating X-Forwarded-For does not escape the IP limit"""
+        for i in range(5):
+            self.client.post(
+                TOKEN_URL,
+                {'email': f'user{i}@example.com', 'password': 'wrong'},
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{i}',
+            )
+
+        res = self.client.post(
+            TOKEN_URL,
+            {'email': 'fresh@example.com', 'password': 'wrong'},
+            HTTP_X_FORWARDED_FOR='10.0.0.99',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_login_ip_behind_proxy(self):
+        """Test the client address the proxy forwarded is throttled on"""
+        rest_framework = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            for i in range(5):
+                self.client.post(
+                    TOKEN_URL,
+                    {'email': f'user{i}@example.com', 'password': 'wrong'},
+                    HTTP_X_FORWARDED_FOR='10.0.0.1',
+                )
+            res = self.client.post(
+                TOKEN_URL,
+                {'email': 'fresh@example.com', 'password': 'wrong'},
+                HTTP_X_FORWARDED_FOR='10.0.0.2',
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejected_login_skips_hashing(self):
+        """Test a throttled login never authenticates"""
+        self.login()
+        self.login()
+
+        with patch('user.serializers.authenticate') as authenticate:
+            res = self.login()
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        authenticate.assert_not_called()
+
+    def test_signup_throttled_per_ip(self):
+        """Test sign-ups from one IP are throttled"""
+        payload = {
+            'email': 'new@example.com',
+            'password': 'testpass123',
+            'firstname': 'Test',
+            'lastname': 'User',
+        }
+        self.client.post(CREATE_USER_URL, payload)
+
+        res = self.client.post(
+            CREATE_USER_URL, {**payload, 'email': 'new2@example.com'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertFalse(
+            get_user_model().objects.filter(email='new2@example.com').exists()
+        )
+
+    @override_settings(THROTTLE_ENABLED=False)
+    def test_throttling_disabled(self):
+        """Test throttling can be switched off"""
+        for _ in range(3):
+            res = self.login()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
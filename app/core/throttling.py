@@ -0,0 +1,173 @@
+"""
+Token bucket throttling for the API.
+
+Each throttle scope has a rate such as '5/min': a bucket holds up to 5
+tokens and refills at 5 per minute, and a request that finds the bucket
+empty is rejected with a 429 before the view's serializer runs. Bucket
+state lives in a pluggable store: in-process by default, or a Django
+cache shared by every worker.
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+from core.cache import LRUCache
+
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+KEY_PREFIX = 'throttle:'
+
+
+def parse_rate(rate):
+    """Return (capacity, tokens per second) for a rate like '5/min'"""
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+def take(state, capacity, refill_rate, now):
+    """
+    Refill a bucket state (tokens, timestamp) up to now and try to take
+    one token. Return (allowed, new state, seconds until the next token).
+    """
+    if state is None:
+        tokens = capacity
+    else:
+        tokens, updated = state
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+    if tokens >= 1:
+        return True, (tokens - 1, now), 0.0
+    return False, (tokens, now), (1 - tokens) / refill_rate
+
+
+class LocalBucketStore:
+    """Bucket state in this process, bounded to the busiest keys"""
+
+    def __init__(self, max_size=100000):
+        self._buckets = LRUCache(max_size=max_size)
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill_rate):
+        """Take a token from the bucket at key"""
+        with self._lock:
+            allowed, state, wait = take(
+                self._buckets.get(key), capacity, refill_rate,
+                time.monotonic(),
+            )
+            self._buckets.set(key, state)
+        return allowed, wait
+
+
+class CacheBucketStore:
+    """
+    Bucket state in a Django cache shared by every worker. Reads and
+    writes are not atomic, so concurrent requests from one client may
+    occasionally get a token more than the rate allows.
+    """
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def take(self, key, capacity, refill_rate):
+        """Take a token from the bucket at key"""
+        key = KEY_PREFIX + key
+        allowed, state, wait = take(
+            self.cache.get(key), capacity, refill_rate, time.time(),
+        )
+        # A bucket left alone until it is full again need not be stored
+        self.cache.set(key, state, int(capacity / refill_rate) + 1)
+        return allowed, wait
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the configured bucket store"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if settings.THROTTLE_STORE == 'local':
+                _store = LocalBucketStore(settings.THROTTLE_LOCAL_MAX_KEYS)
+            else:
+                _store = CacheBucketStore(settings.THROTTLE_STORE)
+        return _store
+
+
+def reset():
+    """Drop the store, so settings are re-read and local state is lost"""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Base token bucket throttle. Subclasses set scope, whose rate is
+    read from settings.THROTTLE_RATES, and implement get_ident_key().
+    """
+    scope = None
+
+    def get_ident_key(self, request, view):
+        """Return what to throttle on, or None to skip throttling"""
+        raise NotImplementedError('get_ident_key() must be implemented.')
+
+    def allow_request(self, request, view):
+        if not settings.THROTTLE_ENABLED:
+            return True
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+        capacity, refill_rate = parse_rate(
+            settings.THROTTLE_RATES[self.scope],
+        )
+        allowed, self.wait_seconds = get_store().take(
+            f'{self.scope}:{ident}', capacity, refill_rate,
+        )
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPRateThrottle(TokenBucketThrottle):
+    """
+    Throttle on the client's IP address. X-Forwarded-For is only read
+    when REST_FRAMEWORK['NUM_PROXIES'] says proxies in front set it;
+    otherwise clients could pick a fresh address for every request.
+    """
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class AccountRateThrottle(TokenBucketThrottle):
+    """
+    Throttle on the account named in the request body, so an attack
+    spread over many IPs still cannot hammer one account's password.
+    """
+    field = 'email'
+
+    def get_ident_key(self, request, view):
+        data = request.data
+        value = data.get(self.field) if hasattr(data, 'get') else None
+        if not isinstance(value, str) or not value:
+            return None
+        return hashlib.sha256(value.strip().lower().encode()).hexdigest()
+
+
+class LoginIPThrottle(IPRateThrottle):
+    scope = 'login_ip'
+
+
+class LoginAccountThrottle(AccountRateThrottle):
+    scope = 'login_account'
+
+
+class SignupIPThrottle(IPRateThrottle):
+    scope = 'signup_ip'
@@ -0,0 +1,25 @@
+"""
+Internal views
+"""
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from core import metrics
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def metrics_view(request):
+    """Return this process's metrics to clients bearing METRICS_TOKEN"""
+    token = settings.METRICS_TOKEN
+    given = request.META.get('HTTP_AUTHORIZATION', '')
+    if not token or not hmac.compare_digest(
+        given.encode(), f'Bearer {token}'.encode(),
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        metrics.registry.render(), content_type=PROMETHEUS_CONTENT_TYPE,
+    )
@@ -0,0 +1,122 @@
+"""
+In-memory answer key for constant-time grading.
+
+A change made by another process only reaches this one through the
+generation counter, so without a shared cache the key is off by default
+(EXAM_QUESTION_ANSWER_KEY) and lookups query the database instead.
+"""
+import sys
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+from core.models import Exam_Question
+from exam_question import generation
+
+
+def enabled():
+    """Return True if grading uses the in-memory answer key"""
+    return settings.EXAM_QUESTION_ANSWER_KEY
+
+
+class AnswerKey:
+    """
+    Mapping of question id to correct answer, rebuilt from the database
+    whenever the exam_question generation moves past the one it was
+    built at.
+    """
+
+    def __init__(self):
+        self.answers = {}
+        self.version = None
+        self._ids = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.answers)
+
+    def rebuild(self):
+        """Load every answer from the database"""
+        with self._lock:
+            self._load()
+
+    def ensure_current(self):
+        """Rebuild the index if another process changed the questions"""
+        if self.version != generation.current():
+            with self._lock:
+                # Threads that waited here find it rebuilt by the first
+                if self.version != generation.current():
+                    self._load()
+
+    def lookup(self, question_ids):
+        """Return {question id: answer} for the ids that exist"""
+        if not enabled():
+            return dict(
+                Exam_Question.objects.filter(
+                    id__in=list(question_ids),
+                ).values_list('id', 'answer')
+            )
+        self.ensure_current()
+        answers = self.answers
+        return {qid: answers[qid] for qid in question_ids if qid in answers}
+
+    def question_ids(self):
+        """Return the id of every question, as a tuple shared per version"""
+        if not enabled():
+            return tuple(
+                Exam_Question.objects.values_list('id', flat=True)
+            )
+        self.ensure_current()
+        cached = self._ids
+        if cached is None or cached[0] != self.version:
+            with self._lock:
+                cached = self._ids = (self.version, tuple(self.answers))
+        return cached[1]
+
+    def update(self, question_id, answer):
+        """Record a saved question in place of a full rebuild"""
+        self._apply(lambda answers: answers.__setitem__(question_id, answer))
+
+    def remove(self, question_id):
+        """Forget a deleted question in place of a full rebuild"""
+        self._apply(lambda answers: answers.pop(question_id, None))
+
+    def invalidate(self):
+        """Bump the generation so every process rebuilds on next use"""
+        generation.bump()
+
+    def _load(self):
+        """Load every answer; the lock must be held"""
+        version = generation.current()
+        self.answers = dict(
+            Exam_Question.objects.values_list('id', 'answer').iterator()
+        )
+        self.version = version
+
+    def _apply(self, change):
+        # Until the write commits, another process that sees the bump
+        # would reload the old answers and stamp them as current, and a
+        # rollback would leave this process with an uncommitted answer
+        transaction.on_commit(lambda: self._commit(change))
+
+    def _commit(self, change):
+        with self._lock:
+            was = generation.current()
+            new_version = generation.bump()
+            # Only our own bump in between means no change was missed;
+            # otherwise the old version is left to trigger a rebuild
+            if self.version == was and new_version == was + 1:
+                change(self.answers)
+                self.version = new_version
+
+    def memory_footprint(self):
+        """Return the approximate size of the index in bytes"""
+        answers = self.answers
+        return sys.getsizeof(answers) + sum(
+            sys.getsizeof(qid) + sys.getsizeof(answer)
+            for qid, answer in answers.items()
+        )
+
+
+answer_key = AnswerKey()
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class Exam_QuestionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'exam_question'
+
+    def ready(self):
+        from core.metrics import registry
+        from exam_question import response_cache, signals  # noqa: F401
+
+        registry.register_collector(response_cache.collect_metrics)
@@ -0,0 +1,108 @@
+"""
+Async (ASGI-native) read views for exam questions.
+
+Warm requests are answered from the response cache without blocking the
+event loop: an in-process cache is read directly and a shared one
+through the cache's async methods. Misses run the query and the fast
+renderer in a single sync_to_async hop because Django 4.0 has no async
+ORM interface. Cache entries are shared with the DRF views.
+"""
+import copy
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from core import metrics
+from core.conditional import (
+    content_etag,
+    make_etag,
+    media_tag,
+    not_modified,
+)
+from core.models import Exam_Question
+from exam_question import generation, representation, response_cache
+from exam_question.pagination import Exam_QuestionCursorPagination
+from user.authentication import token_required
+
+
+MEDIA_TYPE = JSONRenderer.media_type
+
+
+def render_question(pk):
+    """Return (content, etag) for a question, or None if it is missing"""
+    instance = Exam_Question.objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+    with metrics.serializing():
+        content = representation.render_row(representation.row_of(instance))
+    return content, make_etag(
+        'q', instance.pk, instance.version, media_tag(MEDIA_TYPE),
+    )
+
+
+def render_page(request):
+    """Return (content, etag) for the page of questions request asks for"""
+    # Page links point at the canonical list, like the DRF view's, so
+    # the two views render and cache identical pages
+    canonical = copy.copy(request)
+    canonical.path = canonical.path_info = reverse(
+        'exam_question:exam_question-list',
+    )
+    paginator = Exam_QuestionCursorPagination()
+    page = paginator.paginate_queryset(
+        Exam_Question.objects.order_by('-id').values_list(
+            *representation.FIELDS, named=True,
+        ),
+        Request(canonical),
+    )
+    with metrics.serializing():
+        content = representation.render_page(
+            page, paginator.get_next_link(), paginator.get_previous_link(),
+        )
+    return content, content_etag(content)
+
+
+def json_response(request, entry):
+    """Return a JSON response for a cached (content, etag) pair"""
+    content, etag = entry
+    response = not_modified(request, etag)
+    if response is None:
+        response = HttpResponse(content, content_type=MEDIA_TYPE)
+        response['ETag'] = etag
+    return response
+
+
+@token_required
+async def question_list(request):
+    """List exam questions"""
+    key = response_cache.page_key(
+        request, MEDIA_TYPE, await generation.acurrent(),
+    )
+    entry = await response_cache.aget(key)
+    if entry is None:
+        entry = await sync_to_async(render_page)(request)
+        await response_cache.aset(key, entry)
+    return json_response(request, entry)
+
+
+@token_required
+async def question_detail(request, pk):
+    """Retrieve an exam question"""
+    key = response_cache.detail_key(
+        pk, MEDIA_TYPE, await generation.acurrent(),
+    )
+    entry = await response_cache.aget(key)
+    if entry is None:
+        entry = await sync_to_async(render_question)(pk)
+        if entry is None:
+            return HttpResponse(
+                JSONRenderer().render({'detail': 'Not found.'}),
+                content_type=MEDIA_TYPE,
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        await response_cache.aset(key, entry)
+    return json_response(request, entry)
@@ -0,0 +1,110 @@
+"""
+Bulk import of exam questions
+"""
+import json
+
+from django.conf import settings
+from django.db import transaction
+
+from core.models import Exam_Question
+from exam_question import generation
+
+
+QUESTION_MAX_LENGTH = Exam_Question._meta.get_field('question').max_length
+ANSWER_MAX_LENGTH = Exam_Question._meta.get_field('answer').max_length
+
+
+class InvalidRow:
+    """Placeholder for an input row that could not be decoded"""
+
+    def __init__(self, message):
+        self.message = message
+
+
+def iter_ndjson(lines):
+    """Decode newline-delimited JSON, one row per non-blank line"""
+    for line in lines:
+        if isinstance(line, bytes):
+            try:
+                line = line.decode('utf-8')
+            except UnicodeDecodeError as exc:
+                yield InvalidRow(f'Invalid UTF-8: {exc}')
+                continue
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield InvalidRow(f'Invalid JSON: {exc}')
+
+
+def validate_row(row):
+    """Validate a raw question row and return (instance, errors)"""
+    if isinstance(row, InvalidRow):
+        return None, {'non_field_errors': [row.message]}
+    if not isinstance(row, dict):
+        return None, {'non_field_errors': ['Expected an object.']}
+
+    errors = {}
+    question = row.get('question')
+    choices = row.get('choices')
+    answer = row.get('answer')
+
+    if not isinstance(question, str) or not question.strip():
+        errors['question'] = ['This field is required.']
+    elif len(question) > QUESTION_MAX_LENGTH:
+        errors['question'] = [
+            f'Ensure this field has no more than '
+            f'{QUESTION_MAX_LENGTH} characters.'
+        ]
+
+    if not isinstance(choices, list):
+        errors['choices'] = ['Expected a list of choices.']
+
+    if answer is not None:
+        if not isinstance(answer, str) or len(answer) > ANSWER_MAX_LENGTH:
+            errors['answer'] = ['Not a valid answer.']
+        elif 'choices' not in errors and answer not in choices:
+            errors['answer'] = ['Answer must be in the choices']
+
+    if errors:
+        return None, errors
+    return Exam_Question(
+        question=question,
+        choices=choices,
+        answer=answer,
+    ), None
+
+
+def import_questions(rows, batch_size=None):
+    """
+    Validate rows in a single pass and insert the valid ones with
+    bulk_create, one batch at a time, inside a single transaction.
+    Invalid rows are reported without aborting the import.
+    """
+    batch_size = batch_size or settings.QUESTION_IMPORT_BATCH_SIZE
+    created = 0
+    errors = []
+    batch = []
+
+    with transaction.atomic():
+        for index, row in enumerate(rows):
+            instance, row_errors = validate_row(row)
+            if row_errors:
+                errors.append({'row': index, 'errors': row_errors})
+                continue
+            batch.append(instance)
+            if len(batch) >= batch_size:
+                Exam_Question.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            Exam_Question.objects.bulk_create(batch)
+            created += len(batch)
+
+    if created:
+        # bulk_create sends no post_save signals
+        generation.bump()
+
+    return {'created': created, 'errors': errors}
@@ -0,0 +1,58 @@
+"""
+Table-level generation counter for exam questions.
+
+The counter lives in a Django cache so that every worker sharing that
+cache sees writes made by the others. It is bumped whenever a question
+is created, updated or deleted, and derived caches compare against it.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+GENERATION_KEY = 'exam_question:generation'
+
+
+def get_cache():
+    """Return the cache holding the generation counter"""
+    return caches[settings.EXAM_QUESTION_CACHE]
+
+
+def is_shared():
+    """Return True if the cache is shared with other processes"""
+    return not isinstance(get_cache(), (LocMemCache, DummyCache))
+
+
+def current():
+    """Return the current generation"""
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Seed from the clock so a lost counter never repeats an old value
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump():
+    """Advance the generation and return the new value"""
+    cache = get_cache()
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        return current()
+
+
+async def acurrent():
+    """
+    Return the current generation from async code. A shared cache is
+    read in a thread so its network round trip never blocks the event
+    loop; an in-process one is read directly.
+    """
+    if is_shared():
+        return await sync_to_async(current)()
+    return current()
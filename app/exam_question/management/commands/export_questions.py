@@ -0,0 +1,16 @@
+"""
+Django command to export exam questions
+"""
+from core import export
+from core.models import Exam_Question
+from exam_question.views import QUESTION_EXPORT_FIELDS
+
+
+class Command(export.ExportCommand):
+    """Stream every question to a file as NDJSON or CSV."""
+    help = 'Export exam questions as NDJSON or CSV.'
+    label = 'questions'
+    fields = QUESTION_EXPORT_FIELDS
+
+    def get_queryset(self):
+        return Exam_Question.objects.order_by('id')
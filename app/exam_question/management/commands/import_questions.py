@@ -0,0 +1,62 @@
+"""
+Django command to bulk import exam questions
+"""
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exam_question.bulk import import_questions, iter_ndjson
+
+
+class Command(BaseCommand):
+    """Import questions from a JSON array or NDJSON file."""
+    help = 'Import exam questions from a JSON array or NDJSON file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='File to import, or - to read from stdin.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=['json', 'ndjson'],
+            default=None,
+            help='Input format, guessed from the file extension if omitted.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Number of rows written per INSERT.',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        path = options['path']
+        fmt = options['format']
+        if fmt is None:
+            fmt = 'json' if path.endswith('.json') else 'ndjson'
+
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+        try:
+            if fmt == 'ndjson':
+                rows = iter_ndjson(stream)
+            else:
+                try:
+                    rows = json.load(stream)
+                except ValueError as exc:
+                    raise CommandError(f'Invalid JSON: {exc}')
+                if not isinstance(rows, list):
+                    raise CommandError('Expected a JSON array of questions.')
+            result = import_questions(rows, options['batch_size'])
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} questions "
+            f"({len(result['errors'])} rejected)."
+        ))
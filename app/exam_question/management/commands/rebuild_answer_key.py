@@ -0,0 +1,24 @@
+"""
+Django command to rebuild the in-memory answer key
+"""
+from django.core.management.base import BaseCommand
+
+from exam_question.answer_key import answer_key
+
+
+class Command(BaseCommand):
+    """Rebuild the answer key and report its memory footprint."""
+    help = (
+        'Invalidate the answer key in every worker sharing the cache and '
+        'report the size of a freshly built index.'
+    )
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        answer_key.invalidate()
+        answer_key.rebuild()
+        footprint = answer_key.memory_footprint()
+        self.stdout.write(self.style.SUCCESS(
+            f'Answer key rebuilt: {len(answer_key)} questions, '
+            f'{footprint} bytes ({footprint / 1024 / 1024:.2f} MiB).'
+        ))
@@ -0,0 +1,16 @@
+"""
+Pagination for the exam_question API
+"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class Exam_QuestionCursorPagination(CursorPagination):
+    """
+    Keyset pagination on id, newest first. Pages are fetched with
+    WHERE id < cursor LIMIT n, so there is no COUNT(*) or OFFSET scan.
+    """
+    ordering = '-id'
+    page_size = settings.EXAM_QUESTION_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.EXAM_QUESTION_MAX_PAGE_SIZE
@@ -0,0 +1,62 @@
+"""
+Fast read path for exam questions.
+
+Exam_QuestionSerializer spends most of a large list in DRF's per-field
+machinery. Here questions are fetched with values_list and each row is
+turned straight into the dict the serializer would return. The dicts
+are rendered by the same JSON renderer as the serializer's output, the
+one the request accepted or else the first configured, so both paths
+produce the same bytes whichever renderer is configured.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+
+FIELDS = ('id', 'question', 'choices', 'answer')
+
+
+def json_renderer():
+    """Return the first configured JSON renderer"""
+    for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES:
+        if renderer_class.format == 'json':
+            return renderer_class()
+    return JSONRenderer()
+
+
+def as_data(row):
+    """Return the serializer's data for an (id, question, choices, answer)"""
+    pk, question, choices, answer = row
+    return {
+        'id': pk, 'question': question, 'choices': choices, 'answer': answer,
+    }
+
+
+def render(data, renderer=None, media_type=None, renderer_context=None):
+    """Render data with renderer, by default the configured JSON one"""
+    if renderer is None:
+        renderer = json_renderer()
+    return renderer.render(data, media_type, renderer_context)
+
+
+def render_row(row, **options):
+    """Return the JSON object for a row"""
+    return render(as_data(row), **options)
+
+
+def render_rows(rows, **options):
+    """Return the JSON array of rows"""
+    return render([as_data(row) for row in rows], **options)
+
+
+def render_page(rows, next_link, previous_link, **options):
+    """Return the JSON body of a cursor-paginated page of rows"""
+    return render({
+        'next': next_link,
+        'previous': previous_link,
+        'results': [as_data(row) for row in rows],
+    }, **options)
+
+
+def row_of(instance):
+    """Return the row of an Exam_Question instance"""
+    return (instance.pk, instance.question, instance.choices, instance.answer)
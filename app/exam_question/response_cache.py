@@ -0,0 +1,133 @@
+"""
+Cache of rendered exam_question responses.
+
+Rendered JSON bytes and their ETag are cached per question and per list
+page, shared by the DRF and async views. Every key
+embeds the table-level generation, so any create, update or delete makes
+all earlier entries unreachable without having to find and delete them.
+
+A bump only reaches other processes through a shared cache, so caching
+is off by default without one (EXAM_QUESTION_RESPONSE_CACHE); otherwise
+other workers would serve stale pages until their entries expired.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.urls import reverse
+
+from exam_question import generation
+
+
+class CacheStats:
+    """Thread-safe hit/miss counters"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit):
+        """Count a cache lookup"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self):
+        """Return the counters as a dict"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def reset(self):
+        """Zero the counters"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+stats = CacheStats()
+
+
+def collect_metrics():
+    """Return the hit/miss counters for the metrics registry"""
+    counts = stats.snapshot()
+    return {
+        'exam_question_response_cache_hits_total': counts['hits'],
+        'exam_question_response_cache_misses_total': counts['misses'],
+    }
+
+
+def detail_key(pk, media_type, version=None):
+    """Return the cache key for a single question"""
+    if version is None:
+        version = generation.current()
+    return f'exam_question:detail:{version}:{pk}:{media_type}'
+
+
+def list_url(request):
+    """
+    Return the URL of request's page on the canonical question list.
+    Both list views paginate against it, so a page renders the same,
+    links included, whichever view serves it.
+    """
+    path = reverse('exam_question:exam_question-list')
+    query = request.META.get('QUERY_STRING', '')
+    return request.build_absolute_uri(f'{path}?{query}' if query else path)
+
+
+def page_key(request, media_type, version=None):
+    """Return the cache key for a page of the question list"""
+    if version is None:
+        version = generation.current()
+    digest = hashlib.sha1(list_url(request).encode()).hexdigest()
+    return f'exam_question:list:{version}:{digest}:{media_type}'
+
+
+def enabled():
+    """Return True if rendered responses are cached"""
+    return settings.EXAM_QUESTION_RESPONSE_CACHE
+
+
+def get(key):
+    """Return the cached (body, etag) for key, or None"""
+    if not enabled():
+        return None
+    content = generation.get_cache().get(key)
+    stats.record(content is not None)
+    return content
+
+
+def set(key, entry):
+    """Cache a rendered (body, etag) pair"""
+    if not enabled():
+        return
+    generation.get_cache().set(
+        key, entry, settings.EXAM_QUESTION_RESPONSE_CACHE_TTL,
+    )
+
+
+async def aget(key):
+    """get() for async views, off the event loop for a shared cache"""
+    if not enabled():
+        return None
+    cache = generation.get_cache()
+    if generation.is_shared():
+        content = await cache.aget(key)
+    else:
+        content = cache.get(key)
+    stats.record(content is not None)
+    return content
+
+
+async def aset(key, entry):
+    """set() for async views, off the event loop for a shared cache"""
+    if not enabled():
+        return
+    cache = generation.get_cache()
+    timeout = settings.EXAM_QUESTION_RESPONSE_CACHE_TTL
+    if generation.is_shared():
+        await cache.aset(key, entry, timeout)
+    else:
+        cache.set(key, entry, timeout)
@@ -1,8 +1,11 @@
 from rest_framework import serializers
+from core.metrics import TimedSerializerMixin
 from core.models import Exam_Question
 
 
-class Exam_QuestionSerializer(serializers.ModelSerializer):
+class Exam_QuestionSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer,
+):
     choices = serializers.JSONField()
 
     class Meta:
@@ -122,3 +125,25 @@ class Exam_QuestionSerializer(serializers.ModelSerializer):
 
         else:
             raise ValueError("New answer must be in the new choices")
+
+
+class QuestionStatsSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer,
+):
+    """Serializer for a question with its answer counts attached"""
+    attempts = serializers.IntegerField(read_only=True)
+    correct = serializers.IntegerField(read_only=True)
+    bookmarked = serializers.IntegerField(read_only=True)
+    percent_correct = serializers.FloatField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = Exam_Question
+        fields = [
+            'id',
+            'question',
+            'attempts',
+            'correct',
+            'bookmarked',
+            'percent_correct',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,20 @@
+"""
+Signal handlers for the exam_question app
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Exam_Question
+from exam_question.answer_key import answer_key
+
+
+@receiver(post_save, sender=Exam_Question)
+def question_saved(sender, instance, **kwargs):
+    """Keep the answer key in step with saved questions"""
+    answer_key.update(instance.pk, instance.answer)
+
+
+@receiver(post_delete, sender=Exam_Question)
+def question_deleted(sender, instance, **kwargs):
+    """Keep the answer key in step with deleted questions"""
+    answer_key.remove(instance.pk)
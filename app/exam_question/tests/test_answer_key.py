@@ -0,0 +1,178 @@
+"""
+Test for the in-memory answer key
+"""
+import threading
+import time
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.models import Exam_Question
+from exam_question import generation
+from exam_question.answer_key import AnswerKey, answer_key
+from exam_question.bulk import import_questions
+
+
+def create_question(**params):
+    """Create and return a sample question"""
+    defaults = {
+        'question': 'sample question?',
+        'choices': ['A', 'B', 'C', 'D'],
+        'answer': 'C',
+    }
+    defaults.update(params)
+
+    return Exam_Question.objects.create(**defaults)
+
+
+@override_settings(EXAM_QUESTION_ANSWER_KEY=True)
+class AnswerKeyTests(TestCase):
+    """Test the answer key index"""
+
+    def setUp(self):
+        answer_key.invalidate()
+
+    def test_lookup_without_queries_when_warm(self):
+        """Test a warm answer key is consulted without hitting the DB"""
+        question = create_question()
+        answer_key.rebuild()
+
+        with self.assertNumQueries(0):
+            answers = answer_key.lookup([question.id, question.id + 1000])
+
+        self.assertEqual(answers, {question.id: 'C'})
+
+    def test_signals_update_in_place(self):
+        """Test saving and deleting questions keeps the index current"""
+        question = create_question()
+        answer_key.rebuild()
+
+        question.answer = 'A'
+        with self.captureOnCommitCallbacks(execute=True):
+            question.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(answer_key.lookup([question.id]), {
+                question.id: 'A',
+            })
+
+        question_id = question.id
+        with self.captureOnCommitCallbacks(execute=True):
+            question.delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(answer_key.lookup([question_id]), {})
+
+    def test_change_applied_on_commit(self):
+        """Test a write changes the key only once it commits"""
+        question = create_question()
+        answer_key.rebuild()
+        was = generation.current()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            question.answer = 'A'
+            question.save()
+            self.assertEqual(generation.current(), was)
+            self.assertEqual(answer_key.lookup([question.id]), {
+                question.id: 'C',
+            })
+
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertEqual(answer_key.lookup([question.id]), {
+            question.id: 'A',
+        })
+
+    @override_settings(EXAM_QUESTION_ANSWER_KEY=False)
+    def test_disabled_queries_answers(self):
+        """Test lookups query the database when the key is switched off"""
+        question = create_question()
+        answer_key.rebuild()
+
+        with self.assertNumQueries(1):
+            answers = answer_key.lookup([question.id, question.id + 1000])
+        with self.assertNumQueries(1):
+            question_ids = answer_key.question_ids()
+
+        self.assertEqual(answers, {question.id: 'C'})
+        self.assertEqual(question_ids, (question.id,))
+
+    def test_stale_index_rebuilt(self):
+        """Test a generation bump from elsewhere forces a rebuild"""
+        answer_key.rebuild()
+        result = import_questions([
+            {'question': 'Q?', 'choices': ['A', 'B'], 'answer': 'B'},
+        ])
+        self.assertEqual(result['created'], 1)
+        question = Exam_Question.objects.get()
+
+        with self.assertNumQueries(1):
+            answers = answer_key.lookup([question.id])
+
+        self.assertEqual(answers, {question.id: 'B'})
+
+    def test_concurrent_stale_lookups_rebuild_once(self):
+        """Test threads that all saw a stale index rebuild it once"""
+        key = AnswerKey()
+        loads = []
+        barrier = threading.Barrier(3)
+
+        def load():
+            loads.append(1)
+            key.version = generation.current()
+
+        def lookup():
+            barrier.wait()
+            key.lookup([1])
+
+        with patch.object(key, '_load', side_effect=load):
+            with key._lock:
+                threads = [
+                    threading.Thread(target=lookup) for _ in range(3)
+                ]
+                for thread in threads:
+                    thread.start()
+                # Let every thread see the stale version before loading
+                time.sleep(0.1)
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(loads), 1)
+
+    def test_missed_bump_forces_rebuild(self):
+        """Test a bump from elsewhere during a save is not stamped over"""
+        question = create_question()
+        answer_key.rebuild()
+        was = generation.current()
+
+        with patch.object(generation, 'bump', return_value=was + 2):
+            question.answer = 'A'
+            with self.captureOnCommitCallbacks(execute=True):
+                question.save()
+        generation.get_cache().set(generation.GENERATION_KEY, was + 2)
+
+        with self.assertNumQueries(1):
+            answer_key.lookup([question.id])
+
+    def test_question_ids_cached_per_version(self):
+        """Test the id tuple is reused until the questions change"""
+        question = create_question()
+        answer_key.rebuild()
+
+        ids = answer_key.question_ids()
+        self.assertIs(answer_key.question_ids(), ids)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_question()
+        self.assertEqual(len(answer_key.question_ids()), 2)
+        self.assertIn(question.id, ids)
+
+    def test_rebuild_command_reports_footprint(self):
+        """Test the rebuild command reports the index size"""
+        create_question()
+        out = StringIO()
+
+        call_command('rebuild_answer_key', stdout=out)
+
+        self.assertIn('1 questions', out.getvalue())
+        self.assertIn('bytes', out.getvalue())
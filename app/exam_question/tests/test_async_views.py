@@ -0,0 +1,144 @@
+"""
+Test for the async exam_question views
+"""
+import threading
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Exam_Question
+from exam_question import generation, response_cache
+
+
+ASYNC_LIST_URL = reverse('exam_question:async-exam_question-list')
+EXAM_QUESTION_URL = reverse('exam_question:exam_question-list')
+
+
+def async_detail_url(exam_question_id):
+    """Create and return an async exam_question detail URL"""
+    return reverse(
+        'exam_question:async-exam_question-detail', args=[exam_question_id],
+    )
+
+
+def detail_url(exam_question_id):
+    """Create and return an exam_question detail URL"""
+    return reverse(
+        'exam_question:exam_question-detail', args=[exam_question_id],
+    )
+
+
+@override_settings(EXAM_QUESTION_RESPONSE_CACHE=True)
+class AsyncQuestionViewTests(TestCase):
+    """Test the async question views"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        token = Token.objects.create(user=self.user)
+        # AsyncClient takes raw ASGI header names
+        self.auth = {'authorization': f'Token {token.key}'}
+        self.question = Exam_Question.objects.create(
+            question='sample question?',
+            choices=['A', 'B', 'C'],
+            answer='B',
+        )
+        self.client = AsyncClient()
+
+    async def test_auth_required(self):
+        """Test auth is required to call the async views"""
+        res = await self.client.get(ASYNC_LIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res['WWW-Authenticate'], 'Token')
+
+    async def test_detail_matches_sync_view(self):
+        """Test the async detail body is identical to the sync view"""
+        res = await self.client.get(
+            async_detail_url(self.question.id), **self.auth,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        sync_res = await sync_to_async(self.sync_get)(
+            detail_url(self.question.id),
+        )
+        self.assertEqual(res.content, sync_res.content)
+        self.assertEqual(res['ETag'], sync_res['ETag'])
+
+    async def test_detail_not_found(self):
+        """Test a missing question returns 404"""
+        res = await self.client.get(
+            async_detail_url(self.question.id + 1000), **self.auth,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_warm_detail_stays_on_event_loop(self):
+        """Test a warm request is served without a sync_to_async hop"""
+        url = async_detail_url(self.question.id)
+        await self.client.get(url, **self.auth)
+
+        with patch('exam_question.async_views.sync_to_async') as hop, \
+                patch('user.authentication.sync_to_async') as auth_hop:
+            res = await self.client.get(url, **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        hop.assert_not_called()
+        auth_hop.assert_not_called()
+
+    async def test_list(self):
+        """Test listing questions through the async view"""
+        res = await self.client.get(ASYNC_LIST_URL, **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row['id'] for row in res.json()['results']],
+            [self.question.id],
+        )
+
+    async def test_list_shares_cache_with_sync_view(self):
+        """Test a page cached by the async view is served by the DRF one"""
+        res = await self.client.get(ASYNC_LIST_URL, **self.auth)
+        response_cache.stats.reset()
+
+        sync_res = await sync_to_async(self.sync_get)(EXAM_QUESTION_URL)
+
+        self.assertEqual(response_cache.stats.snapshot()['hits'], 1)
+        self.assertEqual(res.content, sync_res.content)
+        self.assertEqual(res['ETag'], sync_res['ETag'])
+
+    async def test_shared_cache_read_off_event_loop(self):
+        """Test a shared cache is never read on the event loop thread"""
+        url = async_detail_url(self.question.id)
+        await self.client.get(url, **self.auth)
+        cache = generation.get_cache()
+        get = cache.get
+        threads = []
+
+        def tracked_get(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return get(*args, **kwargs)
+
+        with patch.object(generation, 'is_shared', return_value=True), \
+                patch.object(cache, 'get', side_effect=tracked_get):
+            res = await self.client.get(url, **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(threads)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def sync_get(self, url):
+        """GET url through the DRF view as the test user"""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client.get(url)
@@ -0,0 +1,144 @@
+"""
+Test for bulk question import
+"""
+import json
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Exam_Question
+from exam_question.bulk import import_questions, iter_ndjson
+
+
+BULK_URL = reverse('exam_question:exam_question-bulk')
+
+
+def sample_rows(count):
+    """Return a list of valid question rows"""
+    return [
+        {
+            'question': f'Question {i}?',
+            'choices': ['A', 'B', 'C', 'D'],
+            'answer': 'B',
+        }
+        for i in range(count)
+    ]
+
+
+class BulkImportTests(TestCase):
+    """Test importing questions in bulk"""
+
+    def test_import_in_batches(self):
+        """Test rows are written with one INSERT per batch"""
+        with self.assertNumQueries(3):
+            result = import_questions(sample_rows(5), batch_size=5)
+
+        self.assertEqual(result, {'created': 5, 'errors': []})
+        self.assertEqual(Exam_Question.objects.count(), 5)
+
+    def test_invalid_rows_reported(self):
+        """Test invalid rows are reported while valid rows are saved"""
+        rows = sample_rows(2) + [
+            {'question': 'Bad?', 'choices': ['A', 'B'], 'answer': 'Z'},
+            {'choices': ['A']},
+            'not an object',
+        ]
+
+        result = import_questions(rows)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual([e['row'] for e in result['errors']], [2, 3, 4])
+        self.assertIn('answer', result['errors'][0]['errors'])
+        self.assertIn('question', result['errors'][1]['errors'])
+
+    def test_undecodable_line_reported(self):
+        """Test a line that is not UTF-8 becomes an invalid row"""
+        lines = [
+            json.dumps(row).encode() for row in sample_rows(2)
+        ]
+        lines.insert(1, b'{"question": "\xff?"}')
+
+        result = import_questions(iter_ndjson(lines))
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual([e['row'] for e in result['errors']], [1])
+        self.assertIn(
+            'Invalid UTF-8',
+            result['errors'][0]['errors']['non_field_errors'][0],
+        )
+
+    def test_choices_string_rejected(self):
+        """Test choices encoded as a JSON string are refused"""
+        result = import_questions([
+            {'question': 'Q?', 'choices': '["A", "B"]', 'answer': 'A'},
+        ])
+
+        self.assertEqual(result['created'], 0)
+        self.assertIn('choices', result['errors'][0]['errors'])
+
+    def test_import_command_ndjson(self):
+        """Test the import_questions command reads NDJSON files"""
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson') as f:
+            for row in sample_rows(3):
+                f.write(json.dumps(row) + '\n')
+            f.write('{broken\n')
+            f.flush()
+            call_command('import_questions', f.name, stderr=StringIO())
+
+        self.assertEqual(Exam_Question.objects.count(), 3)
+
+
+class BulkImportAPITests(TestCase):
+    """Test the bulk import endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_json_array(self):
+        """Test importing a JSON array of questions"""
+        res = self.client.post(BULK_URL, sample_rows(3), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['created'], 3)
+        self.assertEqual(Exam_Question.objects.count(), 3)
+
+    def test_bulk_ndjson_stream(self):
+        """Test importing an NDJSON request body"""
+        body = '\n'.join(json.dumps(row) for row in sample_rows(4))
+
+        res = self.client.post(
+            BULK_URL, body, content_type='application/x-ndjson',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['created'], 4)
+
+    def test_bulk_all_rows_invalid(self):
+        """Test a request with no valid rows is rejected"""
+        res = self.client.post(
+            BULK_URL,
+            [{'question': 'Q?', 'choices': ['A'], 'answer': 'B'}],
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(res.data['errors']), 1)
+        self.assertFalse(Exam_Question.objects.exists())
+
+    def test_bulk_requires_list(self):
+        """Test a JSON object body is rejected"""
+        res = self.client.post(BULK_URL, {'question': 'Q?'}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
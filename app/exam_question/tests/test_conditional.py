@@ -0,0 +1,110 @@
+"""
+Test for conditional GET on exam questions
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Exam_Question
+
+
+EXAM_QUESTION_URL = reverse('exam_question:exam_question-list')
+
+
+def detail_url(exam_question_id):
+    """Create and return an exam_question detail URL"""
+    return reverse(
+        'exam_question:exam_question-detail', args=[exam_question_id],
+    )
+
+
+def create_question(**params):
+    """Create and return a sample question"""
+    defaults = {
+        'question': 'sample question?',
+        'choices': ['A', 'B', 'C', 'D'],
+        'answer': 'C',
+    }
+    defaults.update(params)
+
+    return Exam_Question.objects.create(**defaults)
+
+
+@override_settings(EXAM_QUESTION_RESPONSE_CACHE=True)
+class ConditionalGetTests(TestCase):
+    """Test ETag handling on exam_question endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_detail_not_modified(self):
+        """Test a matching If-None-Match returns 304 without a body"""
+        question = create_question()
+        etag = self.client.get(detail_url(question.id))['ETag']
+
+        with self.assertNumQueries(0):
+            res = self.client.get(
+                detail_url(question.id), HTTP_IF_NONE_MATCH=etag,
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+        self.assertEqual(res.content, b'')
+
+    def test_detail_not_modified_on_cold_cache(self):
+        """Test a 304 is computed from the version column on a miss"""
+        question = create_question()
+        etag = self.client.get(detail_url(question.id))['ETag']
+        create_question()
+
+        res = self.client.get(
+            detail_url(question.id), HTTP_IF_NONE_MATCH=etag,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_etag_changes_on_update(self):
+        """Test an updated question no longer matches the old ETag"""
+        question = create_question()
+        etag = self.client.get(detail_url(question.id))['ETag']
+        question.question = 'Changed?'
+        with self.captureOnCommitCallbacks(execute=True):
+            question.save()
+
+        res = self.client.get(
+            detail_url(question.id), HTTP_IF_NONE_MATCH=etag,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    @override_settings(API_COMPACT=False)
+    def test_detail_etag_varies_by_media_type(self):
+        """Test differently rendered bodies never share an ETag"""
+        question = create_question()
+
+        plain = self.client.get(detail_url(question.id))
+        indented = self.client.get(
+            detail_url(question.id),
+            HTTP_ACCEPT='application/json; indent=2',
+        )
+
+        self.assertNotEqual(plain.content, indented.content)
+        self.assertNotEqual(plain['ETag'], indented['ETag'])
+
+    def test_list_not_modified(self):
+        """Test list pages carry an ETag honoured by If-None-Match"""
+        create_question()
+        etag = self.client.get(EXAM_QUESTION_URL)['ETag']
+
+        res = self.client.get(EXAM_QUESTION_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,140 @@
+"""
+Test for streaming question export
+"""
+import csv
+import io
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.export import write_export
+from core.models import Exam_Question
+
+
+EXPORT_URL = reverse('exam_question:exam_question-export')
+
+
+def create_question(**params):
+    """Create and return a sample question"""
+    defaults = {
+        'question': 'sample question?',
+        'choices': ['A', 'B', 'C', 'D'],
+        'answer': 'C',
+    }
+    defaults.update(params)
+
+    return Exam_Question.objects.create(**defaults)
+
+
+class ExportTests(TestCase):
+    """Test the export helpers and command"""
+
+    def test_write_ndjson(self):
+        """Test every row is written as one JSON object per line"""
+        q1 = create_question(question='First?')
+        q2 = create_question(question='Second?', answer='A')
+        stream = StringIO()
+
+        write_export(
+            stream,
+            Exam_Question.objects.order_by('id'),
+            ['id', 'question', 'choices', 'answer'],
+            'ndjson',
+            chunk_size=1,
+        )
+
+        rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [q1.id, q2.id])
+        self.assertEqual(rows[1]['choices'], ['A', 'B', 'C', 'D'])
+        self.assertEqual(rows[1]['answer'], 'A')
+
+    def test_write_csv(self):
+        """Test CSV output has a header and JSON-encoded lists"""
+        create_question()
+        stream = StringIO()
+
+        write_export(
+            stream,
+            Exam_Question.objects.all(),
+            ['question', 'choices'],
+            'csv',
+        )
+
+        rows = list(csv.reader(io.StringIO(stream.getvalue())))
+        self.assertEqual(rows[0], ['question', 'choices'])
+        self.assertEqual(json.loads(rows[1][1]), ['A', 'B', 'C', 'D'])
+
+    def test_export_command(self):
+        """Test the export_questions command writes to stdout"""
+        create_question()
+        out = StringIO()
+
+        call_command('export_questions', '--format', 'ndjson', stdout=out)
+
+        row = json.loads(out.getvalue())
+        self.assertEqual(row['question'], 'sample question?')
+
+    def test_export_command_file(self):
+        """Test the export_questions command reports the file written"""
+        create_question()
+        err = StringIO()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'questions.ndjson')
+            call_command('export_questions', '--output', path, stderr=err)
+            with open(path, encoding='utf-8') as f:
+                row = json.loads(f.read())
+
+        self.assertEqual(row['question'], 'sample question?')
+        self.assertIn(path, err.getvalue())
+
+
+class ExportAPITests(TestCase):
+    """Test the export endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_export_streams_ndjson(self):
+        """Test questions are streamed as NDJSON by default"""
+        create_question()
+        create_question()
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        body = b''.join(res.streaming_content).decode()
+        self.assertEqual(len(body.splitlines()), 2)
+
+    def test_export_csv(self):
+        """Test ?output=csv streams CSV with an attachment filename"""
+        create_question()
+
+        res = self.client.get(EXPORT_URL, {'output': 'csv'})
+
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        self.assertIn('exam_questions.csv', res['Content-Disposition'])
+        body = b''.join(res.streaming_content).decode()
+        self.assertTrue(body.startswith('id,question,choices,answer'))
+
+    def test_export_invalid_output(self):
+        """Test an unknown output format is rejected"""
+        res = self.client.get(EXPORT_URL, {'output': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,104 @@
+"""
+Test for exam_question cursor pagination
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Exam_Question
+from exam_question import generation
+from exam_question.pagination import Exam_QuestionCursorPagination
+
+
+EXAM_QUESTION_URL = reverse('exam_question:exam_question-list')
+
+
+def create_questions(count):
+    """Create and return sample questions"""
+    questions = Exam_Question.objects.bulk_create([
+        Exam_Question(
+            question=f'Question {i}?',
+            choices=['A', 'B', 'C'],
+            answer='A',
+        )
+        for i in range(count)
+    ])
+    # bulk_create sends no post_save signals
+    generation.bump()
+    return questions
+
+
+class CursorPaginationTests(TestCase):
+    """Test paginating the exam_question list"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def fetch_ids(self, url):
+        """Return the ids on a page and the next page url"""
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        data = res.json()
+        return [row['id'] for row in data['results']], data['next']
+
+    def test_pages_walk_all_rows(self):
+        """Test following next links yields every row once, newest first"""
+        create_questions(7)
+        ids = []
+        url = f'{EXAM_QUESTION_URL}?page_size=3'
+        while url:
+            page_ids, url = self.fetch_ids(url)
+            ids.extend(page_ids)
+
+        expected = list(
+            Exam_Question.objects.order_by('-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_stable_under_concurrent_inserts(self):
+        """Test rows inserted mid-walk do not shift or repeat pages"""
+        create_questions(6)
+        expected = list(
+            Exam_Question.objects.order_by('-id').values_list('id', flat=True)
+        )
+
+        first, next_url = self.fetch_ids(f'{EXAM_QUESTION_URL}?page_size=3')
+        create_questions(4)
+        second, next_url = self.fetch_ids(next_url)
+
+        self.assertEqual(first + second, expected)
+        self.assertIsNone(next_url)
+
+    @patch.object(Exam_QuestionCursorPagination, 'max_page_size', 2)
+    def test_page_size_capped(self):
+        """Test the requested page size cannot exceed the maximum"""
+        create_questions(3)
+
+        ids, next_url = self.fetch_ids(f'{EXAM_QUESTION_URL}?page_size=100')
+
+        self.assertEqual(len(ids), 2)
+        self.assertIsNotNone(next_url)
+
+    def test_no_count_or_offset(self):
+        """Test listing never issues COUNT(*) or OFFSET queries"""
+        create_questions(5)
+        _, next_url = self.fetch_ids(f'{EXAM_QUESTION_URL}?page_size=2')
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.fetch_ids(next_url)
+
+        for query in ctx.captured_queries:
+            self.assertNotIn('COUNT(', query['sql'].upper())
+            self.assertNotIn('OFFSET', query['sql'].upper())
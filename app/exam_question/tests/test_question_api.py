@@ -7,16 +7,27 @@ from django.test import TestCase
 from django.urls import reverse
 
 from rest_framework import status
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
 from core.models import Exam_Question
+from core.testing import QueryBudgetMixin
 
+from exam_question import generation
 from exam_question.serializers import Exam_QuestionSerializer
+from user.authentication import token_cache
 
 
 EXAM_QUESTION_URL = reverse('exam_question:exam_question-list')
 
 
+def detail_url(exam_question_id):
+    """Create and return an exam_question detail URL"""
+    return reverse(
+        'exam_question:exam_question-detail', args=[exam_question_id],
+    )
+
+
 def create_question(**params):
     """Create and return a sample question"""
     defaults = {
@@ -69,7 +80,7 @@ class PrivateRecipeAPITests(TestCase):
         exam_questions = Exam_Question.objects.all().order_by('-id')
         serializer = Exam_QuestionSerializer(exam_questions, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.json()['results'], serializer.data)
 
     def test_get_exam_question_detail(self):
         """Test get recipe detail"""
@@ -330,3 +341,92 @@ class PrivateRecipeAPITests(TestCase):
         # Ensure answer is in choices
         self.assertIn(exam.answer, exam.choices)
         self.assertIn(payload['answer'], payload['choices'])
+
+
+class QuestionQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Test each endpoint stays within its query budget"""
+    # Each includes the one query authenticating a token not yet cached
+    query_budgets = {
+        'list': 2,
+        'retrieve': 2,
+        'create': 2,
+        # Loads the question, updates it, reads back its new version
+        'update': 4,
+        'partial_update': 4,
+        # Loads the question, collects its answers, deletes
+        'delete': 4,
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='user@example.com',
+            password='testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        token_cache.clear()
+        self.exam_question = create_question()
+        # Measure cold responses, not ones cached by an earlier test
+        generation.bump()
+
+    def test_list_budget(self):
+        """Test listing questions stays within budget"""
+        for i in range(5):
+            create_question(question=f'Question {i}?')
+
+        with self.assertQueryBudget('list'):
+            res = self.client.get(EXAM_QUESTION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_budget(self):
+        """Test retrieving a question stays within budget"""
+        with self.assertQueryBudget('retrieve'):
+            res = self.client.get(detail_url(self.exam_question.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_create_budget(self):
+        """Test creating a question stays within budget"""
+        payload = {
+            'question': 'New question?',
+            'choices': ['A', 'B'],
+            'answer': 'A',
+        }
+
+        with self.assertQueryBudget('create'):
+            res = self.client.post(EXAM_QUESTION_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_update_budget(self):
+        """Test a full update stays within budget"""
+        payload = {
+            'question': 'Updated question?',
+            'choices': ['A', 'B', 'C', 'D'],
+            'answer': 'D',
+        }
+
+        with self.assertQueryBudget('update'):
+            res = self.client.put(
+                detail_url(self.exam_question.id), payload, format='json',
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_partial_update_budget(self):
+        """Test a partial update stays within budget"""
+        with self.assertQueryBudget('partial_update'):
+            res = self.client.patch(
+                detail_url(self.exam_question.id), {'question': 'Changed?'},
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_delete_budget(self):
+        """Test deleting a question stays within budget"""
+        with self.assertQueryBudget('delete'):
+            res = self.client.delete(detail_url(self.exam_question.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
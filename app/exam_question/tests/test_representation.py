@@ -0,0 +1,139 @@
+"""
+Tests for the fast exam_question read path
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.models import Exam_Question
+from exam_question import generation, representation
+from exam_question.pagination import Exam_QuestionCursorPagination
+from exam_question.serializers import Exam_QuestionSerializer
+
+
+EXAM_QUESTION_URL = reverse('exam_question:exam_question-list')
+
+# Values where a naive encoder would differ from JSONRenderer
+AWKWARD_CHOICES = [
+    ['A', 'B', 'C', 'D'],
+    ['café', '中文', '\U0001f600', 'line\u2028sep\u2029'],
+    ['"quoted"', 'back\\slash', 'tab\tnew\nline', '\x00\x1f\x7f'],
+    [0.1, 1e16, -0.0, 3],
+    [2 ** 70, True, None],
+    [{'label': 'A', 'weight': 0.5}, {'label': 'B'}],
+    '["a JSON string, not a list"]',
+]
+
+
+def detail_url(exam_question_id):
+    """Create and return an exam_question detail URL"""
+    return reverse(
+        'exam_question:exam_question-detail', args=[exam_question_id],
+    )
+
+
+def drf_render(data, renderer=None):
+    """Render data the way the serializer path does"""
+    return (renderer or representation.json_renderer()).render(data)
+
+
+class RepresentationTests(TestCase):
+    """Test fast rendering matches the serializer byte for byte"""
+
+    def setUp(self):
+        self.questions = [
+            Exam_Question.objects.create(
+                question=f'Question \u2028{i} "?"',
+                choices=choices,
+                answer=None if i % 2 else 'A',
+            )
+            for i, choices in enumerate(AWKWARD_CHOICES)
+        ]
+
+    def assert_rows_identical(self, renderer=None):
+        for question in self.questions:
+            self.assertEqual(
+                representation.render_row(
+                    representation.row_of(question), renderer=renderer,
+                ),
+                drf_render(Exam_QuestionSerializer(question).data, renderer),
+            )
+        rows = Exam_Question.objects.order_by('id').values_list(
+            *representation.FIELDS,
+        )
+        self.assertEqual(
+            representation.render_rows(rows, renderer=renderer),
+            drf_render(Exam_QuestionSerializer(
+                Exam_Question.objects.order_by('id'), many=True,
+            ).data, renderer),
+        )
+
+    def test_rows_identical(self):
+        """Test rows render exactly as the serializer does"""
+        self.assert_rows_identical()
+
+    def test_rows_identical_with_json_renderer(self):
+        """Test rows match with DRF's JSONRenderer configured instead"""
+        self.assert_rows_identical(JSONRenderer())
+
+    def test_configured_renderer_used(self):
+        """Test rows are encoded by the configured renderer"""
+        row = (1, 'Q?', [1e16], None)
+
+        self.assertEqual(
+            representation.render_row(row),
+            representation.json_renderer().render(representation.as_data(row)),
+        )
+
+
+class FastListTests(TestCase):
+    """Test the list and detail endpoints use the fast path"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        ))
+        for choices in AWKWARD_CHOICES:
+            Exam_Question.objects.create(
+                question='Sample é?', choices=choices, answer='A',
+            )
+        generation.bump()
+
+    def test_page_identical(self):
+        """Test a page matches the paginated serializer output"""
+        res = self.client.get(EXAM_QUESTION_URL, {'page_size': 3})
+
+        paginator = Exam_QuestionCursorPagination()
+        request = res.wsgi_request
+        request.query_params = request.GET
+        page = paginator.paginate_queryset(
+            Exam_Question.objects.order_by('-id'), request,
+        )
+        expected = drf_render(paginator.get_paginated_response(
+            Exam_QuestionSerializer(page, many=True).data,
+        ).data)
+        self.assertEqual(res.content, expected)
+        self.assertIsNotNone(res.json()['next'])
+
+    def test_detail_identical(self):
+        """Test a question matches the serializer output"""
+        question = Exam_Question.objects.last()
+
+        res = self.client.get(detail_url(question.id))
+
+        self.assertEqual(
+            res.content, drf_render(Exam_QuestionSerializer(question).data),
+        )
+
+    def test_indented_uses_renderer(self):
+        """Test an indent request falls back to the renderer"""
+        res = self.client.get(
+            EXAM_QUESTION_URL, HTTP_ACCEPT='application/json; indent=2',
+        )
+
+        self.assertIn(b'\n  "next"', res.content)
@@ -0,0 +1,128 @@
+"""
+Test for the exam_question response cache
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Exam_Question
+from exam_question import generation, response_cache
+
+
+EXAM_QUESTION_URL = reverse('exam_question:exam_question-list')
+CACHE_STATS_URL = reverse('exam_question:exam_question-cache-stats')
+
+
+def detail_url(exam_question_id):
+    """Create and return an exam_question detail URL"""
+    return reverse(
+        'exam_question:exam_question-detail', args=[exam_question_id],
+    )
+
+
+def create_question(**params):
+    """Create and return a sample question"""
+    defaults = {
+        'question': 'sample question?',
+        'choices': ['A', 'B', 'C', 'D'],
+        'answer': 'C',
+    }
+    defaults.update(params)
+
+    return Exam_Question.objects.create(**defaults)
+
+
+@override_settings(EXAM_QUESTION_RESPONSE_CACHE=True)
+class ResponseCacheTests(TestCase):
+    """Test cached list and detail responses"""
+
+    def setUp(self):
+        response_cache.stats.reset()
+        # Writes bump the generation on commit, which tests never reach
+        generation.bump()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_detail_served_from_cache(self):
+        """Test a warm detail request skips the database"""
+        question = create_question()
+        first = self.client.get(detail_url(question.id))
+
+        with self.assertNumQueries(0):
+            second = self.client.get(detail_url(question.id))
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(response_cache.stats.snapshot(), {
+            'hits': 1, 'misses': 1,
+        })
+
+    @override_settings(EXAM_QUESTION_RESPONSE_CACHE=False)
+    def test_disabled_without_shared_cache(self):
+        """Test nothing is cached when the cache is switched off"""
+        question = create_question()
+        self.client.get(detail_url(question.id))
+
+        with self.assertNumQueries(1):
+            res = self.client.get(detail_url(question.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(response_cache.stats.snapshot(), {
+            'hits': 0, 'misses': 0,
+        })
+
+    def test_list_served_from_cache(self):
+        """Test a warm list page skips the database"""
+        create_question()
+        first = self.client.get(EXAM_QUESTION_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(EXAM_QUESTION_URL)
+
+        self.assertEqual(first.content, second.content)
+
+    def test_update_invalidates(self):
+        """Test writes through the API invalidate cached responses"""
+        question = create_question()
+        self.client.get(detail_url(question.id))
+        self.client.get(EXAM_QUESTION_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                detail_url(question.id), {'question': 'Changed?'},
+            )
+
+        self.assertEqual(
+            self.client.get(detail_url(question.id)).json()['question'],
+            'Changed?',
+        )
+        results = self.client.get(EXAM_QUESTION_URL).json()['results']
+        self.assertEqual(results[0]['question'], 'Changed?')
+
+    def test_delete_invalidates(self):
+        """Test a deleted question is no longer served from cache"""
+        question = create_question()
+        self.client.get(detail_url(question.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(detail_url(question.id))
+        res = self.client.get(detail_url(question.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cache_stats_admin_only(self):
+        """Test cache counters are only exposed to staff"""
+        res = self.client.get(CACHE_STATS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        res = self.client.get(CACHE_STATS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(res.data), {'hits', 'misses'})
@@ -8,7 +8,7 @@ from django.urls import (
 
 from rest_framework.routers import DefaultRouter
 
-from exam_question import views
+from exam_question import async_views, views
 
 
 router = DefaultRouter()
@@ -18,4 +18,14 @@ app_name = 'exam_question'
 
 urlpatterns = [
     path('', include(router.urls)),
+    path(
+        'async/exam_question/',
+        async_views.question_list,
+        name='async-exam_question-list',
+    ),
+    path(
+        'async/exam_question/<int:pk>/',
+        async_views.question_detail,
+        name='async-exam_question-detail',
+    ),
 ]
@@ -1,19 +1,221 @@
 # Views for Exam Questions
-from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
+from django.http import HttpResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 
+from core import export, metrics
+from core.conditional import (
+    content_etag,
+    make_etag,
+    media_tag,
+    not_modified,
+)
 from core.models import Exam_Question
-from exam_question import serializers
+from exam_question import representation, response_cache, serializers
+from exam_question.bulk import import_questions, iter_ndjson
+from exam_question.pagination import Exam_QuestionCursorPagination
+from user.authentication import CachedTokenAuthentication
+from user_answer import stats
+
+
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson')
+QUESTION_EXPORT_FIELDS = ['id', 'question', 'choices', 'answer']
+STATS_ACTIONS = ('stats_list', 'question_stats')
 
 
 class Exam_QuestionViewSet(viewsets.ModelViewSet):
     """View for managing exam_question APIs"""
     serializer_class = serializers.Exam_QuestionSerializer
     queryset = Exam_Question.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = Exam_QuestionCursorPagination
 
     def get_queryset(self):
         """Retrieve exam questions"""
         return self.queryset.order_by('-id')
+
+    def get_serializer_class(self):
+        """Return the serializer class for request"""
+        if self.action in STATS_ACTIONS:
+            return serializers.QuestionStatsSerializer
+        return self.serializer_class
+
+    def list(self, request, *args, **kwargs):
+        """List questions, served from the response cache when warm"""
+        def load():
+            queryset = self.filter_queryset(self.get_queryset())
+            if self.fast_render():
+                page = self.paginate_queryset(queryset.values_list(
+                    *representation.FIELDS, named=True,
+                ))
+                return None, lambda: representation.render_page(
+                    page,
+                    self.paginator.get_next_link(),
+                    self.paginator.get_previous_link(),
+                    **self.render_options(),
+                )
+            page = self.paginate_queryset(queryset)
+            return None, lambda: self.get_paginated_response(
+                self.get_serializer(page, many=True).data,
+            ).data
+
+        key = response_cache.page_key(request, request.accepted_media_type)
+        return self.cached_response(key, load)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a question, served from the response cache when warm"""
+        def load():
+            instance = self.get_object()
+            etag = make_etag(
+                'q', instance.pk, instance.version,
+                media_tag(request.accepted_media_type),
+            )
+            if self.fast_render():
+                return etag, lambda: representation.render_row(
+                    representation.row_of(instance), **self.render_options(),
+                )
+            return etag, lambda: self.get_serializer(instance).data
+
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        key = response_cache.detail_key(pk, request.accepted_media_type)
+        return self.cached_response(key, load)
+
+    def fast_render(self):
+        """Return True if the response can skip the serializer"""
+        return self.request.accepted_renderer.format == 'json'
+
+    def render_options(self):
+        """Return how the fast path renders, as the response would"""
+        return {
+            'renderer': self.request.accepted_renderer,
+            'media_type': self.request.accepted_media_type,
+            'renderer_context': self.get_renderer_context(),
+        }
+
+    def cached_response(self, key, load):
+        """
+        Return the response cached under key, answering If-None-Match
+        with a 304 whenever the ETag is known before serializing.
+
+        On a miss load() returns (etag or None, callable returning the
+        response data, or the rendered JSON body from the fast path); a
+        missing ETag is derived from the rendered body.
+        """
+        request = self.request
+        renderer = request.accepted_renderer
+        cacheable = renderer.format == 'json'
+
+        cached = response_cache.get(key) if cacheable else None
+        if cached is not None:
+            content, etag = cached
+        else:
+            content = None
+            etag, get_data = load()
+
+        if etag is not None:
+            response = not_modified(request, etag)
+            if response is not None:
+                return response
+
+        if content is None:
+            with metrics.serializing():
+                data = get_data()
+            if isinstance(data, bytes):
+                content = data
+            elif not cacheable:
+                response = Response(data)
+                if etag is not None:
+                    response['ETag'] = etag
+                return response
+            else:
+                content = renderer.render(
+                    data,
+                    request.accepted_media_type,
+                    self.get_renderer_context(),
+                )
+            if etag is None:
+                etag = content_etag(content)
+                response = not_modified(request, etag)
+                if response is not None:
+                    return response
+            response_cache.set(key, (content, etag))
+
+        response = HttpResponse(content, content_type=renderer.media_type)
+        response['ETag'] = etag
+        return response
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='cache-stats',
+        permission_classes=[IsAdminUser],
+    )
+    def cache_stats(self, request):
+        """Return response cache hit/miss counters"""
+        return Response(response_cache.stats.snapshot())
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='stats',
+        url_name='stats',
+    )
+    def stats_list(self, request):
+        """List questions with their answer counts, newest first"""
+        page = stats.attach_question_stats(
+            self.paginate_queryset(self.get_queryset()),
+        )
+        return self.get_paginated_response(
+            self.get_serializer(page, many=True).data,
+        )
+
+    @action(
+        detail=True,
+        methods=['get'],
+        url_path='stats',
+        url_name='question-stats',
+    )
+    def question_stats(self, request, pk=None):
+        """Return the answer counts for a single question"""
+        [instance] = stats.attach_question_stats([self.get_object()])
+        return Response(self.get_serializer(instance).data)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """Stream every question as NDJSON or CSV (?output=csv)"""
+        fmt = request.query_params.get('output', 'ndjson')
+        if fmt not in export.CONTENT_TYPES:
+            return Response(
+                {'output': [
+                    f'Expected one of {", ".join(export.CONTENT_TYPES)}.'
+                ]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return export.streaming_response(
+            Exam_Question.objects.order_by('id'),
+            QUESTION_EXPORT_FIELDS,
+            fmt,
+            'exam_questions',
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """Import many questions from a JSON array or an NDJSON stream"""
+        content_type = request.content_type.split(';')[0].strip()
+        if content_type in NDJSON_CONTENT_TYPES:
+            rows = iter_ndjson(request.stream or [])
+        else:
+            rows = request.data
+            if not isinstance(rows, list):
+                return Response(
+                    {'detail': 'Expected a JSON array of questions.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        result = import_questions(rows)
+        if result['created'] or not result['errors']:
+            return Response(result, status=status.HTTP_201_CREATED)
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,30 @@
+"""
+Serializers for the exam_session API
+"""
+from django.conf import settings
+from rest_framework import serializers
+
+from core.models import Exam_Session
+
+
+class Exam_SessionSerializer(serializers.ModelSerializer):
+    """Serializer for an exam session, without its questions"""
+    question_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Exam_Session
+        fields = ['id', 'question_ids', 'question_count', 'Created_Date']
+        read_only_fields = fields
+
+    def get_question_count(self, instance):
+        """Return the number of questions in the session"""
+        return len(instance.question_ids)
+
+
+class StartSessionSerializer(serializers.Serializer):
+    """Serializer for starting an exam session"""
+    count = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.EXAM_SESSION_MAX_QUESTIONS,
+        default=settings.EXAM_SESSION_QUESTIONS,
+    )
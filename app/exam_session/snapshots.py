@@ -0,0 +1,102 @@
+"""
+Pre-serialized question snapshots for exam sessions
+
+When a session starts its questions are selected, their choices are
+shuffled and the result is rendered once into a JSON blob stored on the
+session. Question fetches are served from that blob, kept in a
+per-process LRU, so they never touch the questions table.
+"""
+import json
+import random
+from collections import namedtuple
+
+from django.conf import settings
+
+from core.cache import LRUCache
+from core.models import Exam_Question, Exam_Session
+from exam_question import representation
+from exam_question.answer_key import answer_key
+
+
+SNAPSHOT_FIELDS = ['id', 'question', 'choices']
+
+Snapshot = namedtuple('Snapshot', ['user_id', 'content', 'items'])
+
+snapshot_cache = LRUCache(max_size=settings.EXAM_SESSION_CACHE_SIZE)
+
+
+class NoQuestions(Exception):
+    """Raised when a session is started with no questions to choose"""
+
+
+def render(value):
+    """Render value to JSON bytes with the API's JSON renderer"""
+    return representation.render(value)
+
+
+def shuffled(choices):
+    """Return a shuffled copy of a list of choices"""
+    if isinstance(choices, list):
+        return random.sample(choices, len(choices))
+    return choices
+
+
+def build_items(question_ids):
+    """Return the rendered questions, in question_ids order"""
+    questions = {
+        row['id']: row
+        for row in Exam_Question.objects.filter(
+            id__in=question_ids,
+        ).values(*SNAPSHOT_FIELDS)
+    }
+    items = []
+    for question_id in question_ids:
+        row = questions.get(question_id)
+        if row is not None:
+            row['choices'] = shuffled(row['choices'])
+            items.append(render(row))
+    return items
+
+
+def join(items):
+    """Join rendered items into a JSON array"""
+    return b'[' + b','.join(items) + b']'
+
+
+def start_session(user, count):
+    """Select count random questions and snapshot them for user"""
+    question_ids = answer_key.question_ids()
+    if not question_ids:
+        raise NoQuestions()
+    question_ids = random.sample(
+        question_ids, min(count, len(question_ids)),
+    )
+    items = build_items(question_ids)
+    content = join(items)
+    session = Exam_Session.objects.create(
+        user=user,
+        question_ids=question_ids,
+        snapshot=content,
+    )
+    snapshot = Snapshot(user.pk, content, items)
+    snapshot_cache.set(session.pk, snapshot)
+    return session, snapshot
+
+
+def get_snapshot(session_id):
+    """Return the Snapshot of a session, or None if it does not exist"""
+    snapshot = snapshot_cache.get(session_id)
+    if snapshot is not None:
+        return snapshot
+
+    row = Exam_Session.objects.filter(pk=session_id).values_list(
+        'user_id', 'snapshot',
+    ).first()
+    if row is None:
+        return None
+    user_id, content = row
+    content = bytes(content)
+    items = [render(item) for item in json.loads(content)]
+    snapshot = Snapshot(user_id, content, items)
+    snapshot_cache.set(session_id, snapshot)
+    return snapshot
@@ -0,0 +1,193 @@
+"""
+Test for exam_session APIs
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Exam_Question, Exam_Session
+from exam_question import generation, representation
+from exam_session.snapshots import get_snapshot, snapshot_cache
+
+
+SESSION_URL = reverse('exam_session:exam_session-list')
+
+
+def questions_url(session_id):
+    """Create and return the URL of a session's questions"""
+    return reverse('exam_session:exam_session-questions', args=[session_id])
+
+
+def question_url(session_id, position):
+    """Create and return the URL of one question of a session"""
+    return reverse(
+        'exam_session:exam_session-question', args=[session_id, position],
+    )
+
+
+def create_questions(count):
+    """Create count sample questions"""
+    Exam_Question.objects.bulk_create([
+        Exam_Question(
+            question=f'Question {i}?',
+            choices=['A', 'B', 'C', 'D'],
+            answer='C',
+        )
+        for i in range(count)
+    ])
+    # bulk_create sends no post_save signals
+    generation.bump()
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+class PublicExamSessionAPITests(TestCase):
+    """Test unauthenticated API requests"""
+
+    def test_auth_required(self):
+        """Test auth is required to start a session"""
+        res = APIClient().post(SESSION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateExamSessionAPITests(TestCase):
+    """Test authenticated API requests"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+        snapshot_cache.clear()
+
+    def start(self, count=None):
+        """Start a session and return the response"""
+        payload = {} if count is None else {'count': count}
+        return self.client.post(SESSION_URL, payload, format='json')
+
+    def test_start_session(self):
+        """Test starting a session snapshots a subset of questions"""
+        create_questions(5)
+
+        res = self.start(count=3)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        body = res.json()
+        session = Exam_Session.objects.get(id=body['id'])
+        self.assertEqual(session.user, self.user)
+        self.assertEqual(len(body['questions']), 3)
+        self.assertEqual(
+            [q['id'] for q in body['questions']], session.question_ids,
+        )
+        for question in body['questions']:
+            self.assertNotIn('answer', question)
+            self.assertEqual(sorted(question['choices']), ['A', 'B', 'C', 'D'])
+
+    def test_snapshot_uses_configured_renderer(self):
+        """Test snapshots are encoded like the rest of the API"""
+        question = Exam_Question.objects.create(
+            question='Float?', choices=[1e16], answer='A',
+        )
+        session_id = self.start().json()['id']
+
+        content = bytes(Exam_Session.objects.get(id=session_id).snapshot)
+
+        self.assertEqual(content, b'[%s]' % representation.render({
+            'id': question.id, 'question': 'Float?', 'choices': [1e16],
+        }))
+
+    def test_start_without_questions(self):
+        """Test a session cannot start when there are no questions"""
+        generation.bump()
+
+        res = self.start()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_start_count_limited(self):
+        """Test an out-of-range count is rejected"""
+        res = self.start(count=0)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_questions_served_from_snapshot(self):
+        """Test warm question fetches do not query the database"""
+        create_questions(3)
+        session_id = self.start().json()['id']
+        Exam_Question.objects.all().delete()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(questions_url(session_id))
+            one = self.client.get(question_url(session_id, 2))
+
+        self.assertEqual(len(res.json()), 3)
+        self.assertEqual(one.json(), res.json()[2])
+
+    def test_snapshot_loaded_once_on_cold_cache(self):
+        """Test another process loads the snapshot with one query"""
+        create_questions(2)
+        first = self.start().json()
+        snapshot_cache.clear()
+
+        with self.assertNumQueries(1):
+            res = self.client.get(questions_url(first['id']))
+            self.client.get(question_url(first['id'], 0))
+
+        self.assertEqual(res.json(), first['questions'])
+        self.assertEqual(
+            get_snapshot(first['id']).content,
+            bytes(Exam_Session.objects.get().snapshot),
+        )
+
+    def test_questions_not_modified(self):
+        """Test the snapshot is immutable and revalidates with a 304"""
+        create_questions(2)
+        session_id = self.start().json()['id']
+        etag = self.client.get(questions_url(session_id))['ETag']
+
+        res = self.client.get(
+            questions_url(session_id), HTTP_IF_NONE_MATCH=etag,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_question_position_out_of_range(self):
+        """Test a position past the last question returns 404"""
+        create_questions(1)
+        session_id = self.start().json()['id']
+
+        res = self.client.get(question_url(session_id, 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_other_users_session_not_found(self):
+        """Test a user cannot read another user's session"""
+        create_questions(1)
+        session_id = self.start().json()['id']
+        self.client.force_authenticate(create_user(
+            email='other@example.com', password='testpass123',
+        ))
+
+        res = self.client.get(questions_url(session_id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_sessions(self):
+        """Test listing the user's sessions without their snapshots"""
+        create_questions(2)
+        self.start(count=2)
+
+        res = self.client.get(SESSION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]['question_count'], 2)
+        self.assertNotIn('snapshot', res.data[0])
@@ -0,0 +1,21 @@
+"""
+URL mappings for the exam_session app
+"""
+from django.urls import (
+    path,
+    include,
+)
+
+from rest_framework.routers import DefaultRouter
+
+from exam_session import views
+
+
+router = DefaultRouter()
+router.register('exam_session', views.Exam_SessionViewSet)
+
+app_name = 'exam_session'
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
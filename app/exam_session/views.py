@@ -0,0 +1,105 @@
+"""
+Views for the exam_session API
+"""
+from django.http import HttpResponse
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from core.conditional import make_etag, not_modified
+from core.models import Exam_Session
+from exam_session import serializers, snapshots
+from user.authentication import CachedTokenAuthentication
+
+
+class Exam_SessionViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """View for starting exam sessions and reading their questions"""
+    serializer_class = serializers.Exam_SessionSerializer
+    queryset = Exam_Session.objects.defer('snapshot')
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Retrieve sessions for the authenticated user"""
+        return self.queryset.filter(user=self.request.user).order_by('-id')
+
+    def get_serializer_class(self):
+        """Return the serializer class for request"""
+        if self.action == 'create':
+            return serializers.StartSessionSerializer
+        return self.serializer_class
+
+    def create(self, request, *args, **kwargs):
+        """Start a session and return its snapshot of questions"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            session, snapshot = snapshots.start_session(
+                request.user, serializer.validated_data['count'],
+            )
+        except snapshots.NoQuestions:
+            return Response(
+                {'detail': 'There are no questions to choose from.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        response = json_response(
+            b'{"id":%d,"questions":%s}' % (session.pk, snapshot.content),
+            status_code=status.HTTP_201_CREATED,
+        )
+        response['ETag'] = make_etag('s', session.pk)
+        return response
+
+    def get_snapshot(self, pk):
+        """Return the snapshot of the user's session pk, or raise 404"""
+        try:
+            snapshot = snapshots.get_snapshot(int(pk))
+        except ValueError:
+            snapshot = None
+        if snapshot is None or snapshot.user_id != self.request.user.pk:
+            raise NotFound()
+        return snapshot
+
+    @action(detail=True, methods=['get'], url_path='questions')
+    def questions(self, request, pk=None):
+        """Return every question of the session from its snapshot"""
+        snapshot = self.get_snapshot(pk)
+        etag = make_etag('s', pk)
+        response = not_modified(request, etag)
+        if response is None:
+            response = json_response(snapshot.content)
+            response['ETag'] = etag
+        return response
+
+    @action(
+        detail=True,
+        methods=['get'],
+        url_path=r'questions/(?P<position>[0-9]+)',
+    )
+    def question(self, request, pk=None, position=None):
+        """Return one question of the session, by zero-based position"""
+        snapshot = self.get_snapshot(pk)
+        position = int(position)
+        if position >= len(snapshot.items):
+            raise NotFound()
+        etag = make_etag('s', pk, position)
+        response = not_modified(request, etag)
+        if response is None:
+            response = json_response(snapshot.items[position])
+            response['ETag'] = etag
+        return response
+
+
+def json_response(content, status_code=status.HTTP_200_OK):
+    """Return pre-rendered JSON content as a response"""
+    return HttpResponse(
+        content, content_type=JSONRenderer.media_type, status=status_code,
+    )
@@ -0,0 +1,115 @@
+"""
+Gunicorn configuration for production.
+
+Started by "manage.py serve", or directly with
+gunicorn -c gunicorn.conf.py app.wsgi:application. Every value can be
+overridden with the GUNICORN_* environment variables below.
+
+The app is preloaded in the master before forking, so workers share
+its memory copy-on-write and a broken deploy fails before any worker
+starts. Because the code lives in the master, SIGHUP only restarts the
+workers with the code already loaded; deploy new code with
+"manage.py serve --reload", which starts a new master with SIGUSR2 and
+then gracefully stops the old one.
+"""
+import os
+import shutil
+import tempfile
+
+
+def cores():
+    """Return the CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def default_workers(worker_class):
+    """
+    Return the worker count for worker_class: one per core for async
+    workers, which multiplex requests, and 2 * cores + 1 for sync
+    workers so a core stays busy while another worker waits on I/O.
+    """
+    if 'uvicorn' in worker_class:
+        return cores()
+    return 2 * cores() + 1
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+threads = int(os.environ.get('GUNICORN_THREADS') or 1)
+worker_class = os.environ.get(
+    'GUNICORN_WORKER_CLASS', 'gthread' if threads > 1 else 'sync',
+)
+workers = int(os.environ.get('GUNICORN_WORKERS') or 0) or default_workers(
+    worker_class,
+)
+# Tells the app how many processes share the cores, see
+# PASSWORD_HASHING_WORKERS
+os.environ.setdefault('WEB_CONCURRENCY', str(workers))
+pidfile = os.environ.get('GUNICORN_PIDFILE', '/tmp/gunicorn.pid')
+
+preload_app = True
+# Recycle workers now and then so slow leaks cannot accumulate; the
+# jitter keeps them from all restarting at once
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+# Heartbeat files in memory rather than on a possibly slow disk
+worker_tmp_dir = os.environ.get('GUNICORN_WORKER_TMP_DIR') or (
+    '/dev/shm' if os.path.isdir('/dev/shm') else None
+)
+# Workers pool their request metrics here, see METRICS_DIR. By default
+# each master has its own directory, also after a reload re-executes it
+# with this environment, and removes it on exit.
+metrics_dir = os.environ.get('GUNICORN_METRICS_DIR') or os.path.join(
+    worker_tmp_dir or tempfile.gettempdir(), f'app-metrics-{os.getpid()}',
+)
+os.environ['METRICS_DIR'] = metrics_dir
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Start from an empty metrics directory"""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+def on_exit(server):
+    """Remove this master's own metrics directory"""
+    if not os.environ.get('GUNICORN_METRICS_DIR'):
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+def pre_fork(server, worker):
+    """Close the master's database connections before forking"""
+    from django.db import connections
+
+    # A connection opened while preloading would otherwise be shared by
+    # every worker, and closing it in one would break it for the rest.
+    # Closing a pooled connection only returns it to the pool, so close
+    # the pool's idle connections too.
+    for connection in connections.all():
+        if hasattr(connection, 'close_pool'):
+            connection.close_pool()
+        else:
+            connection.close()
+
+
+def post_fork(server, worker):
+    """Open each worker's pooled connections up front"""
+    from django.db import connections
+
+    connection = connections['default']
+    if hasattr(connection, 'warm_pool'):
+        connection.warm_pool()
+
+
+def worker_exit(server, worker):
+    """Keep an exiting worker's metrics in the pooled totals"""
+    from core.metrics import registry
+
+    registry.retire()
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class LeaderboardConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'leaderboard'
+
+    def ready(self):
+        from leaderboard import signals  # noqa: F401
@@ -0,0 +1,18 @@
+"""
+Django command to rebuild the leaderboard
+"""
+from django.core.management.base import BaseCommand
+
+from leaderboard import ranking
+
+
+class Command(BaseCommand):
+    """Recompute every leaderboard row from the users' answers."""
+    help = 'Rebuild the leaderboard from scratch.'
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        rows = ranking.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Leaderboard rebuilt: {rows} users.'
+        ))
@@ -0,0 +1,196 @@
+"""
+Incremental maintenance and ranking of the leaderboard
+
+Each answer contributes (correct, submitted) counts to its user's row.
+Saves apply the difference between what an answer contributed when it
+was loaded and what it contributes now, so the leaderboard is updated
+with UPDATE ... SET correct = correct + n instead of recounting.
+"""
+import itertools
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+
+from core.models import Leaderboard, User_Answer
+
+
+BASELINE_ATTR = '_leaderboard_baseline'
+BATCH_SIZE = 1000
+
+
+def contribution(iscorrect, issubmitted):
+    """Return the (correct, submitted) counts an answer adds"""
+    return (int(bool(iscorrect and issubmitted)), int(bool(issubmitted)))
+
+
+def snapshot(answer):
+    """Remember what answer contributes as currently stored"""
+    fields = answer.__dict__
+    if 'iscorrect' in fields and 'issubmitted' in fields:
+        baseline = contribution(fields['iscorrect'], fields['issubmitted'])
+    else:
+        # Deferred fields: the next change falls back to a recount
+        baseline = None
+    fields[BASELINE_ATTR] = baseline
+
+
+def record(created=(), updated=(), deleted=()):
+    """Apply the leaderboard changes for saved or deleted answers"""
+    deltas = {}
+    stale = set()
+
+    def add(user_id, old, new):
+        correct, submitted = deltas.get(user_id, (0, 0))
+        deltas[user_id] = (
+            correct + new[0] - old[0],
+            submitted + new[1] - old[1],
+        )
+
+    for answer in created:
+        add(answer.user_id, (0, 0), current(answer))
+        snapshot(answer)
+    for answer in updated:
+        old = answer.__dict__.get(BASELINE_ATTR)
+        if old is None:
+            stale.add(answer.user_id)
+            continue
+        add(answer.user_id, old, current(answer))
+        snapshot(answer)
+    for answer in deleted:
+        old = answer.__dict__.get(BASELINE_ATTR)
+        if old is None:
+            stale.add(answer.user_id)
+            continue
+        add(answer.user_id, old, (0, 0))
+
+    with transaction.atomic(savepoint=False):
+        apply_deltas({
+            user_id: delta for user_id, delta in deltas.items()
+            if user_id not in stale
+        })
+        for user_id in stale:
+            refresh_user(user_id)
+
+
+def current(answer):
+    """Return what answer contributes now"""
+    return contribution(answer.iscorrect, answer.issubmitted)
+
+
+def apply_deltas(deltas):
+    """
+    Add {user id: (correct, submitted)} deltas to the leaderboard. Gains
+    are upserted with a single INSERT ... ON CONFLICT DO UPDATE, losses
+    update the rows the answers were counted in. A loss that finds no
+    row, or would take a count below zero, means the row has drifted
+    from the answers, so that user is recounted instead.
+    """
+    gains = []
+    for user_id, (correct, submitted) in deltas.items():
+        if correct < 0 or submitted < 0:
+            updated = Leaderboard.objects.filter(
+                user_id=user_id,
+                correct__gte=-min(correct, 0),
+                submitted__gte=-min(submitted, 0),
+            ).update(
+                correct=F('correct') + correct,
+                submitted=F('submitted') + submitted,
+            )
+            if not updated:
+                refresh_user(user_id)
+        elif correct or submitted:
+            gains.append((user_id, correct, submitted))
+    if gains:
+        upsert(gains)
+
+
+def upsert(rows):
+    """Insert (user id, correct, submitted) rows or add to existing ones"""
+    quote = connection.ops.quote_name
+    table = quote(Leaderboard._meta.db_table)
+    placeholders = ', '.join(['(%s, %s, %s)'] * len(rows))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (user_id, correct, submitted) '
+            f'VALUES {placeholders} '
+            f'ON CONFLICT (user_id) DO UPDATE SET '
+            f'correct = {table}.correct + EXCLUDED.correct, '
+            f'submitted = {table}.submitted + EXCLUDED.submitted',
+            list(itertools.chain.from_iterable(rows)),
+        )
+
+
+def counts():
+    """Return per-user (correct, submitted) aggregates over all answers"""
+    return User_Answer.objects.filter(issubmitted=True).values(
+        'user',
+    ).annotate(
+        correct=Count('id', filter=Q(iscorrect=True)),
+        submitted=Count('id'),
+    ).order_by()
+
+
+def refresh_user(user_id):
+    """Recount a single user's row from their answers"""
+    # Not first(): ordering by pk would group by answer, not by user
+    row = next(iter(counts().filter(user=user_id)), None)
+    if row is None:
+        Leaderboard.objects.filter(user_id=user_id).delete()
+        return
+    Leaderboard.objects.update_or_create(
+        user_id=user_id,
+        defaults={'correct': row['correct'], 'submitted': row['submitted']},
+    )
+
+
+def rebuild():
+    """Recompute the whole leaderboard from scratch; return the row count"""
+    created = 0
+    with transaction.atomic():
+        Leaderboard.objects.all().delete()
+        rows = (
+            Leaderboard(
+                user_id=row['user'],
+                correct=row['correct'],
+                submitted=row['submitted'],
+            )
+            for row in counts().iterator()
+        )
+        while True:
+            batch = list(itertools.islice(rows, BATCH_SIZE))
+            if not batch:
+                break
+            Leaderboard.objects.bulk_create(batch)
+            created += len(batch)
+    return created
+
+
+def top(limit):
+    """Return the best limit entries with their competition rank"""
+    entries = list(
+        Leaderboard.objects.select_related('user').order_by(
+            '-correct', 'user_id',
+        )[:limit]
+    )
+    for position, entry in enumerate(entries, start=1):
+        previous = entries[position - 2] if position > 1 else None
+        if previous is not None and previous.correct == entry.correct:
+            entry.rank = previous.rank
+        else:
+            entry.rank = position
+    return entries
+
+
+def rank_of(user):
+    """
+    Return the rank and counts of user. The rank is one plus the number
+    of rows with more correct answers, a range count on the leaderboard
+    index rather than an aggregation over every answer.
+    """
+    entry = Leaderboard.objects.filter(user=user).first()
+    correct = entry.correct if entry else 0
+    return {
+        'rank': Leaderboard.objects.filter(correct__gt=correct).count() + 1,
+        'correct': correct,
+        'submitted': entry.submitted if entry else 0,
+    }
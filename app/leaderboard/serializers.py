@@ -0,0 +1,32 @@
+"""
+Serializers for the leaderboard API
+"""
+from rest_framework import serializers
+
+from core.models import Leaderboard
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    """Serializer for a ranked leaderboard entry"""
+    rank = serializers.IntegerField(read_only=True)
+    firstname = serializers.CharField(source='user.firstname')
+    lastname = serializers.CharField(source='user.lastname')
+
+    class Meta:
+        model = Leaderboard
+        fields = [
+            'rank',
+            'user',
+            'firstname',
+            'lastname',
+            'correct',
+            'submitted',
+        ]
+        read_only_fields = fields
+
+
+class RankSerializer(serializers.Serializer):
+    """Serializer for the authenticated user's rank"""
+    rank = serializers.IntegerField()
+    correct = serializers.IntegerField()
+    submitted = serializers.IntegerField()
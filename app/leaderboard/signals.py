@@ -0,0 +1,29 @@
+"""
+Signal handlers for the leaderboard app
+"""
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from core.models import User_Answer
+from leaderboard import ranking
+
+
+@receiver(post_init, sender=User_Answer)
+def answer_loaded(sender, instance, **kwargs):
+    """Remember what a loaded answer contributes to the leaderboard"""
+    ranking.snapshot(instance)
+
+
+@receiver(post_save, sender=User_Answer)
+def answer_saved(sender, instance, created, **kwargs):
+    """Apply the change in a saved answer to the leaderboard"""
+    if created:
+        ranking.record(created=[instance])
+    else:
+        ranking.record(updated=[instance])
+
+
+@receiver(post_delete, sender=User_Answer)
+def answer_deleted(sender, instance, **kwargs):
+    """Remove a deleted answer's counts from the leaderboard"""
+    ranking.record(deleted=[instance])
@@ -0,0 +1,86 @@
+"""
+Test for leaderboard APIs
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Leaderboard
+
+
+TOP_URL = reverse('leaderboard:top')
+ME_URL = reverse('leaderboard:me')
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+class PublicLeaderboardAPITests(TestCase):
+    """Test unauthenticated API requests"""
+
+    def test_auth_required(self):
+        """Test auth is required to read the leaderboard"""
+        res = APIClient().get(TOP_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateLeaderboardAPITests(TestCase):
+    """Test authenticated API requests"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='user@example.com',
+            password='testpass123',
+            firstname='Test',
+        )
+        self.client.force_authenticate(self.user)
+        self.users = [
+            create_user(email=f'user{i}@example.com', password='pass12345')
+            for i in range(3)
+        ]
+        Leaderboard.objects.bulk_create([
+            Leaderboard(user=user, correct=10 - i, submitted=10)
+            for i, user in enumerate(self.users)
+        ] + [Leaderboard(user=self.user, correct=1, submitted=4)])
+
+    def test_top(self):
+        """Test the top entries are listed best first"""
+        res = self.client.get(TOP_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [entry['user'] for entry in res.data],
+            [user.id for user in self.users] + [self.user.id],
+        )
+        self.assertEqual(res.data[3]['rank'], 4)
+        self.assertEqual(res.data[3]['firstname'], 'Test')
+
+    def test_top_limit(self):
+        """Test ?limit restricts the number of entries"""
+        res = self.client.get(TOP_URL, {'limit': 2})
+
+        self.assertEqual(len(res.data), 2)
+
+    def test_top_invalid_limit(self):
+        """Test a limit out of range is rejected"""
+        for limit in ('0', 'abc', '100000'):
+            res = self.client.get(TOP_URL, {'limit': limit})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_me(self):
+        """Test the user's own rank is returned"""
+        with self.assertNumQueries(2):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data, {'rank': 4, 'correct': 1, 'submitted': 4},
+        )
@@ -0,0 +1,173 @@
+"""
+Test leaderboard maintenance and ranking
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import Exam_Question, Leaderboard, User_Answer
+from leaderboard import ranking
+from user_answer.grading import submit_answer_sheet
+
+
+def create_question(**params):
+    """Create and return a sample question"""
+    defaults = {
+        'question': 'sample question?',
+        'choices': ['A', 'B', 'C', 'D'],
+        'answer': 'C',
+    }
+    defaults.update(params)
+
+    return Exam_Question.objects.create(**defaults)
+
+
+def create_answer(user, question, **params):
+    """Create and return a sample answer"""
+    defaults = {
+        'user_answer': 'C',
+        'iscorrect': True,
+        'issubmitted': True,
+        'isbookmarked': False,
+    }
+    defaults.update(params)
+
+    return User_Answer.objects.create(user=user, question=question, **defaults)
+
+
+def create_user(email='user@example.com'):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(
+        email=email, password='testpass123',
+    )
+
+
+def counts(user):
+    """Return the (correct, submitted) leaderboard counts of user"""
+    entry = Leaderboard.objects.filter(user=user).first()
+    return (entry.correct, entry.submitted) if entry else None
+
+
+class RankingTests(TestCase):
+    """Test the leaderboard is kept in step with answers"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.question = create_question()
+
+    def test_created_answer_counted(self):
+        """Test a new submitted answer is added to the leaderboard"""
+        create_answer(self.user, self.question)
+        create_answer(self.user, create_question(), iscorrect=False)
+
+        self.assertEqual(counts(self.user), (1, 2))
+
+    def test_draft_not_counted(self):
+        """Test an answer that is not submitted adds nothing"""
+        create_answer(self.user, self.question, issubmitted=False)
+
+        self.assertIsNone(counts(self.user))
+
+    def test_updated_answer_applies_delta(self):
+        """Test changing a loaded answer applies only the difference"""
+        create_answer(self.user, self.question)
+        answer = User_Answer.objects.get(user=self.user)
+
+        answer.iscorrect = False
+        answer.save()
+        self.assertEqual(counts(self.user), (0, 1))
+
+        answer.save()
+        self.assertEqual(counts(self.user), (0, 1))
+
+    def test_deferred_answer_recounted(self):
+        """Test saving an answer loaded without its flags recounts"""
+        create_answer(self.user, self.question)
+        answer = User_Answer.objects.only('id', 'user').get()
+
+        answer.issubmitted = False
+        answer.save()
+
+        self.assertIsNone(counts(self.user))
+
+    def test_deleted_answer_removed(self):
+        """Test deleting answers, including by cascade, is applied"""
+        create_answer(self.user, self.question)
+        create_answer(self.user, create_question())
+
+        User_Answer.objects.filter(question=self.question).delete()
+        self.assertEqual(counts(self.user), (1, 1))
+
+        Exam_Question.objects.all().delete()
+        self.assertEqual(counts(self.user), (0, 0))
+
+    def test_answer_sheet_counted(self):
+        """Test bulk submissions update the leaderboard"""
+        other = create_question(answer='A')
+        submit_answer_sheet(self.user, [
+            {'question': self.question.id, 'user_answer': 'C'},
+            {'question': other.id, 'user_answer': 'C'},
+        ])
+        self.assertEqual(counts(self.user), (1, 2))
+
+        submit_answer_sheet(self.user, [
+            {'question': other.id, 'user_answer': 'A'},
+        ])
+        self.assertEqual(counts(self.user), (2, 2))
+
+    def test_mixed_delta_without_row_recounted(self):
+        """Test a loss and a gain for a user with no row is not dropped"""
+        create_answer(self.user, self.question)
+        Leaderboard.objects.all().delete()
+
+        ranking.apply_deltas({self.user.id: (1, -1)})
+
+        self.assertEqual(counts(self.user), (1, 1))
+
+    def test_drifted_loss_recounted(self):
+        """Test a loss larger than the stored count recounts the user"""
+        create_answer(self.user, self.question)
+        create_answer(self.user, create_question(), iscorrect=False)
+        Leaderboard.objects.filter(user=self.user).update(correct=0)
+
+        ranking.apply_deltas({self.user.id: (-1, 0)})
+
+        self.assertEqual(counts(self.user), (1, 2))
+
+    def test_rebuild(self):
+        """Test the rebuild command recomputes every row"""
+        create_answer(self.user, self.question)
+        Leaderboard.objects.update(correct=5)
+        out = StringIO()
+
+        call_command('rebuild_leaderboard', stdout=out)
+
+        self.assertEqual(counts(self.user), (1, 1))
+        self.assertIn('1 users', out.getvalue())
+
+    def test_top_and_rank_with_ties(self):
+        """Test tied users share a rank"""
+        second = create_user('second@example.com')
+        third = create_user('third@example.com')
+        Leaderboard.objects.bulk_create([
+            Leaderboard(user=self.user, correct=5, submitted=5),
+            Leaderboard(user=second, correct=5, submitted=6),
+            Leaderboard(user=third, correct=2, submitted=2),
+        ])
+
+        top = ranking.top(3)
+
+        self.assertEqual([entry.rank for entry in top], [1, 1, 3])
+        self.assertEqual(ranking.rank_of(third)['rank'], 3)
+        self.assertEqual(ranking.rank_of(second)['rank'], 1)
+
+    def test_rank_without_answers(self):
+        """Test a user without answers ranks after every counted user"""
+        create_answer(create_user('other@example.com'), self.question)
+
+        self.assertEqual(
+            ranking.rank_of(self.user),
+            {'rank': 2, 'correct': 0, 'submitted': 0},
+        )
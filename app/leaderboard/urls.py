@@ -0,0 +1,14 @@
+"""
+URL mappings for the leaderboard app
+"""
+from django.urls import path
+
+from leaderboard import views
+
+
+app_name = 'leaderboard'
+
+urlpatterns = [
+    path('', views.LeaderboardView.as_view(), name='top'),
+    path('me/', views.RankView.as_view(), name='me'),
+]
@@ -0,0 +1,47 @@
+"""
+Views for the leaderboard API
+"""
+from django.conf import settings
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+
+from leaderboard import ranking
+from leaderboard.serializers import (
+    LeaderboardEntrySerializer,
+    RankSerializer,
+)
+from user.authentication import CachedTokenAuthentication
+
+
+class LeaderboardView(generics.ListAPIView):
+    """List the top users by correct answers (?limit=n)"""
+    serializer_class = LeaderboardEntrySerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        """Retrieve the ranked top entries"""
+        limit = self.request.query_params.get('limit')
+        if limit is None:
+            return ranking.top(settings.LEADERBOARD_SIZE)
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= settings.LEADERBOARD_MAX_SIZE:
+            raise ValidationError({'limit': [
+                f'Expected 1 to {settings.LEADERBOARD_MAX_SIZE}.'
+            ]})
+        return ranking.top(limit)
+
+
+class RankView(generics.RetrieveAPIView):
+    """Retrieve the authenticated user's rank"""
+    serializer_class = RankSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_object(self):
+        """Retrieve and return the authenticated user's rank"""
+        return ranking.rank_of(self.request.user)
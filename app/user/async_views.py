@@ -0,0 +1,24 @@
+"""
+Async (ASGI-native) views for the user api
+"""
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from core.conditional import make_etag, not_modified
+from user.authentication import token_required
+from user.serializers import UserSerializer
+
+
+@token_required
+async def retrieve_user(request):
+    """Retrieve and return the authenticated user"""
+    user = request.user
+    etag = make_etag('u', user.pk, user.Modified_Date.isoformat())
+    response = not_modified(request, etag)
+    if response is None:
+        response = HttpResponse(
+            JSONRenderer().render(UserSerializer(user).data),
+            content_type=JSONRenderer.media_type,
+        )
+        response['ETag'] = etag
+    return response
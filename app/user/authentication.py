@@ -0,0 +1,141 @@
+"""
+Authentication classes for the API
+"""
+import copy
+import functools
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.translation import gettext as _
+from rest_framework import exceptions, status
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+
+from core.cache import LRUCache
+
+
+SHARED_KEY_PREFIX = 'auth:token:'
+
+token_cache = LRUCache(
+    max_size=settings.TOKEN_AUTH_CACHE['MAX_SIZE'],
+    ttl=settings.TOKEN_AUTH_CACHE['TTL'],
+)
+
+
+def token_digest(key):
+    """Return the digest used to key cached tokens"""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_shared_cache():
+    """Return the shared cache tier, or None if it is disabled"""
+    alias = settings.TOKEN_AUTH_CACHE['SHARED_CACHE']
+    return caches[alias] if alias else None
+
+
+def invalidate_token(key):
+    """Drop a token from every cache tier"""
+    digest = token_digest(key)
+    token_cache.delete(digest)
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.delete(SHARED_KEY_PREFIX + digest)
+
+
+def invalidate_user(user_id):
+    """Drop every cached token belonging to a user"""
+    token_cache.delete_where(lambda entry: entry[0].pk == user_id)
+    shared = get_shared_cache()
+    if shared is not None:
+        keys = Token.objects.filter(user_id=user_id).values_list(
+            'key', flat=True,
+        )
+        shared.delete_many([
+            SHARED_KEY_PREFIX + token_digest(key) for key in keys
+        ])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication backed by an in-process LRU cache and an
+    optional shared cache, so warm requests do not query the database.
+    """
+
+    def authenticate_credentials(self, key):
+        digest = token_digest(key)
+        entry = token_cache.get(digest)
+
+        if entry is None:
+            shared = get_shared_cache()
+            if shared is not None:
+                entry = shared.get(SHARED_KEY_PREFIX + digest)
+            if entry is None:
+                entry = super().authenticate_credentials(key)
+                if shared is not None:
+                    shared.set(
+                        SHARED_KEY_PREFIX + digest,
+                        entry,
+                        settings.TOKEN_AUTH_CACHE['SHARED_TTL'],
+                    )
+            token_cache.set(digest, entry)
+
+        user, token = entry
+        # Hand out a copy so per-request mutations never leak into the cache
+        return (copy.copy(user), token)
+
+
+async def authenticate_token(request):
+    """
+    Async counterpart of CachedTokenAuthentication.authenticate.
+
+    Returns (user, token), or None when no token was sent, and raises
+    AuthenticationFailed for a bad one. Tokens in the in-process cache
+    resolve without leaving the event loop; anything else costs a single
+    sync_to_async hop, as Django 4.0 has no async ORM interface.
+    """
+    authenticator = CachedTokenAuthentication()
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != authenticator.keyword.lower().encode():
+        return None
+    if len(auth) != 2:
+        raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+    try:
+        key = auth[1].decode()
+    except UnicodeError:
+        raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+
+    entry = token_cache.get(token_digest(key))
+    if entry is not None:
+        user, token = entry
+        return (copy.copy(user), token)
+    return await sync_to_async(authenticator.authenticate_credentials)(key)
+
+
+def token_required(view):
+    """Require token authentication on an async Django view"""
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            auth = await authenticate_token(request)
+            if auth is None:
+                raise exceptions.NotAuthenticated()
+        except exceptions.APIException as exc:
+            response = HttpResponse(
+                JSONRenderer().render({'detail': exc.detail}),
+                content_type='application/json',
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+            response['WWW-Authenticate'] = CachedTokenAuthentication.keyword
+            return response
+
+        request.user, request.auth = auth
+        return await view(request, *args, **kwargs)
+
+    return wrapper
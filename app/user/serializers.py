@@ -9,8 +9,11 @@ from django.utils.translation import gettext as _
 
 from rest_framework import serializers
 
+from core import hashing
+from core.metrics import TimedSerializerMixin
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for user object"""
 
     class Meta:
@@ -28,13 +31,13 @@ class UserSerializer(serializers.ModelSerializer):
         user = super().update(instance, validated_data)
 
         if password:
-            user.set_password(password)
+            hashing.set_password(user, password)
             user.save()
 
         return user
 
 
-class AuthTokenSerializer(serializers.Serializer):
+class AuthTokenSerializer(TimedSerializerMixin, serializers.Serializer):
     """Serializer for the user auth token"""
     email = serializers.EmailField()
     password = serializers.CharField(
@@ -5,9 +5,14 @@ from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from core import throttling
+from core.testing import QueryBudgetMixin
+from user.authentication import token_cache
+
 
 CREATE_USER_URL = reverse('user:create')
 TOKEN_URL = reverse('user:token')
@@ -25,6 +30,7 @@ class PublicUserApiTests(TestCase):
 
     def setUp(self):
         self.client = APIClient()
+        throttling.reset()
 
     def test_create_user_success(self):
         """Test creating a user is successful."""
@@ -159,3 +165,115 @@ class PrivateUserTest(TestCase):
         self.assertEqual(self.user.lastname, payload['lastname'])
         self.assertTrue(self.user.check_password(payload['password']))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_profile_not_modified(self):
+        """Test an unchanged profile returns 304 for a matching ETag"""
+        etag = self.client.get(USER_URL)['ETag']
+
+        res = self.client.get(USER_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_profile_etag_changes(self):
+        """Test an updated profile no longer matches the old ETag"""
+        etag = self.client.get(USER_URL)['ETag']
+        self.client.patch(EDIT_URL, {'firstname': 'Changed'})
+        # force_authenticate keeps handing out this instance, not the row
+        self.user.refresh_from_db()
+
+        res = self.client.get(USER_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['firstname'], 'Changed')
+
+
+class UserQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Test each user endpoint stays within its query budget"""
+    query_budgets = {
+        'create': 2,
+        # First login creates the token inside a savepoint
+        'token': 5,
+        'token_repeat': 2,
+        # Cold requests look the token up with its user in one query
+        'user': 1,
+        'user_warm': 0,
+        # Editing reloads the user rather than saving the cached copy
+        'edit': 3,
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        throttling.reset()
+        self.user = create_user(
+            email='test@example.com',
+            password='testpass123',
+            firstname='Test',
+            lastname='Name',
+        )
+
+    def test_create_budget(self):
+        """Test signing up stays within budget"""
+        payload = {
+            'email': 'new@example.com',
+            'password': 'testpass123',
+            'firstname': 'New',
+            'lastname': 'Name',
+        }
+
+        with self.assertQueryBudget('create'):
+            res = self.client.post(CREATE_USER_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_token_budget(self):
+        """Test logging in stays within budget"""
+        payload = {'email': 'test@example.com', 'password': 'testpass123'}
+
+        with self.assertQueryBudget('token'):
+            res = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_repeat_token_budget(self):
+        """Test logging in again reuses the token within budget"""
+        payload = {'email': 'test@example.com', 'password': 'testpass123'}
+        self.client.post(TOKEN_URL, payload)
+
+        with self.assertQueryBudget('token_repeat'):
+            res = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def authenticate(self):
+        """Send a real token, so budgets include authenticating it"""
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        token_cache.clear()
+
+    def test_user_budget(self):
+        """Test retrieving the profile stays within budget"""
+        self.authenticate()
+
+        with self.assertQueryBudget('user'):
+            res = self.client.get(USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_warm_user_budget(self):
+        """Test a cached token authenticates without queries"""
+        self.authenticate()
+        self.client.get(USER_URL)
+
+        with self.assertQueryBudget('user_warm'):
+            res = self.client.get(USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_edit_budget(self):
+        """Test updating the profile stays within budget"""
+        self.authenticate()
+
+        with self.assertQueryBudget('edit'):
+            res = self.client.patch(EDIT_URL, {'firstname': 'Changed'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
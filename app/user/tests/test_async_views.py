@@ -0,0 +1,57 @@
+"""
+Tests for the async user views
+"""
+from django.test import AsyncClient, TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+
+ASYNC_USER_URL = reverse('user:async-user')
+
+
+class AsyncUserViewTests(TestCase):
+    """Test the async current user view"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            firstname='Test',
+            lastname='Name',
+        )
+        token = Token.objects.create(user=self.user)
+        # AsyncClient takes raw ASGI header names
+        self.auth = {'authorization': f'Token {token.key}'}
+        self.client = AsyncClient()
+
+    async def test_retrieve_user(self):
+        """Test retrieving the authenticated user"""
+        res = await self.client.get(ASYNC_USER_URL, **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {
+            'email': 'test@example.com',
+            'firstname': 'Test',
+            'lastname': 'Name',
+        })
+
+    async def test_invalid_token(self):
+        """Test an invalid token is rejected"""
+        res = await self.client.get(
+            ASYNC_USER_URL, authorization='Token invalid',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_not_modified(self):
+        """Test a matching If-None-Match returns 304"""
+        etag = (await self.client.get(ASYNC_USER_URL, **self.auth))['ETag']
+
+        res = await self.client.get(
+            ASYNC_USER_URL, if_none_match=etag, **self.auth,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,101 @@
+"""
+Tests for the cached token authentication
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from user.authentication import token_cache
+
+
+USER_URL = reverse('user:user')
+EDIT_URL = reverse('user:edit')
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test requests authenticated through the token cache"""
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = create_user(
+            email='test@example.com',
+            password='testpass123',
+            firstname='Test',
+            lastname='Name',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_warm_cache_makes_no_queries(self):
+        """Test a warm token cache authenticates without hitting the DB"""
+        with self.assertNumQueries(1):
+            res = self.client.get(USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+    def test_invalid_token_rejected(self):
+        """Test an unknown token is not cached as valid"""
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        res = self.client.get(USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(len(token_cache), 0)
+
+    def test_deleted_token_invalidated(self):
+        """Test rotating a token evicts the old one from the cache"""
+        self.client.get(USER_URL)
+        self.token.delete()
+        Token.objects.create(user=self.user)
+
+        res = self.client.get(USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_invalidated(self):
+        """Test deactivating a user evicts their cached tokens"""
+        self.client.get(USER_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_refreshes_cache(self):
+        """Test profile changes are visible on the next cached request"""
+        self.client.get(USER_URL)
+        self.user.firstname = 'Updated'
+        self.user.save()
+
+        res = self.client.get(USER_URL)
+
+        self.assertEqual(res.data['firstname'], 'Updated')
+
+    def test_edit_does_not_save_stale_copy(self):
+        """Test editing never writes a cached user back over the row"""
+        self.client.get(USER_URL)
+        # Another worker deactivates the user; this cache is not told
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False, lastname='Elsewhere',
+        )
+
+        self.client.patch(EDIT_URL, {'firstname': 'Changed'})
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertEqual(self.user.lastname, 'Elsewhere')
+        self.assertEqual(self.user.firstname, 'Changed')
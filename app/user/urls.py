@@ -3,7 +3,7 @@ Url mappings for the user API
 """
 from django.urls import path
 
-from user import views
+from user import async_views, views
 
 
 app_name = 'user'
@@ -12,5 +12,6 @@ urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
     path('token/', views.CreateTokenView.as_view(), name='token'),
     path('edit/', views.ManageUserView.as_view(), name='edit'),
-    path('user/', views.RetrieveUserView.as_view(), name='user')
+    path('user/', views.RetrieveUserView.as_view(), name='user'),
+    path('async/user/', async_views.retrieve_user, name='async-user'),
 ]
@@ -1,10 +1,18 @@
 """
 Views for the user api
 """
-from rest_framework import generics, authentication, permissions
+from django.contrib.auth import get_user_model
+from rest_framework import generics, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
+from core.conditional import make_etag, not_modified
+from core.throttling import (
+    LoginAccountThrottle,
+    LoginIPThrottle,
+    SignupIPThrottle,
+)
+from user.authentication import CachedTokenAuthentication
 from user.serializers import (
     UserSerializer,
     AuthTokenSerializer
@@ -14,31 +22,48 @@ from user.serializers import (
 class CreateUserView(generics.CreateAPIView):
     """Create a new user in the system"""
     serializer_class = UserSerializer
+    # No authentication, so throttling runs before any password is hashed
+    authentication_classes = []
+    throttle_classes = [SignupIPThrottle]
 
 
 class CreateTokenView(ObtainAuthToken):
     """Create a new auth token for user"""
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    authentication_classes = []
+    throttle_classes = [LoginIPThrottle, LoginAccountThrottle]
 
 
 class ManageUserView(generics.UpdateAPIView):
     """Manage the authenticated user"""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        """Retrieve and return the authenticated"""
-        return self.request.user
+        """Retrieve and return the authenticated user, fresh from the DB"""
+        # request.user may be a cached copy older than the row; saving it
+        # would write stale columns back over changes made elsewhere
+        return get_user_model().objects.get(pk=self.request.user.pk)
 
 
 class RetrieveUserView(generics.RetrieveAPIView):
     """Retrieve and return the authenticated user"""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
         """Retrieve and return the authenticated"""
         return self.request.user
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return the user, or a 304 if the client copy is current"""
+        user = self.get_object()
+        etag = make_etag('u', user.pk, user.Modified_Date.isoformat())
+        response = not_modified(request, etag)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+            response['ETag'] = etag
+        return response
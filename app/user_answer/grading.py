@@ -0,0 +1,141 @@
+"""
+Grading of user answers
+"""
+from django.db import connection, transaction
+
+from core.models import User_Answer
+from exam_question.answer_key import answer_key
+from leaderboard import ranking
+
+
+UPDATE_FIELDS = ['user_answer', 'iscorrect', 'issubmitted', 'isbookmarked']
+INSERT_FIELDS = ['user', 'question', *UPDATE_FIELDS]
+
+
+def is_correct(answer, user_answer):
+    """Return True if user_answer matches the correct answer"""
+    return answer is not None and user_answer == answer
+
+
+def submit_answer_sheet(user, answers, issubmitted=True):
+    """
+    Grade and persist a whole answer sheet for user.
+
+    The correct answers come from the answer key, in memory unless it
+    is switched off, and the user's existing answers are loaded and
+    locked with one IN query.
+    New answers are inserted with ON CONFLICT DO NOTHING, so a
+    concurrent retry of the same sheet can never create a duplicate,
+    and only answers whose values changed are updated. The locks make
+    a concurrent retry wait and then see this sheet's values, so the
+    leaderboard delta is applied once. Returns (answers, unknown question ids);
+    nothing is written if any question id is unknown.
+    """
+    sheet = {item['question']: item for item in answers}
+    correct_answers = answer_key.lookup(sheet)
+    unknown = sorted(set(sheet) - set(correct_answers))
+    if unknown:
+        return [], unknown
+
+    values = {
+        question_id: {
+            'user_answer': item['user_answer'],
+            'iscorrect': is_correct(
+                correct_answers[question_id], item['user_answer'],
+            ),
+            'issubmitted': issubmitted,
+            'isbookmarked': item.get('isbookmarked', False),
+        }
+        for question_id, item in sheet.items()
+    }
+
+    with transaction.atomic():
+        saved = {
+            answer.question_id: answer
+            for answer in locked(user, sheet)
+        }
+        to_create = [
+            User_Answer(
+                user=user, question_id=question_id, **values[question_id],
+            )
+            for question_id in sheet if question_id not in saved
+        ]
+        raced = insert_new(to_create)
+        created = [answer for answer in to_create if answer.pk is not None]
+        if raced:
+            # Answered by a concurrent request since the read above
+            saved.update(
+                (answer.question_id, answer)
+                for answer in locked(user, raced)
+            )
+
+        to_update = [
+            answer for question_id, answer in saved.items()
+            if assign(answer, values[question_id])
+        ]
+        User_Answer.objects.bulk_update(to_update, UPDATE_FIELDS)
+        # Raw and bulk writes send no signals, so update the leaderboard
+        ranking.record(created=created, updated=to_update)
+
+    for answer in created:
+        saved[answer.question_id] = answer
+    return [saved[question_id] for question_id in sheet], []
+
+
+def locked(user, question_ids):
+    """Return user's answers to question_ids, locked for update"""
+    # A fixed lock order keeps overlapping sheets from deadlocking
+    return User_Answer.objects.filter(
+        user=user, question_id__in=question_ids,
+    ).select_for_update().order_by('question_id')
+
+
+def assign(answer, values):
+    """Set values on answer; return True if anything changed"""
+    changed = False
+    for field, value in values.items():
+        if getattr(answer, field) != value:
+            setattr(answer, field, value)
+            changed = True
+    return changed
+
+
+def insert_new(answers):
+    """
+    Insert answers with INSERT ... ON CONFLICT DO NOTHING RETURNING and
+    set the primary key of each one inserted. Return the question ids
+    whose rows already existed.
+    """
+    if not answers:
+        return set()
+    opts = User_Answer._meta
+    fields = [opts.get_field(name) for name in INSERT_FIELDS]
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in fields)
+    row = '(' + ', '.join(['%s'] * len(fields)) + ')'
+    by_question = {answer.question_id: answer for answer in answers}
+    batch_size = connection.ops.bulk_batch_size(fields, answers)
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(answers), batch_size):
+            batch = answers[start:start + batch_size]
+            cursor.execute(
+                f'INSERT INTO {quote(opts.db_table)} ({columns}) '
+                f'VALUES {", ".join([row] * len(batch))} '
+                f'ON CONFLICT ({quote("user_id")}, {quote("question_id")}) '
+                f'DO NOTHING '
+                f'RETURNING {quote("id")}, {quote("question_id")}',
+                [
+                    field.get_db_prep_save(
+                        getattr(answer, field.attname), connection,
+                    )
+                    for answer in batch
+                    for field in fields
+                ],
+            )
+            for pk, question_id in cursor.fetchall():
+                answer = by_question[question_id]
+                answer.pk = pk
+                answer._state.adding = False
+
+    return {answer.question_id for answer in answers if answer.pk is None}
@@ -0,0 +1,16 @@
+"""
+Django command to export user answers
+"""
+from core import export
+from core.models import User_Answer
+from user_answer.views import ANSWER_EXPORT_FIELDS
+
+
+class Command(export.ExportCommand):
+    """Stream every answer to a file as NDJSON or CSV."""
+    help = 'Export user answers as NDJSON or CSV.'
+    label = 'answers'
+    fields = ANSWER_EXPORT_FIELDS
+
+    def get_queryset(self):
+        return User_Answer.objects.order_by('id')
@@ -0,0 +1,67 @@
+"""
+Serializers for the user_answer API
+"""
+from rest_framework import serializers
+
+from core.metrics import TimedSerializerMixin
+from core.models import User_Answer
+
+
+class User_AnswerSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer,
+):
+    """Serializer for a user's answer to a question"""
+
+    class Meta:
+        model = User_Answer
+        fields = [
+            'id',
+            'question',
+            'user_answer',
+            'iscorrect',
+            'issubmitted',
+            'isbookmarked',
+        ]
+        read_only_fields = ['id', 'iscorrect']
+        extra_kwargs = {
+            'issubmitted': {'default': False},
+            'isbookmarked': {'default': False},
+        }
+
+    def validate(self, attrs):
+        """Reject a second answer by the user to the same question"""
+        question = attrs.get('question')
+        request = self.context.get('request')
+        if question is not None and request is not None:
+            answers = User_Answer.objects.filter(
+                user=request.user, question=question,
+            )
+            if self.instance is not None:
+                answers = answers.exclude(pk=self.instance.pk)
+            if answers.exists():
+                raise serializers.ValidationError({
+                    'question': ['This question has already been answered.'],
+                })
+        return attrs
+
+
+class AnswerSheetItemSerializer(serializers.Serializer):
+    """Serializer for one answer of a batch submission"""
+    question = serializers.IntegerField(min_value=1)
+    user_answer = serializers.CharField(max_length=255, allow_blank=True)
+    isbookmarked = serializers.BooleanField(default=False)
+
+
+class AnswerSheetSerializer(serializers.Serializer):
+    """Serializer for submitting a whole exam sheet at once"""
+    answers = AnswerSheetItemSerializer(many=True, allow_empty=False)
+    issubmitted = serializers.BooleanField(default=True)
+
+
+class ScoreSerializer(serializers.Serializer):
+    """Serializer for a user's aggregated score"""
+    attempts = serializers.IntegerField()
+    submitted = serializers.IntegerField()
+    correct = serializers.IntegerField()
+    bookmarked = serializers.IntegerField()
+    percent_correct = serializers.FloatField(allow_null=True)
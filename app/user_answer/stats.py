@@ -0,0 +1,62 @@
+"""
+Score and per-question statistics aggregated in the database
+"""
+from django.db.models import Count, Q
+
+from core.models import User_Answer
+
+
+EMPTY_COUNTS = {'attempts': 0, 'correct': 0, 'bookmarked': 0}
+
+
+def percent(part, whole):
+    """Return part as a percentage of whole, or None if whole is 0"""
+    return round(100 * part / whole, 2) if whole else None
+
+
+def score(user):
+    """
+    Return the answer counts for user, computed with a single aggregate
+    query over the (user, question) index instead of loading every row.
+    """
+    counts = User_Answer.objects.filter(user=user).aggregate(
+        attempts=Count('id'),
+        submitted=Count('id', filter=Q(issubmitted=True)),
+        correct=Count('id', filter=Q(iscorrect=True)),
+        bookmarked=Count('id', filter=Q(isbookmarked=True)),
+    )
+    counts['percent_correct'] = percent(
+        counts['correct'], counts['attempts'],
+    )
+    return counts
+
+
+def question_stats(question_ids):
+    """
+    Return {question id: counts} for question_ids with one GROUP BY
+    query served by the (question, iscorrect) index.
+    """
+    rows = User_Answer.objects.filter(
+        question_id__in=question_ids,
+    ).values('question').annotate(
+        attempts=Count('id'),
+        correct=Count('id', filter=Q(iscorrect=True)),
+        bookmarked=Count('id', filter=Q(isbookmarked=True)),
+    ).order_by()
+    return {row.pop('question'): row for row in rows}
+
+
+def attach_question_stats(questions):
+    """
+    Set the answer counts on each question in a page of questions.
+    Aggregating only the page keeps the cost proportional to the page
+    size rather than to the size of the answer table.
+    """
+    counts = question_stats([question.pk for question in questions])
+    for question in questions:
+        row = counts.get(question.pk, EMPTY_COUNTS)
+        question.attempts = row['attempts']
+        question.correct = row['correct']
+        question.bookmarked = row['bookmarked']
+        question.percent_correct = percent(row['correct'], row['attempts'])
+    return questions
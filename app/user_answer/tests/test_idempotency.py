@@ -0,0 +1,186 @@
+"""
+Test for idempotent answer submissions
+"""
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.idempotency import REPLAYED_HEADER, cache_key, get_cache
+from core.models import Exam_Question, User_Answer
+from exam_question.answer_key import answer_key
+from user_answer.grading import insert_new, submit_answer_sheet
+
+
+USER_ANSWER_URL = reverse('user_answer:user_answer-list')
+SUBMIT_URL = reverse('user_answer:user_answer-submit')
+
+
+def create_question(**params):
+    """Create and return a sample question"""
+    defaults = {
+        'question': 'sample question?',
+        'choices': ['A', 'B', 'C', 'D'],
+        'answer': 'C',
+    }
+    defaults.update(params)
+
+    return Exam_Question.objects.create(**defaults)
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+class UpsertTests(TestCase):
+    """Test answer sheets are written without duplicates"""
+
+    def setUp(self):
+        self.user = create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.question = create_question()
+        answer_key.rebuild()
+
+    def test_insert_new_skips_existing_rows(self):
+        """Test a row answered concurrently is reported, not duplicated"""
+        User_Answer.objects.create(
+            user=self.user,
+            question=self.question,
+            user_answer='A',
+            iscorrect=False,
+            issubmitted=True,
+            isbookmarked=False,
+        )
+        other = create_question()
+        answers = [
+            User_Answer(
+                user=self.user,
+                question_id=question_id,
+                user_answer='C',
+                iscorrect=True,
+                issubmitted=True,
+                isbookmarked=False,
+            )
+            for question_id in (self.question.id, other.id)
+        ]
+
+        raced = insert_new(answers)
+
+        self.assertEqual(raced, {self.question.id})
+        self.assertIsNone(answers[0].pk)
+        self.assertEqual(
+            User_Answer.objects.get(question=other).pk, answers[1].pk,
+        )
+        self.assertEqual(User_Answer.objects.count(), 2)
+
+    @override_settings(EXAM_QUESTION_ANSWER_KEY=True)
+    def test_resubmitting_unchanged_sheet_writes_nothing(self):
+        """Test a repeated sheet only reads the existing answers"""
+        sheet = [{'question': self.question.id, 'user_answer': 'C'}]
+        submit_answer_sheet(self.user, sheet)
+
+        # savepoint, existing answers and release
+        with self.assertNumQueries(3):
+            answers, unknown = submit_answer_sheet(self.user, sheet)
+
+        self.assertEqual(unknown, [])
+        self.assertEqual(len(answers), 1)
+        self.assertEqual(User_Answer.objects.count(), 1)
+
+
+class IdempotencyKeyTests(TestCase):
+    """Test the Idempotency-Key header on answer submissions"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+        self.question = create_question()
+        self.key = str(uuid.uuid4())
+
+    def post(self, url, payload, key=None):
+        """POST payload as JSON with an Idempotency-Key"""
+        return self.client.post(
+            url,
+            payload,
+            format='json',
+            HTTP_IDEMPOTENCY_KEY=key or self.key,
+        )
+
+    def test_retry_replays_response(self):
+        """Test a retried submission is answered from the cache"""
+        payload = {'answers': [
+            {'question': self.question.id, 'user_answer': 'C'},
+        ]}
+        first = self.post(SUBMIT_URL, payload)
+
+        with self.assertNumQueries(0):
+            retry = self.post(SUBMIT_URL, payload)
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry[REPLAYED_HEADER], 'true')
+        self.assertEqual(User_Answer.objects.count(), 1)
+
+    def test_retry_of_create_replays_response(self):
+        """Test a retried single answer does not fail as a duplicate"""
+        payload = {'question': self.question.id, 'user_answer': 'C'}
+        first = self.post(USER_ANSWER_URL, payload)
+
+        retry = self.post(USER_ANSWER_URL, payload)
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data['id'], first.data['id'])
+
+    def test_key_reused_with_different_body(self):
+        """Test reusing a key for another body is rejected"""
+        self.post(USER_ANSWER_URL, {
+            'question': self.question.id, 'user_answer': 'C',
+        })
+
+        res = self.post(USER_ANSWER_URL, {
+            'question': self.question.id, 'user_answer': 'A',
+        })
+
+        self.assertEqual(
+            res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    def test_request_in_progress(self):
+        """Test a concurrent request with the same key is refused"""
+        payload = {'question': self.question.id, 'user_answer': 'C'}
+        request = RequestFactory().post(USER_ANSWER_URL)
+        request.user = self.user
+        get_cache().add(cache_key(request, self.key) + ':lock', True)
+
+        res = self.post(USER_ANSWER_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(User_Answer.objects.exists())
+
+    def test_errors_not_stored(self):
+        """Test a failed request can be retried with the same key"""
+        res = self.post(USER_ANSWER_URL, {'question': self.question.id})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.post(USER_ANSWER_URL, {
+            'question': self.question.id, 'user_answer': 'C',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_invalid_key(self):
+        """Test an over-long key is rejected"""
+        res = self.post(USER_ANSWER_URL, {}, key='k' * 256)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,169 @@
+"""
+Test for score and question statistics
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Exam_Question, User_Answer
+from user_answer import stats
+
+
+SCORE_URL = reverse('user_answer:user_answer-score')
+STATS_URL = reverse('exam_question:exam_question-stats')
+
+
+def question_stats_url(question_id):
+    """Create and return a question stats URL"""
+    return reverse(
+        'exam_question:exam_question-question-stats', args=[question_id],
+    )
+
+
+def create_question(**params):
+    """Create and return a sample question"""
+    defaults = {
+        'question': 'sample question?',
+        'choices': ['A', 'B', 'C', 'D'],
+        'answer': 'C',
+    }
+    defaults.update(params)
+
+    return Exam_Question.objects.create(**defaults)
+
+
+def create_answer(user, question, user_answer, **params):
+    """Create and return a graded answer"""
+    defaults = {
+        'iscorrect': user_answer == question.answer,
+        'issubmitted': True,
+        'isbookmarked': False,
+    }
+    defaults.update(params)
+
+    return User_Answer.objects.create(
+        user=user, question=question, user_answer=user_answer, **defaults,
+    )
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+class StatsTests(TestCase):
+    """Test the aggregate queries"""
+
+    def setUp(self):
+        self.user = create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.other = create_user(
+            email='other@example.com',
+            password='testpass123',
+        )
+
+    def test_score_counts(self):
+        """Test the score is aggregated in a single query"""
+        q1, q2, q3 = [create_question() for _ in range(3)]
+        create_answer(self.user, q1, 'C')
+        create_answer(self.user, q2, 'A', isbookmarked=True)
+        create_answer(self.user, q3, 'C', issubmitted=False)
+        create_answer(self.other, q1, 'A')
+
+        with self.assertNumQueries(1):
+            score = stats.score(self.user)
+
+        self.assertEqual(score, {
+            'attempts': 3,
+            'submitted': 2,
+            'correct': 2,
+            'bookmarked': 1,
+            'percent_correct': 66.67,
+        })
+
+    def test_score_without_answers(self):
+        """Test a user with no answers has no percentage"""
+        score = stats.score(self.user)
+
+        self.assertEqual(score['attempts'], 0)
+        self.assertIsNone(score['percent_correct'])
+
+    def test_attach_question_stats(self):
+        """Test counts for a page are loaded with one query"""
+        q1, q2 = create_question(), create_question()
+        create_answer(self.user, q1, 'C', isbookmarked=True)
+        create_answer(self.other, q1, 'B')
+
+        with self.assertNumQueries(1):
+            stats.attach_question_stats([q1, q2])
+
+        self.assertEqual(
+            (q1.attempts, q1.correct, q1.bookmarked, q1.percent_correct),
+            (2, 1, 1, 50.0),
+        )
+        self.assertEqual((q2.attempts, q2.percent_correct), (0, None))
+
+
+class StatsAPITests(TestCase):
+    """Test the score and question statistics endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_score_auth_required(self):
+        """Test auth is required to read a score"""
+        res = APIClient().get(SCORE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_score(self):
+        """Test the user's score is returned"""
+        question = create_question()
+        create_answer(self.user, question, 'C')
+
+        res = self.client.get(SCORE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['correct'], 1)
+        self.assertEqual(res.data['percent_correct'], 100.0)
+
+    def test_question_stats_list(self):
+        """Test the stats page lists questions with their counts"""
+        q1, q2 = create_question(), create_question()
+        create_answer(self.user, q1, 'A')
+
+        res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        results = res.data['results']
+        self.assertEqual([row['id'] for row in results], [q2.id, q1.id])
+        self.assertEqual(results[1]['attempts'], 1)
+        self.assertEqual(results[1]['percent_correct'], 0.0)
+        self.assertNotIn('answer', results[1])
+
+    def test_question_stats_detail(self):
+        """Test the counts for a single question"""
+        question = create_question()
+        create_answer(self.user, question, 'C', isbookmarked=True)
+
+        res = self.client.get(question_stats_url(question.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['bookmarked'], 1)
+        self.assertEqual(res.data['correct'], 1)
+
+    def test_question_stats_not_found(self):
+        """Test stats for an unknown question return 404"""
+        res = self.client.get(question_stats_url(999999))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,290 @@
+"""
+Test for user_answer APIs
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Exam_Question, User_Answer
+from exam_question.answer_key import answer_key
+
+
+USER_ANSWER_URL = reverse('user_answer:user_answer-list')
+SUBMIT_URL = reverse('user_answer:user_answer-submit')
+EXPORT_URL = reverse('user_answer:user_answer-export')
+
+
+def detail_url(user_answer_id):
+    """Create and return a user_answer detail URL"""
+    return reverse('user_answer:user_answer-detail', args=[user_answer_id])
+
+
+def create_question(**params):
+    """Create and return a sample question"""
+    defaults = {
+        'question': 'sample question?',
+        'choices': ['A', 'B', 'C', 'D'],
+        'answer': 'C',
+    }
+    defaults.update(params)
+
+    return Exam_Question.objects.create(**defaults)
+
+
+def create_answer(user, question, **params):
+    """Create and return a sample user answer"""
+    defaults = {
+        'user_answer': 'C',
+        'iscorrect': True,
+        'issubmitted': True,
+        'isbookmarked': False,
+    }
+    defaults.update(params)
+
+    return User_Answer.objects.create(user=user, question=question, **defaults)
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+class PublicUserAnswerAPITests(TestCase):
+    """Test unauthenticated API requests"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        """Test auth is required to call API"""
+        res = self.client.get(USER_ANSWER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateUserAnswerAPITests(TestCase):
+    """Test authenticated API requests"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_create_answer_is_graded(self):
+        """Test creating an answer grades it against the question"""
+        question = create_question()
+
+        res = self.client.post(USER_ANSWER_URL, {
+            'question': question.id,
+            'user_answer': 'C',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(res.data['iscorrect'])
+        answer = User_Answer.objects.get(id=res.data['id'])
+        self.assertEqual(answer.user, self.user)
+
+    def test_create_duplicate_answer_rejected(self):
+        """Test a second answer to the same question returns 400"""
+        question = create_question()
+        create_answer(self.user, question)
+
+        res = self.client.post(USER_ANSWER_URL, {
+            'question': question.id,
+            'user_answer': 'A',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('question', res.data)
+
+    def test_list_bookmarked_answers(self):
+        """Test ?isbookmarked=true lists only bookmarked answers"""
+        bookmarked = create_answer(
+            self.user, create_question(), isbookmarked=True,
+        )
+        create_answer(self.user, create_question())
+
+        res = self.client.get(USER_ANSWER_URL, {'isbookmarked': 'true'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([a['id'] for a in res.data], [bookmarked.id])
+
+    def test_update_answer_is_regraded(self):
+        """Test updating an answer grades it again"""
+        question = create_question()
+        answer = User_Answer.objects.create(
+            user=self.user,
+            question=question,
+            user_answer='C',
+            iscorrect=True,
+            issubmitted=False,
+            isbookmarked=False,
+        )
+
+        res = self.client.patch(detail_url(answer.id), {'user_answer': 'A'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        answer.refresh_from_db()
+        self.assertFalse(answer.iscorrect)
+
+    def test_update_answer_locked(self):
+        """Test an answer is locked while it is regraded"""
+        answer = create_answer(self.user, create_question())
+
+        with patch.object(
+            QuerySet, 'select_for_update', autospec=True,
+            side_effect=QuerySet.select_for_update,
+        ) as select_for_update:
+            res = self.client.patch(
+                detail_url(answer.id), {'user_answer': 'A'},
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        select_for_update.assert_called_once()
+
+    def test_answers_limited_to_user(self):
+        """Test list of answers is limited to authenticated user"""
+        question = create_question()
+        other = create_user(email='other@example.com', password='test123')
+        for user in (self.user, other):
+            User_Answer.objects.create(
+                user=user,
+                question=question,
+                user_answer='A',
+                iscorrect=False,
+                issubmitted=True,
+                isbookmarked=False,
+            )
+
+        res = self.client.get(USER_ANSWER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+
+    def test_submit_answer_sheet(self):
+        """Test a whole sheet is graded and saved with batched queries"""
+        questions = [create_question(answer=c) for c in 'ABCD']
+        User_Answer.objects.create(
+            user=self.user,
+            question=questions[0],
+            user_answer='D',
+            iscorrect=False,
+            issubmitted=False,
+            isbookmarked=False,
+        )
+        payload = {'answers': [
+            {'question': q.id, 'user_answer': 'A', 'isbookmarked': i == 1}
+            for i, q in enumerate(questions)
+        ]}
+        answer_key.invalidate()
+
+        # answer key rebuild, existing answers, then savepoint, insert,
+        # update, leaderboard upsert and release
+        with self.assertNumQueries(7):
+            res = self.client.post(SUBMIT_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['answered'], 4)
+        self.assertEqual(res.data['correct'], 1)
+        answers = User_Answer.objects.filter(user=self.user)
+        self.assertEqual(answers.count(), 4)
+        self.assertTrue(answers.get(question=questions[0]).iscorrect)
+        self.assertTrue(answers.get(question=questions[1]).isbookmarked)
+        self.assertTrue(all(a.issubmitted for a in answers))
+
+    def test_submit_locks_existing_answers(self):
+        """Test a sheet locks the answers it may change"""
+        question = create_question()
+        create_answer(self.user, question)
+        payload = {'answers': [{'question': question.id, 'user_answer': 'A'}]}
+
+        with patch.object(
+            QuerySet, 'select_for_update', autospec=True,
+            side_effect=QuerySet.select_for_update,
+        ) as select_for_update:
+            res = self.client.post(SUBMIT_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        select_for_update.assert_called_once()
+
+    @override_settings(EXAM_QUESTION_ANSWER_KEY=True)
+    def test_submit_with_warm_answer_key(self):
+        """Test grading a sheet does not query questions once warm"""
+        question = create_question()
+        answer_key.rebuild()
+        payload = {'answers': [{'question': question.id, 'user_answer': 'C'}]}
+
+        # existing answers, then savepoint, insert, leaderboard upsert
+        # and release
+        with self.assertNumQueries(5):
+            res = self.client.post(SUBMIT_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['correct'], 1)
+
+    def test_submit_unknown_question(self):
+        """Test a sheet with an unknown question id is rejected"""
+        question = create_question()
+        payload = {'answers': [
+            {'question': question.id, 'user_answer': 'C'},
+            {'question': question.id + 1000, 'user_answer': 'C'},
+        ]}
+
+        res = self.client.post(SUBMIT_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User_Answer.objects.exists())
+
+    def test_export_own_answers(self):
+        """Test the export only streams the user's own answers"""
+        question = create_question()
+        other = create_user(email='other@example.com', password='pass12345')
+        create_answer(other, question, user_answer='A', iscorrect=False)
+        mine = create_answer(self.user, question)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        body = b''.join(res.streaming_content).decode()
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [mine.id])
+        self.assertEqual(rows[0]['user_answer'], 'C')
+
+    def test_export_answers_command(self):
+        """Test the export_answers command writes CSV"""
+        create_answer(self.user, create_question())
+        out = StringIO()
+
+        call_command('export_answers', '--format', 'csv', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('id,user_id,question_id'))
+
+    def test_export_answers_command_file(self):
+        """Test the export_answers command reports the file written"""
+        create_answer(self.user, create_question())
+        err = StringIO()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'answers.ndjson')
+            call_command('export_answers', '--output', path, stderr=err)
+            with open(path, encoding='utf-8') as f:
+                row = json.loads(f.read())
+
+        self.assertEqual(row['user_answer'], 'C')
+        self.assertIn(path, err.getvalue())
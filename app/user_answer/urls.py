@@ -0,0 +1,21 @@
+"""
+URL mappings for the user_answer app
+"""
+from django.urls import (
+    path,
+    include,
+)
+
+from rest_framework.routers import DefaultRouter
+
+from user_answer import views
+
+
+router = DefaultRouter()
+router.register('user_answer', views.User_AnswerViewSet)
+
+app_name = 'user_answer'
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
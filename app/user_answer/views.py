@@ -0,0 +1,145 @@
+"""
+Views for the user_answer API
+"""
+from django.db import transaction
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core import export
+from core.idempotency import idempotent
+from core.models import User_Answer
+from user.authentication import CachedTokenAuthentication
+from user_answer import serializers, stats
+from user_answer.grading import is_correct, submit_answer_sheet
+
+
+TRUE_VALUES = ('1', 'true', 'yes')
+# Actions that change one answer and so lock it while they run
+LOCKING_ACTIONS = ('update', 'partial_update', 'destroy')
+ANSWER_EXPORT_FIELDS = [
+    'id',
+    'user_id',
+    'question_id',
+    'user_answer',
+    'iscorrect',
+    'issubmitted',
+    'isbookmarked',
+]
+
+
+class User_AnswerViewSet(viewsets.ModelViewSet):
+    """View for managing the authenticated user's answers"""
+    serializer_class = serializers.User_AnswerSerializer
+    queryset = User_Answer.objects.all()
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Retrieve answers for the authenticated user"""
+        queryset = self.queryset.filter(user=self.request.user)
+        bookmarked = self.request.query_params.get('isbookmarked')
+        if bookmarked is not None and bookmarked.lower() in TRUE_VALUES:
+            # Served by the partial index on bookmarked answers
+            queryset = queryset.filter(isbookmarked=True)
+        if self.action in LOCKING_ACTIONS:
+            # Concurrent changes then compute their leaderboard deltas
+            # from the row the other one saved, not the same baseline
+            queryset = queryset.select_for_update()
+        return queryset.order_by('-id')
+
+    def get_serializer_class(self):
+        """Return the serializer class for request"""
+        if self.action == 'submit':
+            return serializers.AnswerSheetSerializer
+        if self.action == 'score':
+            return serializers.ScoreSerializer
+        return self.serializer_class
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """Create an answer; retries with an Idempotency-Key replay"""
+        return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        """Update an answer, locking it until the change is saved"""
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        """Delete an answer, locking it until it is gone"""
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        """Grade and save a new answer"""
+        question = serializer.validated_data['question']
+        serializer.save(
+            user=self.request.user,
+            iscorrect=is_correct(
+                question.answer, serializer.validated_data['user_answer'],
+            ),
+        )
+
+    def perform_update(self, serializer):
+        """Regrade and save an updated answer"""
+        question = serializer.validated_data.get(
+            'question', serializer.instance.question,
+        )
+        user_answer = serializer.validated_data.get(
+            'user_answer', serializer.instance.user_answer,
+        )
+        serializer.save(iscorrect=is_correct(question.answer, user_answer))
+
+    @action(detail=False, methods=['get'], url_path='score')
+    def score(self, request):
+        """Return the user's answer counts and percentage correct"""
+        return Response(self.get_serializer(stats.score(request.user)).data)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """Stream the user's answers as NDJSON or CSV (?output=csv)"""
+        fmt = request.query_params.get('output', 'ndjson')
+        if fmt not in export.CONTENT_TYPES:
+            return Response(
+                {'output': [
+                    f'Expected one of {", ".join(export.CONTENT_TYPES)}.'
+                ]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return export.streaming_response(
+            self.get_queryset().order_by('id'),
+            ANSWER_EXPORT_FIELDS,
+            fmt,
+            'user_answers',
+        )
+
+    @action(detail=False, methods=['post'], url_path='submit')
+    @idempotent
+    def submit(self, request):
+        """Grade and save a whole answer sheet in one request"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        answers, unknown = submit_answer_sheet(
+            request.user,
+            serializer.validated_data['answers'],
+            serializer.validated_data['issubmitted'],
+        )
+        if unknown:
+            return Response(
+                {'answers': [f'Unknown question ids: {unknown}']},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {
+                'answered': len(answers),
+                'correct': sum(answer.iscorrect for answer in answers),
+                'answers': serializers.User_AnswerSerializer(
+                    answers, many=True,
+                ).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )